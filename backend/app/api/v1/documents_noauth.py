@@ -1,20 +1,23 @@
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, status
+from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Query, Response, status
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 from pydantic import BaseModel
 import os
-import uuid
 from datetime import datetime
 from app.models.database import get_db
 from app.models.document import Document
 from app.models.question import Topic
+from app.models.processing_job import ProcessingJob, JobState
 from app.core.config import settings
 from app.services.pdf_processor import PDFProcessor
-from app.services.nlp_engine import NLPEngine
+from app.services.file_storage import FileStorage, UploadTooLargeError
+from app.services.document_store import DocumentStore
+from app.services.job_queue import get_job_queue
 
 router = APIRouter()
 pdf_processor = PDFProcessor()
-nlp_engine = NLPEngine()
+file_storage = FileStorage()
+document_store = DocumentStore(file_storage)
 
 
 class DocumentResponse(BaseModel):
@@ -35,6 +38,29 @@ class DocumentDetail(DocumentResponse):
     topics: List[dict] = []
 
 
+class PageResponse(BaseModel):
+    page_number: int
+    text: str
+    word_count: int
+    
+    class Config:
+        from_attributes = True
+
+
+class JobResponse(BaseModel):
+    id: int
+    document_id: int
+    state: JobState
+    progress: float
+    error: Optional[str] = None
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    
+    class Config:
+        from_attributes = True
+
+
 @router.post("/upload", response_model=DocumentResponse)
 async def upload_document(
     file: UploadFile = File(...),
@@ -49,60 +75,65 @@ async def upload_document(
             detail="Only PDF files are allowed"
         )
     
-    # Check file size
-    file.file.seek(0, 2)
-    file_size = file.file.tell()
-    file.file.seek(0)
-    
-    if file_size > settings.MAX_UPLOAD_SIZE:
+    # Stream file to disk
+    try:
+        stored = await file_storage.save_upload(file)
+    except UploadTooLargeError as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"File size exceeds maximum allowed size"
+            detail=str(e)
         )
-    
-    # Generate unique filename
-    file_extension = os.path.splitext(file.filename)[1]
-    unique_filename = f"{uuid.uuid4()}{file_extension}"
-    file_path = os.path.join(settings.UPLOAD_DIR, unique_filename)
-    
-    # Save file
-    try:
-        with open(file_path, "wb") as f:
-            content = await file.read()
-            f.write(content)
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to save file: {str(e)}"
         )
     
+    # Link to the shared content blob
+    content = document_store.get_or_create_content(db, stored)
+    await document_store.restore_blob(content, file)
+    
     # Create document record (no owner_id needed)
     document = Document(
-        filename=unique_filename,
+        filename=stored["filename"],
         original_filename=file.filename,
-        file_path=file_path,
-        file_size=file_size,
+        file_path=stored["file_path"],
+        file_size=stored["file_size"],
         mime_type="application/pdf",
+        content_hash=stored["content_hash"],
+        content_id=content.id,
         owner_id=1,  # Default user
         processing_status="pending"
     )
     
     db.add(document)
+    db.flush()
+    
+    # Identical bytes already analyzed: reuse the results
+    if content.is_processed:
+        document_store.link_analysis(db, document)
+    
     db.commit()
     db.refresh(document)
     
     return document
 
 
-@router.post("/{document_id}/process")
+@router.post("/{document_id}/process", status_code=status.HTTP_202_ACCEPTED)
 async def process_document(
     document_id: int,
+    response: Response,
     db: Session = Depends(get_db)
 ):
-    """Process a document to extract text and topics (No authentication required)."""
+    """Queue a document for text and topic extraction (No authentication required).
+    
+    Returns a job id to poll at /documents/jobs/{job_id}.
+    """
     
     # Get document
-    document = db.query(Document).filter(Document.id == document_id).first()
+    document = db.query(Document).filter(
+        Document.id == document_id
+    ).first()
     
     if not document:
         raise HTTPException(
@@ -111,47 +142,63 @@ async def process_document(
         )
     
     if document.is_processed:
+        response.status_code = status.HTTP_200_OK
         return {"message": "Document already processed", "document_id": document_id}
     
-    try:
-        # Update status
-        document.processing_status = "processing"
-        db.commit()
-        
-        # Extract text
-        extracted_text = pdf_processor.extract_text(document.file_path)
-        document.extracted_text = extracted_text
-        
-        # Detect sections/topics
-        sections = pdf_processor.detect_sections(extracted_text)
-        
-        # Create topic records
-        for section in sections:
-            topic = Topic(
-                name=section['title'],
-                description=section['content'][:500],
-                document_id=document.id
-            )
-            db.add(topic)
-        
-        # Mark as processed
-        document.is_processed = True
-        document.processing_status = "completed"
+    if document.content is None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Document has no stored file. Please upload it again."
+        )
+    
+    # Identical bytes already analyzed: link without queueing any work
+    if document.content.is_processed:
+        topics_found = document_store.link_analysis(db, document)
         db.commit()
-        
+        response.status_code = status.HTTP_200_OK
         return {
             "message": "Document processed successfully",
             "document_id": document_id,
-            "topics_found": len(sections)
+            "topics_found": topics_found
         }
-        
-    except Exception as e:
-        document.processing_status = "failed"
+    
+    # Reuse a job that is already waiting or running
+    job = db.query(ProcessingJob).filter(
+        ProcessingJob.document_id == document_id,
+        ProcessingJob.state.in_([JobState.QUEUED, JobState.RUNNING])
+    ).first()
+    
+    if not job:
+        job = ProcessingJob(document_id=document_id, state=JobState.QUEUED)
+        db.add(job)
+        document.processing_status = "queued"
         db.commit()
+        get_job_queue().submit(job.id)
+    
+    return {
+        "message": "Document processing started",
+        "document_id": document_id,
+        "job_id": job.id,
+        "status": job.state
+    }
+
+
+@router.get("/jobs/{job_id}", response_model=JobResponse)
+async def get_processing_job(
+    job_id: int,
+    db: Session = Depends(get_db)
+):
+    """Get the state and progress of a processing job (No authentication required)."""
+    
+    job = db.query(ProcessingJob).filter(ProcessingJob.id == job_id).first()
+    
+    if not job:
         raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Processing failed: {str(e)}"
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Job not found"
         )
+    
+    return job
 
 
 @router.get("/", response_model=List[DocumentResponse])
@@ -180,10 +227,44 @@ async def get_document(
     
     return {
         **document.__dict__,
+        "extracted_text": document.extracted_text,
         "topics": [{"id": t.id, "name": t.name, "description": t.description} for t in topics]
     }
 
 
+@router.get("/{document_id}/pages", response_model=List[PageResponse])
+async def get_document_pages(
+    document_id: int,
+    start: int = Query(1, ge=1),
+    end: Optional[int] = Query(None, ge=1),
+    db: Session = Depends(get_db)
+):
+    """Get the text of a page range, 1-based and inclusive (No authentication required).
+    
+    At most MAX_PAGES_PER_REQUEST pages are returned per call.
+    """
+    document = db.query(Document).filter(Document.id == document_id).first()
+    
+    if not document:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Document not found"
+        )
+    
+    if end is None:
+        end = start + settings.MAX_PAGES_PER_REQUEST - 1
+    
+    if end < start:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="end must not be before start"
+        )
+    
+    end = min(end, start + settings.MAX_PAGES_PER_REQUEST - 1)
+    
+    return document_store.get_pages(db, document, start, end)
+
+
 @router.delete("/{document_id}")
 async def delete_document(
     document_id: int,
@@ -198,10 +279,9 @@ async def delete_document(
             detail="Document not found"
         )
     
-    # Delete file
+    # Delete file unless another document shares it
     try:
-        if os.path.exists(document.file_path):
-            os.remove(document.file_path)
+        document_store.release(db, document)
     except Exception as e:
         print(f"Failed to delete file: {e}")
     
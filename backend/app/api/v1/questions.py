@@ -1,18 +1,22 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy import insert
+from sqlalchemy.orm import Session, joinedload
+from typing import Dict, List, Optional
 from pydantic import BaseModel
 from datetime import datetime
-from app.models.database import get_db
+import hashlib
+import json
+from app.models.database import SessionLocal, get_db
 from app.models.user import User
 from app.models.document import Document
+from app.models.document_content import DocumentContent
 from app.models.question import Question, QuestionType, DifficultyLevel, Topic
 from app.core.security import get_current_active_user
-from app.services.question_generator import QuestionGenerator
 from app.services.pdf_processor import PDFProcessor
+from app.services.generation_pool import GenerationQueueFullError, get_generation_pool
 
 router = APIRouter()
-question_generator = QuestionGenerator()
 pdf_processor = PDFProcessor()
 
 
@@ -24,6 +28,8 @@ class GenerateQuestionsRequest(BaseModel):
     difficulty_medium: float = 0.4
     difficulty_hard: float = 0.2
     topic_ids: Optional[List[int]] = None
+    exhaustive: bool = False  # scan the whole text for key sentences (batch jobs)
+    seed: Optional[int] = None  # same seed and request, same questions (served from cache)
 
 
 class QuestionResponse(BaseModel):
@@ -74,22 +80,13 @@ class QuestionUpdate(BaseModel):
     tags: Optional[str] = None
 
 
-@router.post("/generate", response_model=List[QuestionResponse])
-async def generate_questions(
-    request: GenerateQuestionsRequest,
-    db: Session = Depends(get_db)
-):
-    """Generate questions from a document."""
+def _generation_source(request: GenerateQuestionsRequest, db: Session):
+    """The document and the text a generation request draws from."""
     
-    # Debug logging
-    print(f"📝 Generate request received:")
-    print(f"   Document ID: {request.document_id}")
-    print(f"   Num questions: {request.num_questions}")
-    print(f"   Question types: {request.question_types}")
-    print(f"   Difficulty mix: Easy={request.difficulty_easy}, Medium={request.difficulty_medium}, Hard={request.difficulty_hard}")
-    
-    # Get document
-    document = db.query(Document).filter(
+    # Get document, fetching its text in the same round trip
+    document = db.query(Document).options(
+        joinedload(Document.content).undefer(DocumentContent.extracted_text)
+    ).filter(
         Document.id == request.document_id
     ).first()
     
@@ -111,7 +108,7 @@ async def generate_questions(
         topics = db.query(Topic).filter(
             Topic.id.in_(request.topic_ids),
             Topic.document_id == request.document_id
-        ).all()
+        ).order_by(Topic.id).all()
         
         if not topics:
             raise HTTPException(
@@ -130,19 +127,106 @@ async def generate_questions(
             detail="No text available for question generation"
         )
     
-    # Generate questions
-    difficulty_mix = {
-        DifficultyLevel.EASY: request.difficulty_easy,
-        DifficultyLevel.MEDIUM: request.difficulty_medium,
-        DifficultyLevel.HARD: request.difficulty_hard
+    return document, text
+
+
+def _generation_options(request: GenerateQuestionsRequest, document: Document, text: str) -> Dict:
+    """Arguments for the generation pool."""
+    return {
+        # Generation samples from the candidate pools stored at processing time
+        "document_id": document.id,
+        "content_id": document.content_id if not request.topic_ids else None,
+        "topic_ids": request.topic_ids or None,
+        # Keys the result cache: the stored file for whole documents,
+        # the joined descriptions for topics
+        "source_hash": document.content.content_hash if not request.topic_ids
+        else hashlib.sha256(text.encode("utf-8")).hexdigest(),
+        "num_questions": request.num_questions,
+        "question_types": request.question_types,
+        "difficulty_mix": {
+            DifficultyLevel.EASY: request.difficulty_easy,
+            DifficultyLevel.MEDIUM: request.difficulty_medium,
+            DifficultyLevel.HARD: request.difficulty_hard
+        },
+        "exhaustive": request.exhaustive,
+        "seed": request.seed
     }
+
+
+def _save_questions(db: Session, generated_questions: List[Dict], document_id: int) -> List:
+    """Insert generated questions and commit, returning the stored rows.
+    
+    One executemany INSERT ... RETURNING (batched into multi-row
+    statements where the driver allows) replaces an INSERT and a
+    refresh SELECT per question; the returned rows carry everything
+    QuestionResponse needs.
+    """
+    if not generated_questions:
+        return []
+    
+    values = [
+        {
+            "question_text": q_data['question_text'],
+            "question_type": q_data['question_type'],
+            "difficulty": q_data['difficulty'],
+            "option_a": q_data.get('option_a'),
+            "option_b": q_data.get('option_b'),
+            "option_c": q_data.get('option_c'),
+            "option_d": q_data.get('option_d'),
+            "correct_answer": q_data['correct_answer'],
+            "explanation": q_data.get('explanation'),
+            "suggested_marks": q_data['suggested_marks'],
+            "source_document_id": document_id,
+            "creator_id": 1,
+            # Calculate hash for duplicate detection
+            "hash_signature": pdf_processor.calculate_text_hash(q_data['question_text'])
+        }
+        for q_data in generated_questions
+    ]
+    
+    # sort_by_parameter_order returns rows in the order of values. SQLite
+    # can only honour it with one statement per row, but it hands out ids
+    # in insertion order, so there sorting by id is enough.
+    in_order = db.get_bind().dialect.name != "sqlite"
+    statement = insert(Question).returning(*Question.__table__.columns, sort_by_parameter_order=in_order)
+    rows = db.execute(statement, values).all()
+    db.commit()
+    return rows if in_order else sorted(rows, key=lambda row: row.id)
+
+
+def _stream_event(event: str, data: Dict, sse: bool) -> str:
+    """One NDJSON line, or one server-sent event."""
+    if sse:
+        return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+    return json.dumps({"event": event, "data": data}) + "\n"
+
+
+@router.post("/generate", response_model=List[QuestionResponse])
+async def generate_questions(
+    request: GenerateQuestionsRequest,
+    db: Session = Depends(get_db)
+):
+    """Generate questions from a document."""
+    
+    # Debug logging
+    print(f"📝 Generate request received:")
+    print(f"   Document ID: {request.document_id}")
+    print(f"   Num questions: {request.num_questions}")
+    print(f"   Question types: {request.question_types}")
+    print(f"   Difficulty mix: Easy={request.difficulty_easy}, Medium={request.difficulty_medium}, Hard={request.difficulty_hard}")
+    
+    document, text = _generation_source(request, db)
     
     try:
-        generated_questions = question_generator.generate_questions(
-            text=text,
-            num_questions=request.num_questions,
-            question_types=request.question_types,
-            difficulty_mix=difficulty_mix
+        # Generation runs in the worker pool so the event loop stays free
+        generated_questions = await get_generation_pool().run(
+            text=text, **_generation_options(request, document, text)
+        )
+    except GenerationQueueFullError as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=str(e),
+            headers={"Retry-After": "5"}
         )
     except Exception as e:
         raise HTTPException(
@@ -151,37 +235,70 @@ async def generate_questions(
         )
     
     # Save questions to database
-    saved_questions = []
-    for q_data in generated_questions:
-        # Calculate hash for duplicate detection
-        hash_signature = pdf_processor.calculate_text_hash(q_data['question_text'])
-        
-        question = Question(
-            question_text=q_data['question_text'],
-            question_type=q_data['question_type'],
-            difficulty=q_data['difficulty'],
-            option_a=q_data.get('option_a'),
-            option_b=q_data.get('option_b'),
-            option_c=q_data.get('option_c'),
-            option_d=q_data.get('option_d'),
-            correct_answer=q_data['correct_answer'],
-            explanation=q_data.get('explanation'),
-            suggested_marks=q_data['suggested_marks'],
-            source_document_id=document.id,
-            creator_id=1,
-            hash_signature=hash_signature
+    return _save_questions(db, generated_questions, document.id)
+
+
+@router.post("/generate/stream")
+async def generate_questions_stream(
+    request: GenerateQuestionsRequest,
+    http_request: Request,
+    db: Session = Depends(get_db)
+):
+    """Generate questions from a document, sending each one as soon as it is saved.
+    
+    The response is NDJSON, one {"event": ..., "data": ...} object per
+    line, or server-sent events when the client accepts
+    text/event-stream. Each "question" event carries a saved question
+    (as returned by /generate); the stream ends with "done" and the
+    count, or "error". Questions are committed in micro-batches of
+    whatever the generator has ready, at most GENERATION_STREAM_BATCH.
+    """
+    document, text = _generation_source(request, db)
+    sse = "text/event-stream" in http_request.headers.get("accept", "")
+    batches = get_generation_pool().stream(text=text, **_generation_options(request, document, text))
+    
+    # Wait for the first batch here, so failures before any question
+    # (a busy pool, unusable text) still get a proper status code
+    try:
+        first_batch = await anext(batches)
+    except GenerationQueueFullError as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=str(e),
+            headers={"Retry-After": "5"}
+        )
+    except StopAsyncIteration:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to generate questions: Failed to generate any questions. Please check if the document has sufficient text content."
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to generate questions: {str(e)}"
         )
-        
-        db.add(question)
-        saved_questions.append(question)
-    
-    db.commit()
-    
-    # Refresh all questions
-    for question in saved_questions:
-        db.refresh(question)
     
-    return saved_questions
+    async def events():
+        # The request's session may be closed before the stream ends
+        stream_db = SessionLocal()
+        count = 0
+        try:
+            batch = first_batch
+            while batch is not None:
+                saved_questions = _save_questions(stream_db, batch, document.id)
+                for question in saved_questions:
+                    data = QuestionResponse.model_validate(question).model_dump(mode="json")
+                    yield _stream_event("question", data, sse)
+                count += len(saved_questions)
+                batch = await anext(batches, None)
+            yield _stream_event("done", {"count": count}, sse)
+        except Exception as e:
+            yield _stream_event("error", {"detail": f"Failed to generate questions: {str(e)}"}, sse)
+        finally:
+            stream_db.close()
+            await batches.aclose()
+    
+    return StreamingResponse(events(), media_type="text/event-stream" if sse else "application/x-ndjson")
 
 
 @router.post("/", response_model=QuestionResponse)
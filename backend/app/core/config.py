@@ -14,12 +14,22 @@ class Settings(BaseSettings):
     # Database
     DATABASE_URL: str = "sqlite:///./autoq.db"
     
+    # Large text columns: zstd, zlib or none
+    TEXT_COMPRESSION: str = "zstd"
+    TEXT_COMPRESSION_THRESHOLD: int = 1024  # bytes; smaller values are stored uncompressed
+    
     # Redis
     REDIS_URL: str = "redis://localhost:6379/0"
     
+    # Background Jobs
+    JOB_BACKEND: str = "inprocess"  # inprocess or celery
+    JOB_WORKERS: int = 2
+    
     # File Storage
     UPLOAD_DIR: str = "./uploads"
     MAX_UPLOAD_SIZE: int = 52428800  # 50MB
+    UPLOAD_CHUNK_SIZE: int = 1048576  # 1MB
+    MAX_PAGES_PER_REQUEST: int = 50
     ALLOWED_EXTENSIONS: str = "pdf"
     
     # JWT Authentication
@@ -28,12 +38,29 @@ class Settings(BaseSettings):
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
     REFRESH_TOKEN_EXPIRE_DAYS: int = 7
     
+    # PDF Extraction
+    PDF_EXTRACTION_WORKERS: int = 0  # 0 = one per CPU
+    PDF_EXTRACTION_BATCH_SIZE: int = 50  # pages per worker task
+    PDF_PARALLEL_MIN_PAGES: int = 200
+    PROCESSING_CHECKPOINT_PAGES: int = 50  # pages committed per checkpoint
+    
     # NLP Models
     SPACY_MODEL: str = "en_core_web_sm"
     TRANSFORMERS_MODEL: str = "distilbert-base-uncased"
     USE_GPU: bool = False
+    NLP_BATCH_SIZE: int = 64  # texts per nlp.pipe batch
+    NLP_N_PROCESS: int = 1  # nlp.pipe worker processes (-1 = one per CPU)
+    NLP_CHUNK_CHARS: int = 100000  # longer texts are parsed in sentence-aligned chunks
+    NLP_WARMUP: bool = True  # load SPACY_MODEL in the background at startup
+    NLP_CACHE_MAX_BYTES: int = 67108864  # 64MB in-process result cache; 0 disables it
+    NLP_CACHE_REDIS: bool = False  # also share cached results through REDIS_URL
+    NLP_CACHE_TTL: int = 86400  # seconds, Redis tier
     
     # Question Generation
+    GENERATION_WORKERS: int = 2  # processes with a preloaded model; 0 = threads in the API process
+    GENERATION_MAX_QUEUED: int = 8  # requests waiting beyond the running ones; more get a 503
+    GENERATION_STREAM_BATCH: int = 10  # most questions saved per commit when streaming
+    CANDIDATE_POOL_SIZE: int = 200  # candidates of each kind stored per document and topic
     DEFAULT_QUESTIONS_PER_PAPER: int = 20
     MIN_QUESTION_LENGTH: int = 10
     MAX_QUESTION_LENGTH: int = 500
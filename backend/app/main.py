@@ -5,7 +5,12 @@ from fastapi.exceptions import RequestValidationError
 from fastapi.responses import JSONResponse
 from app.core.config import settings
 from app.models.database import init_db
+from app.services.job_queue import get_job_queue
+from app.services.nlp_engine import warmup_nlp, nlp_status
+from app.services.nlp_cache import get_nlp_cache
+from app.services.generation_pool import get_generation_pool
 from app.api.v1 import auth, documents, questions, papers
+import asyncio
 import os
 
 # Create FastAPI app
@@ -65,11 +70,27 @@ app.include_router(papers.router, prefix="/api/v1/papers", tags=["Question Paper
 async def startup_event():
     """Initialize database on startup."""
     init_db()
+    requeued = get_job_queue().recover()
     print(f"🚀 {settings.APP_NAME} v{settings.APP_VERSION} started successfully!")
     print(f"📚 Database initialized")
+    print(f"⚙️  Job queue: {settings.JOB_BACKEND} ({requeued} unfinished jobs requeued)")
+    if settings.NLP_WARMUP:
+        # Load the model off the event loop; /health reports when it is ready
+        if settings.GENERATION_WORKERS > 0:
+            get_generation_pool().start()
+        else:
+            asyncio.get_running_loop().run_in_executor(None, warmup_nlp)
+        print(f"🧠 Loading NLP model: {settings.SPACY_MODEL} ({settings.GENERATION_WORKERS} generation workers)")
     print(f"🌐 CORS enabled for: {settings.ALLOWED_ORIGINS}")
 
 
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Stop background workers."""
+    get_job_queue().shutdown()
+    get_generation_pool().shutdown()
+
+
 @app.get("/")
 async def root():
     """Root endpoint."""
@@ -83,9 +104,24 @@ async def root():
 
 @app.get("/health")
 async def health_check():
-    """Health check endpoint."""
+    """Health check endpoint.
+    
+    "ready" turns true once the NLP model is loaded and question
+    generation can be served without a cold start. With NLP_WARMUP off
+    the model loads on the first request instead ("not_started" until
+    then), which readiness does not wait for. "generation" carries
+    the worker pool's queue depth, and "nlp_cache" the result cache's
+    hit/miss counters (null when it is disabled).
+    """
+    generation_pool = get_generation_pool()
+    nlp_model = generation_pool.nlp_status() if generation_pool.workers > 0 else nlp_status()
+    nlp_cache = get_nlp_cache()
     return {
         "status": "healthy",
         "app": settings.APP_NAME,
-        "version": settings.APP_VERSION
+        "version": settings.APP_VERSION,
+        "nlp_model": nlp_model,
+        "ready": nlp_model in ("ready", "not_started"),
+        "generation": generation_pool.stats(),
+        "nlp_cache": nlp_cache.stats() if nlp_cache else None
     }
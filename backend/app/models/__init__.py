@@ -1,8 +1,11 @@
 from app.models.database import Base, get_db, init_db
 from app.models.user import User, UserRole
 from app.models.document import Document
+from app.models.document_content import DocumentContent
+from app.models.document_page import DocumentPage
 from app.models.question import Question, QuestionType, DifficultyLevel, Topic
 from app.models.question_paper import QuestionPaper
+from app.models.processing_job import ProcessingJob, JobState
 
 __all__ = [
     "Base",
@@ -11,9 +14,13 @@ __all__ = [
     "User",
     "UserRole",
     "Document",
+    "DocumentContent",
+    "DocumentPage",
     "Question",
     "QuestionType",
     "DifficultyLevel",
     "Topic",
     "QuestionPaper",
+    "ProcessingJob",
+    "JobState",
 ]
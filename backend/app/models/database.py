@@ -1,4 +1,6 @@
-from sqlalchemy import create_engine
+import hashlib
+import os
+from sqlalchemy import create_engine, inspect, select, text
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from app.core.config import settings
@@ -23,5 +25,82 @@ def get_db():
 
 
 def init_db():
-    """Initialize database tables."""
+    """Initialize database tables, upgrading ones created by older versions."""
     Base.metadata.create_all(bind=engine)
+    upgrade_schema(engine)
+
+
+def upgrade_schema(bind) -> None:
+    """Bring existing tables up to the current models.
+    
+    create_all() only creates missing tables, so columns the models
+    gained since a table was created are added here (nullable, with
+    their indexes). Documents from before the content store, whose text
+    still sits in documents.extracted_text, are then linked to
+    DocumentContent rows holding that text. Runs at every startup; each
+    step does nothing once applied.
+    """
+    preparer = bind.dialect.identifier_preparer
+    with bind.begin() as conn:
+        inspector = inspect(conn)
+        for table in Base.metadata.sorted_tables:
+            if not inspector.has_table(table.name):
+                continue
+            existing = {column["name"] for column in inspector.get_columns(table.name)}
+            added = [column for column in table.columns if column.name not in existing]
+            for column in added:
+                conn.exec_driver_sql(
+                    f"ALTER TABLE {preparer.format_table(table)} ADD COLUMN "
+                    f"{preparer.format_column(column)} {column.type.compile(dialect=bind.dialect)}"
+                )
+            for index in table.indexes:
+                if any(column in added for column in index.columns):
+                    index.create(conn, checkfirst=True)
+        
+        if inspector.has_table("documents") and any(
+            column["name"] == "extracted_text" for column in inspector.get_columns("documents")
+        ):
+            _backfill_document_contents(conn)
+
+
+def _backfill_document_contents(conn) -> None:
+    """Create content rows for documents whose text predates the content store.
+    
+    The content hash is the file's SHA-256 when the file is still on disk,
+    so a later upload of the same bytes reuses the row; otherwise it is
+    derived from the document id.
+    """
+    # Imported here: the models import Base from this module
+    from app.models.document_content import DocumentContent
+    
+    contents = DocumentContent.__table__
+    legacy = conn.execute(text(
+        "SELECT id, file_path, file_size, is_processed, extracted_text FROM documents WHERE content_id IS NULL"
+    )).all()
+    
+    for document_id, file_path, file_size, is_processed, extracted_text in legacy:
+        if file_path and os.path.isfile(file_path):
+            sha256 = hashlib.sha256()
+            with open(file_path, "rb") as f:
+                for block in iter(lambda: f.read(1024 * 1024), b""):
+                    sha256.update(block)
+            content_hash = sha256.hexdigest()
+        else:
+            content_hash = hashlib.sha256(f"legacy-document:{document_id}".encode()).hexdigest()
+        
+        content_id = conn.execute(
+            select(contents.c.id).where(contents.c.content_hash == content_hash)
+        ).scalar()
+        if content_id is None:
+            content_id = conn.execute(contents.insert().values(
+                content_hash=content_hash,
+                file_path=file_path or "",
+                file_size=file_size,
+                extracted_text=extracted_text,
+                is_processed=bool(is_processed and extracted_text)
+            )).inserted_primary_key[0]
+        
+        conn.execute(
+            text("UPDATE documents SET content_id = :content_id, content_hash = :content_hash WHERE id = :id"),
+            {"content_id": content_id, "content_hash": content_hash, "id": document_id}
+        )
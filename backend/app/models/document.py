@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Text, Boolean
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Boolean
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from app.models.database import Base
@@ -13,14 +13,22 @@ class Document(Base):
     file_path = Column(String, nullable=False)
     file_size = Column(Integer)
     mime_type = Column(String)
-    extracted_text = Column(Text)
+    content_hash = Column(String(64), index=True)
+    content_id = Column(Integer, ForeignKey("document_contents.id"), index=True)
     is_processed = Column(Boolean, default=False)
-    processing_status = Column(String, default="pending")  # pending, processing, completed, failed
+    processing_status = Column(String, default="pending")  # pending, queued, processing, completed, failed
     owner_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
     # Relationships
     owner = relationship("User", back_populates="documents")
+    content = relationship("DocumentContent", back_populates="documents")
     topics = relationship("Topic", back_populates="document", cascade="all, delete-orphan")
     questions = relationship("Question", back_populates="source_document")
+    jobs = relationship("ProcessingJob", back_populates="document", cascade="all, delete-orphan")
+    
+    @property
+    def extracted_text(self):
+        """Text extracted from the shared content blob, if processed."""
+        return self.content.extracted_text if self.content else None
@@ -0,0 +1,38 @@
+from sqlalchemy import Column, Integer, String, DateTime, Boolean, JSON, LargeBinary
+from sqlalchemy.orm import relationship, deferred
+from datetime import datetime
+from app.models.database import Base
+from app.models.types import CompressedText, CompressedJSON
+
+
+class DocumentContent(Base):
+    """A stored PDF blob and its extraction results, keyed by SHA-256.
+
+    Every upload of the same bytes links to a single row, so text extraction
+    and section detection run once per distinct file. The large text columns
+    are deferred: they are only fetched when accessed or explicitly
+    undeferred, never as a side effect of loading the row.
+    """
+    __tablename__ = "document_contents"
+
+    id = Column(Integer, primary_key=True, index=True)
+    content_hash = Column(String(64), unique=True, index=True, nullable=False)
+    file_path = Column(String, nullable=False)
+    file_size = Column(Integer)
+    page_count = Column(Integer)
+    pdf_metadata = Column(JSON)
+    extracted_text = deferred(Column(CompressedText))
+    sections = deferred(Column(CompressedJSON))  # [{"title": ..., "content": ...}]
+    nlp_doc = deferred(Column(LargeBinary))  # spaCy DocBin of extracted_text
+    nlp_version = Column(String(100))  # pipeline that produced nlp_doc
+    candidates = deferred(Column(CompressedJSON))  # question candidate pool (QuestionGenerator.build_candidates)
+    candidates_version = Column(String(100))  # version of the code that built candidates
+    is_processed = Column(Boolean, default=False)
+    pages_processed = Column(Integer, default=0)  # checkpoint: pages 1..n are stored
+    created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    # Relationships
+    documents = relationship("Document", back_populates="content")
+    pages = relationship("DocumentPage", back_populates="content", order_by="DocumentPage.page_number",
+                         cascade="all, delete-orphan", passive_deletes=True)
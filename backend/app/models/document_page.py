@@ -0,0 +1,26 @@
+from sqlalchemy import Column, Integer, ForeignKey, UniqueConstraint
+from sqlalchemy.orm import relationship, deferred
+from app.models.database import Base
+from app.models.types import CompressedText, CompressedJSON
+
+
+class DocumentPage(Base):
+    """Cleaned text of one PDF page, so callers can read page ranges."""
+    __tablename__ = "document_pages"
+    __table_args__ = (
+        UniqueConstraint("content_id", "page_number", name="uq_document_pages_content_page"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    content_id = Column(Integer, ForeignKey("document_contents.id", ondelete="CASCADE"), nullable=False, index=True)
+    page_number = Column(Integer, nullable=False)
+    text = Column(CompressedText)
+    word_count = Column(Integer, default=0)
+
+    # Heading structure of the page, so sections can be rebuilt from stored
+    # pages when processing resumes from a checkpoint
+    lead = deferred(Column(CompressedText))  # text before the first heading on the page
+    sections = deferred(Column(CompressedJSON))  # [{"title": ..., "content": ...}]
+
+    # Relationships
+    content = relationship("DocumentContent", back_populates="pages")
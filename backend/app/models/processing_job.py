@@ -0,0 +1,28 @@
+from sqlalchemy import Column, Integer, DateTime, ForeignKey, Text, Enum, Float
+from sqlalchemy.orm import relationship
+from datetime import datetime
+import enum
+from app.models.database import Base
+
+
+class JobState(str, enum.Enum):
+    QUEUED = "queued"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+
+
+class ProcessingJob(Base):
+    __tablename__ = "processing_jobs"
+
+    id = Column(Integer, primary_key=True, index=True)
+    document_id = Column(Integer, ForeignKey("documents.id"), nullable=False, index=True)
+    state = Column(Enum(JobState), default=JobState.QUEUED, nullable=False, index=True)
+    progress = Column(Float, default=0.0)  # 0.0 - 1.0
+    error = Column(Text)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    started_at = Column(DateTime)
+    finished_at = Column(DateTime)
+
+    # Relationships
+    document = relationship("Document", back_populates="jobs")
@@ -1,8 +1,9 @@
 from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Text, Enum, Float, Table
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import relationship, deferred
 from datetime import datetime
 import enum
 from app.models.database import Base
+from app.models.types import CompressedJSON
 
 
 class QuestionType(str, enum.Enum):
@@ -78,6 +79,7 @@ class Topic(Base):
     name = Column(String, nullable=False)
     description = Column(Text)
     document_id = Column(Integer, ForeignKey("documents.id"))
+    candidates = deferred(Column(CompressedJSON))  # question candidate pool of the description
     
     # Relationships
     document = relationship("Document", back_populates="topics")
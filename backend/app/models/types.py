@@ -0,0 +1,83 @@
+import json
+import zlib
+from sqlalchemy import LargeBinary
+from sqlalchemy.types import TypeDecorator
+from app.core.config import settings
+
+try:
+    import zstandard
+except ImportError:  # optional dependency
+    zstandard = None
+
+# One-byte header recording how the payload is stored, so values written
+# with any codec stay readable after TEXT_COMPRESSION changes.
+_RAW = b"\x00"
+_ZLIB = b"\x01"
+_ZSTD = b"\x02"
+
+
+def compress_text(text: str, codec: str = None, threshold: int = None) -> bytes:
+    """Encode text, compressing it when it is at least `threshold` bytes."""
+    codec = codec or settings.TEXT_COMPRESSION
+    threshold = settings.TEXT_COMPRESSION_THRESHOLD if threshold is None else threshold
+    data = text.encode("utf-8")
+
+    if codec == "none" or len(data) < threshold:
+        return _RAW + data
+    if codec == "zstd" and zstandard is not None:
+        return _ZSTD + zstandard.ZstdCompressor(level=3).compress(data)
+    return _ZLIB + zlib.compress(data, 6)
+
+
+def decompress_text(payload: bytes) -> str:
+    """Decode a value written by compress_text."""
+    header, body = payload[:1], payload[1:]
+
+    if header == _RAW:
+        return body.decode("utf-8")
+    if header == _ZLIB:
+        return zlib.decompress(body).decode("utf-8")
+    if header == _ZSTD:
+        if zstandard is None:
+            raise RuntimeError("zstandard is required to read zstd-compressed text")
+        return zstandard.ZstdDecompressor().decompress(body).decode("utf-8")
+    raise ValueError(f"Unknown compressed text header: {header!r}")
+
+
+class CompressedText(TypeDecorator):
+    """Text column stored as (optionally) compressed bytes.
+
+    Values shorter than TEXT_COMPRESSION_THRESHOLD are stored as-is behind
+    a one-byte header; longer ones are compressed with TEXT_COMPRESSION
+    (zstd, falling back to zlib when zstandard is not installed).
+    Decompression happens when the column is loaded, so pair this with
+    deferred() for columns that should only be read on access.
+    """
+    impl = LargeBinary
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect):
+        if value is None:
+            return None
+        return compress_text(value)
+
+    def process_result_value(self, value, dialect):
+        if value is None:
+            return None
+        if isinstance(value, str):  # written before compression was enabled
+            return value
+        return decompress_text(bytes(value))
+
+
+class CompressedJSON(CompressedText):
+    """JSON column stored through CompressedText."""
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect):
+        if value is None:
+            return None
+        return super().process_bind_param(json.dumps(value), dialect)
+
+    def process_result_value(self, value, dialect):
+        text = super().process_result_value(value, dialect)
+        return json.loads(text) if text is not None else None
@@ -0,0 +1,186 @@
+from sqlalchemy.orm import Session
+from datetime import datetime
+from app.core.config import settings
+from app.models.database import SessionLocal
+from app.models.document_content import DocumentContent
+from app.models.processing_job import ProcessingJob, JobState
+from app.models.question import Topic
+from app.services.pdf_processor import PDFProcessor
+from app.services.document_store import DocumentStore
+from app.services.nlp_engine import NLPEngine, get_nlp_engine
+from app.services.question_generator import QuestionGenerator
+
+
+class DocumentProcessingService:
+    """Runs document processing jobs and records their progress."""
+
+    # Share of the progress bar given to text extraction; section
+    # detection and topic linking take the rest.
+    EXTRACTION_WEIGHT = 0.9
+
+    # Only write progress to the database when it moved at least this much
+    PROGRESS_STEP = 0.05
+
+    def __init__(self, pdf_processor: PDFProcessor = None, document_store: DocumentStore = None,
+                 session_factory=SessionLocal, nlp_engine: NLPEngine = None,
+                 question_generator: QuestionGenerator = None):
+        self.pdf_processor = pdf_processor or PDFProcessor()
+        self.document_store = document_store or DocumentStore()
+        self.session_factory = session_factory
+        self.checkpoint_pages = settings.PROCESSING_CHECKPOINT_PAGES
+        self._nlp_engine = nlp_engine
+        self.question_generator = question_generator or QuestionGenerator(nlp_engine)
+
+    @property
+    def nlp_engine(self) -> NLPEngine:
+        """The given engine, or the shared one (loaded on first use)."""
+        return self._nlp_engine or get_nlp_engine()
+
+    def run(self, job_id: int) -> None:
+        """Execute a queued job in its own database session."""
+        db = self.session_factory()
+        try:
+            job = db.get(ProcessingJob, job_id)
+            if job is None or job.state == JobState.COMPLETED:
+                return
+
+            try:
+                self._process(db, job)
+            except Exception as e:
+                db.rollback()
+                self._fail(db, job, e)
+        finally:
+            db.close()
+
+    def _process(self, db: Session, job: ProcessingJob) -> None:
+        document = job.document
+
+        job.state = JobState.RUNNING
+        job.started_at = datetime.utcnow()
+        job.progress = 0.0
+        job.error = None
+        document.processing_status = "processing"
+        db.commit()
+
+        # Extract text and sections once per distinct file
+        content = document.content
+        if not content.is_processed:
+            self._extract(db, job, content)
+
+        # Parse the text once so question generation can load it instead
+        if content.nlp_version is None:
+            self._store_parse(db, content)
+
+        # Create topic records
+        self.document_store.link_analysis(db, document)
+
+        # Precompute what question generation samples from
+        self._store_candidates(db, content, document)
+
+        job.state = JobState.COMPLETED
+        job.progress = 1.0
+        job.finished_at = datetime.utcnow()
+        db.commit()
+
+    def _extract(self, db: Session, job: ProcessingJob, content: DocumentContent) -> None:
+        """Analyze the PDF in checkpointed page batches, then assemble results.
+
+        Each batch of pages is committed together with the checkpoint, so a
+        retry after a failure continues after the last stored batch instead
+        of starting from page 1. Readers only ever see whole batches, and
+        the content is not marked processed until assembly finishes. Jobs
+        of other documents with the same content may run at the same time;
+        a batch another job stored first is skipped, never inserted twice.
+        """
+        if content.pdf_metadata is None:
+            metadata = self.pdf_processor.extract_metadata(content.file_path)
+            content.pdf_metadata = metadata
+            content.page_count = metadata["page_count"]
+            db.commit()
+
+        while not self._extract_pages(db, job, content):
+            # Another job stored this batch first: continue after its checkpoint
+            db.rollback()
+            if content.is_processed:
+                return
+
+        # One pass over the stored pages builds text and sections
+        records = self.document_store.load_page_records(db, content)
+        analysis = self.pdf_processor.assemble_analysis(records, content.pdf_metadata)
+        self.document_store.save_analysis(db, content, analysis["text"], analysis["sections"])
+
+    def _extract_pages(self, db: Session, job: ProcessingJob, content: DocumentContent) -> bool:
+        """Store page batches from the checkpoint on; False if another job got ahead."""
+        total_pages = content.page_count or 1
+
+        for records in self.pdf_processor.iter_page_batches(
+            content.file_path, start_page=content.pages_processed or 0, batch_size=self.checkpoint_pages
+        ):
+            if not self.document_store.save_page_batch(db, content, records):
+                return False
+            db.commit()
+            self._report(db, job, self.EXTRACTION_WEIGHT * content.pages_processed / total_pages)
+
+        return True
+
+    def _store_parse(self, db: Session, content: DocumentContent) -> None:
+        """Store the spaCy parse of the extracted text as a DocBin.
+
+        The parse only saves work later, so a missing model or an
+        oversized text leaves it unset instead of failing the job;
+        generation then parses on demand.
+        """
+        try:
+            nlp_engine = self.nlp_engine
+            analysis = nlp_engine.analyze(content.extracted_text or "")
+        except Exception as e:
+            print(f"Warning: Could not store NLP parse for content {content.id}: {e}")
+            return
+
+        self.document_store.save_parse(content, nlp_engine, analysis)
+        db.commit()
+
+    def _store_candidates(self, db: Session, content: DocumentContent, document) -> None:
+        """Store the question candidate pools of the content and its topics.
+
+        Like the parse, the pools only save work later: if they cannot be
+        built, they stay unset and generation builds them on demand.
+        """
+        size = settings.CANDIDATE_POOL_SIZE
+        db.flush()
+        topics = db.query(Topic).filter(Topic.document_id == document.id).all()
+
+        try:
+            version = self.question_generator.candidates_version
+            content_pool = None
+            if content.candidates_version != version:
+                analysis = self.document_store.load_parse(db, content, self.nlp_engine)
+                content_pool = self.question_generator.build_candidates(
+                    content.extracted_text or "", analysis, size
+                )
+            topic_pools = [
+                self.question_generator.build_candidates(topic.description or "", size=size)
+                for topic in topics
+            ]
+        except Exception as e:
+            print(f"Warning: Could not build question candidates for content {content.id}: {e}")
+            return
+
+        if content_pool is not None:
+            self.document_store.save_candidates(content, content_pool)
+        for topic, pool in zip(topics, topic_pools):
+            topic.candidates = pool
+
+    def _report(self, db: Session, job: ProcessingJob, progress: float) -> None:
+        """Persist progress, throttled to PROGRESS_STEP increments."""
+        if progress - (job.progress or 0.0) >= self.PROGRESS_STEP:
+            job.progress = round(progress, 3)
+            db.commit()
+
+    def _fail(self, db: Session, job: ProcessingJob, error: Exception) -> None:
+        job = db.get(ProcessingJob, job.id)
+        job.state = JobState.FAILED
+        job.error = str(error)
+        job.finished_at = datetime.utcnow()
+        job.document.processing_status = "failed"
+        db.commit()
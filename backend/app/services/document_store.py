@@ -0,0 +1,209 @@
+import os
+from fastapi import UploadFile
+from sqlalchemy import func
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session, undefer
+from sqlalchemy.orm.attributes import set_committed_value
+from typing import Any, Dict, List, Optional
+from app.models.document import Document
+from app.models.document_content import DocumentContent
+from app.models.document_page import DocumentPage
+from app.models.question import Topic
+from app.services.file_storage import FileStorage
+from app.services.nlp_engine import Analysis, NLPEngine
+
+
+class DocumentStore:
+    """Content-addressed store linking documents to shared blobs and analysis."""
+
+    def __init__(self, file_storage: FileStorage = None):
+        self.file_storage = file_storage or FileStorage()
+
+    def get_or_create_content(self, db: Session, stored: Dict[str, any]) -> DocumentContent:
+        """Find the content row for a stored upload, creating it on first sight."""
+        content = self._find_content(db, stored["content_hash"])
+        if content:
+            return content
+
+        content = DocumentContent(
+            content_hash=stored["content_hash"],
+            file_path=stored["file_path"],
+            file_size=stored["file_size"]
+        )
+        db.add(content)
+        try:
+            db.commit()
+        except IntegrityError:
+            # Another request stored the same bytes first
+            db.rollback()
+            return self._find_content(db, stored["content_hash"])
+
+        return content
+
+    async def restore_blob(self, content: DocumentContent, upload: UploadFile) -> None:
+        """Store an upload again if its content's blob has gone missing.
+
+        Deleting the last document of a content removes the blob; an upload
+        of the same bytes racing with that delete can link to a content
+        whose file is already gone.
+        """
+        if os.path.exists(content.file_path):
+            return
+
+        await upload.seek(0)
+        stored = await self.file_storage.save_upload(upload)
+        content.file_path = stored["file_path"]
+
+    def save_analysis(self, db: Session, content: DocumentContent, text: str,
+                      sections: List[Dict[str, str]], metadata: Dict[str, any] = None,
+                      pages: List[Dict[str, any]] = None) -> None:
+        """Record extraction results against the content hash."""
+        content.extracted_text = text
+        content.sections = sections
+        if metadata:
+            content.pdf_metadata = metadata
+            content.page_count = metadata.get("page_count")
+        if pages:
+            self.save_pages(db, content, pages)
+        content.is_processed = True
+
+    def save_pages(self, db: Session, content: DocumentContent, pages: List[Dict[str, any]]) -> None:
+        """Bulk insert per-page text rows for a content blob."""
+        db.bulk_insert_mappings(DocumentPage, [
+            {
+                "content_id": content.id,
+                "page_number": page["page_number"],
+                "text": page["text"],
+                "word_count": page["word_count"]
+            }
+            for page in pages
+        ])
+
+    def save_page_batch(self, db: Session, content: DocumentContent, records: List[Dict[str, any]]) -> bool:
+        """Store a batch of analyzed pages and advance the checkpoint.
+        
+        Callers commit after each batch, so the pages and the checkpoint
+        become visible together or not at all. The checkpoint only moves
+        if it still ends right before the batch; documents sharing the
+        content may be processed by several jobs at once, and the job that
+        loses gets False back, stores nothing and should roll back and
+        resume from the checkpoint the other job committed.
+        """
+        first_page = records[0]["page_number"] - 1
+        last_page = records[-1]["page_number"]
+        claimed = db.query(DocumentContent).filter(
+            DocumentContent.id == content.id,
+            func.coalesce(DocumentContent.pages_processed, 0) == first_page
+        ).update({DocumentContent.pages_processed: last_page}, synchronize_session=False)
+        if not claimed:
+            return False
+        
+        db.bulk_insert_mappings(DocumentPage, [
+            {
+                "content_id": content.id,
+                "page_number": record["page_number"],
+                "text": record["text"],
+                "word_count": record["word_count"],
+                "lead": record["lead"],
+                "sections": record["sections"]
+            }
+            for record in records
+        ])
+        set_committed_value(content, "pages_processed", last_page)
+        return True
+
+    def load_page_records(self, db: Session, content: DocumentContent) -> List[Dict[str, any]]:
+        """Read checkpointed pages back as analyze-style page records."""
+        pages = db.query(DocumentPage).options(
+            undefer(DocumentPage.lead), undefer(DocumentPage.sections)
+        ).filter(
+            DocumentPage.content_id == content.id
+        ).order_by(DocumentPage.page_number).all()
+
+        return [
+            {
+                "page_number": page.page_number,
+                "text": page.text or "",
+                "word_count": page.word_count or 0,
+                "lead": page.lead or "",
+                "sections": page.sections or []
+            }
+            for page in pages
+        ]
+
+    def save_parse(self, content: DocumentContent, nlp_engine: NLPEngine, analysis: Analysis) -> None:
+        """Keep the spaCy parse of a content's text so generation can skip parsing."""
+        content.nlp_doc = nlp_engine.to_bytes(analysis)
+        content.nlp_version = nlp_engine.pipeline_version
+
+    def load_parse(self, db: Session, content: DocumentContent, nlp_engine: NLPEngine) -> Optional[Analysis]:
+        """Stored parse of a content's text, or None if missing or from another pipeline."""
+        data = db.query(DocumentContent.nlp_doc).filter(
+            DocumentContent.id == content.id,
+            DocumentContent.nlp_version == nlp_engine.pipeline_version
+        ).scalar()
+        return nlp_engine.from_bytes(data) if data else None
+
+    def save_candidates(self, content: DocumentContent, candidates: Dict[str, Any]) -> None:
+        """Keep a content's question candidate pool so generation only has to sample."""
+        content.candidates = candidates
+        content.candidates_version = candidates["version"]
+
+    def load_candidates(self, db: Session, content: DocumentContent, version: str) -> Optional[Dict[str, Any]]:
+        """Stored candidate pool of a content, or None if missing or of another version."""
+        return db.query(DocumentContent.candidates).filter(
+            DocumentContent.id == content.id,
+            DocumentContent.candidates_version == version
+        ).scalar()
+
+    def get_pages(self, db: Session, document: Document, start: int, end: int) -> List[DocumentPage]:
+        """Pages start..end (1-based, inclusive) of a document's content."""
+        return db.query(DocumentPage).filter(
+            DocumentPage.content_id == document.content_id,
+            DocumentPage.page_number >= start,
+            DocumentPage.page_number <= end
+        ).order_by(DocumentPage.page_number).all()
+
+    def link_analysis(self, db: Session, document: Document) -> int:
+        """Give a document the topics of its already-analyzed content.
+
+        No extraction is repeated; only the per-document topic rows are
+        created. Returns the number of topics linked.
+        """
+        sections = document.content.sections or []
+
+        for section in sections:
+            topic = Topic(
+                name=section['title'],
+                description=section['content'][:500],  # First 500 chars
+                document_id=document.id
+            )
+            db.add(topic)
+
+        document.is_processed = True
+        document.processing_status = "completed"
+        return len(sections)
+
+    def release(self, db: Session, document: Document) -> None:
+        """Drop a document's claim on its content, deleting the blob if unused."""
+        content = document.content
+        if content is None:
+            self.file_storage.delete_blob(document.file_path)
+            return
+
+        still_used = db.query(Document.id).filter(
+            Document.content_id == content.id,
+            Document.id != document.id
+        ).first()
+
+        if not still_used:
+            self.file_storage.delete_blob(content.file_path)
+            db.query(DocumentPage).filter(
+                DocumentPage.content_id == content.id
+            ).delete(synchronize_session=False)
+            db.delete(content)
+
+    def _find_content(self, db: Session, content_hash: str) -> DocumentContent:
+        return db.query(DocumentContent).filter(
+            DocumentContent.content_hash == content_hash
+        ).first()
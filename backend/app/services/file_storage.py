@@ -0,0 +1,90 @@
+import aiofiles
+import aiofiles.os
+import hashlib
+import os
+import uuid
+from typing import Dict
+from fastapi import UploadFile
+from app.core.config import settings
+
+
+class UploadTooLargeError(Exception):
+    """Raised when an upload exceeds the configured size limit."""
+
+
+class FileStorage:
+    """Service for streaming uploaded files to disk."""
+
+    def __init__(self, upload_dir: str = None, max_size: int = None, chunk_size: int = None):
+        self.upload_dir = upload_dir or settings.UPLOAD_DIR
+        self.max_size = max_size or settings.MAX_UPLOAD_SIZE
+        self.chunk_size = chunk_size or settings.UPLOAD_CHUNK_SIZE
+        os.makedirs(self.upload_dir, exist_ok=True)
+
+    async def save_upload(self, upload: UploadFile) -> Dict[str, any]:
+        """Copy an upload to disk in fixed-size chunks, hashing it on the way.
+
+        Only one chunk is held in memory at a time. The size limit is checked
+        against the bytes actually received, so an oversized upload is
+        rejected as soon as it crosses the limit and the partial file removed.
+        The finished file is stored under its SHA-256. If that blob already
+        exists it is still replaced with the identical new copy, so a blob
+        deleted concurrently with the last document using it comes back.
+        """
+        file_extension = os.path.splitext(upload.filename or "")[1]
+        temp_path = os.path.join(self.upload_dir, f"{uuid.uuid4()}.part")
+
+        sha256 = hashlib.sha256()
+        file_size = 0
+
+        try:
+            async with aiofiles.open(temp_path, "wb") as f:
+                while True:
+                    chunk = await upload.read(self.chunk_size)
+                    if not chunk:
+                        break
+
+                    file_size += len(chunk)
+                    if file_size > self.max_size:
+                        raise UploadTooLargeError(
+                            f"File size exceeds maximum allowed size of {self.max_size} bytes"
+                        )
+
+                    sha256.update(chunk)
+                    await f.write(chunk)
+        except BaseException:
+            await self._remove_quietly(temp_path)
+            raise
+
+        content_hash = sha256.hexdigest()
+        file_path = self.blob_path(content_hash, file_extension)
+        is_duplicate = os.path.exists(file_path)
+
+        os.makedirs(os.path.dirname(file_path), exist_ok=True)
+        os.replace(temp_path, file_path)
+
+        return {
+            "filename": os.path.basename(file_path),
+            "file_path": file_path,
+            "file_size": file_size,
+            "content_hash": content_hash,
+            "is_duplicate": is_duplicate
+        }
+
+    def blob_path(self, content_hash: str, file_extension: str = ".pdf") -> str:
+        """Path of the content-addressed blob for a hash."""
+        return os.path.join(self.upload_dir, content_hash[:2], f"{content_hash}{file_extension}")
+
+    def delete_blob(self, file_path: str) -> None:
+        """Delete a stored blob, ignoring files that are already gone."""
+        try:
+            os.remove(file_path)
+        except FileNotFoundError:
+            pass
+
+    async def _remove_quietly(self, file_path: str) -> None:
+        """Delete a temporary file, ignoring errors."""
+        try:
+            await aiofiles.os.remove(file_path)
+        except OSError:
+            pass
@@ -0,0 +1,367 @@
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from functools import partial
+from queue import Empty, Queue
+from typing import Any, AsyncIterator, Dict, List, Optional
+import asyncio
+import multiprocessing
+import threading
+from app.core.config import settings
+from app.models.database import SessionLocal
+from app.models.document_content import DocumentContent
+from app.models.question import DifficultyLevel, QuestionType, Topic
+from app.services.document_store import DocumentStore
+from app.services.nlp_cache import NLPCache, get_nlp_cache
+from app.services.nlp_engine import nlp_status, warmup_nlp
+from app.services.question_generator import QuestionGenerator
+
+question_generator = QuestionGenerator()
+document_store = DocumentStore()
+
+
+class GenerationQueueFullError(Exception):
+    """Raised when too many generation requests are already waiting."""
+
+
+def _load_analysis(text: str, content_id: Optional[int]):
+    """Stored parse of a content's text (stored first if missing or stale)."""
+    if content_id is None:
+        return None
+
+    nlp_engine = question_generator.nlp_engine
+    db = SessionLocal()
+    try:
+        content = db.get(DocumentContent, content_id)
+        analysis = document_store.load_parse(db, content, nlp_engine)
+        if analysis is None:
+            analysis = nlp_engine.analyze(text)
+            document_store.save_parse(content, nlp_engine, analysis)
+            db.commit()
+        return analysis
+    finally:
+        db.close()
+
+
+def _load_candidates(text: str, document_id: Optional[int], content_id: Optional[int],
+                     topic_ids: Optional[List[int]]) -> Optional[Dict[str, Any]]:
+    """Stored candidate pool of a content or of a document's topics (built and
+    stored first if missing or stale).
+
+    Topic ids that belong to another document are ignored, as they are
+    when the request's text is assembled.
+    """
+    if content_id is None and not topic_ids:
+        return None
+
+    version = question_generator.candidates_version
+    size = settings.CANDIDATE_POOL_SIZE
+    db = SessionLocal()
+    try:
+        if topic_ids:
+            topics = db.query(Topic).filter(
+                Topic.id.in_(topic_ids),
+                Topic.document_id == document_id
+            ).order_by(Topic.id).all()
+            for topic in topics:
+                if not topic.candidates or topic.candidates["version"] != version:
+                    topic.candidates = question_generator.build_candidates(topic.description or "", size=size)
+            db.commit()
+            return question_generator.merge_candidates([topic.candidates for topic in topics])
+
+        content = db.get(DocumentContent, content_id)
+        candidates = document_store.load_candidates(db, content, version)
+        if candidates is None:
+            analysis = _load_analysis(text, content_id)
+            candidates = question_generator.build_candidates(text, analysis, size)
+            document_store.save_candidates(content, candidates)
+            db.commit()
+        return candidates
+    finally:
+        db.close()
+
+
+def generate_for_request(text: str, document_id: Optional[int], content_id: Optional[int],
+                         topic_ids: Optional[List[int]], options: Dict) -> List[Dict]:
+    """Generate questions for one request; runs inside a pool worker.
+
+    With a content_id, or a document_id and its topic_ids, generation
+    samples from their stored candidate pools, so it does no text
+    analysis at all.
+    """
+    candidates = _load_candidates(text, document_id, content_id, topic_ids)
+    return question_generator.generate_questions(text=text, candidates=candidates, **options)
+
+
+def stream_for_request(text: str, document_id: Optional[int], content_id: Optional[int],
+                       topic_ids: Optional[List[int]], options: Dict, queue, cancel=None) -> None:
+    """Like generate_for_request, but put each question on `queue` as it is
+    generated, followed by None. Stops early once `cancel` (an Event) is set."""
+    try:
+        candidates = _load_candidates(text, document_id, content_id, topic_ids)
+        for question in question_generator.iter_questions(text=text, candidates=candidates, **options):
+            if cancel is not None and cancel.is_set():
+                break
+            queue.put(question)
+    finally:
+        queue.put(None)
+
+
+class GenerationPool:
+    """Runs question generation off the event loop.
+
+    Requests go to GENERATION_WORKERS processes that each load the spaCy
+    model once at start-up, so a generation never blocks the API process
+    and cheap endpoints stay responsive. At most GENERATION_MAX_QUEUED
+    requests wait behind the running ones; further ones are rejected.
+    With no workers configured, generation runs on the event loop's
+    default thread pool instead (development and tests).
+
+    Seeded requests that name the hash of their text are answered from
+    `cache` when the same request was generated before, without
+    reaching a worker.
+    """
+
+    def __init__(self, workers: int = None, max_queued: int = None, cache: NLPCache = None):
+        self.workers = settings.GENERATION_WORKERS if workers is None else workers
+        self.max_queued = settings.GENERATION_MAX_QUEUED if max_queued is None else max_queued
+        self.cache = cache
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._manager = None
+        self._warmup = []
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._completed = 0
+        self._failed = 0
+        self._rejected = 0
+
+    def start(self) -> None:
+        """Start the worker processes and begin loading their models."""
+        with self._lock:
+            if self.workers <= 0 or self._executor is not None:
+                return
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=warmup_nlp
+            )
+            # One probe per worker makes every process start now
+            self._warmup = [self._executor.submit(nlp_status) for _ in range(self.workers)]
+
+    async def run(self, text: str, document_id: Optional[int] = None, content_id: Optional[int] = None,
+                  topic_ids: Optional[List[int]] = None, source_hash: str = None, **options) -> List[Dict]:
+        """Generate questions in the pool; options go to generate_questions."""
+        key = self._cache_key(source_hash, options)
+        cached = self._cached(key)
+        if cached is not None:
+            return cached
+
+        self._admit()
+        outcome = "failed"
+        try:
+            self.start()
+            job = partial(generate_for_request, text, document_id, content_id, topic_ids, options)
+            questions = await asyncio.get_running_loop().run_in_executor(self._executor, job)
+            outcome = "completed"
+        except BrokenProcessPool:
+            self._reset()
+            raise
+        except asyncio.CancelledError:
+            outcome = None
+            raise
+        finally:
+            self._release(outcome)
+
+        if key is not None:
+            self.cache.set(key, questions)
+        return questions
+
+    async def stream(self, text: str, document_id: Optional[int] = None, content_id: Optional[int] = None,
+                     topic_ids: Optional[List[int]] = None, source_hash: str = None, batch_size: int = None,
+                     **options) -> AsyncIterator[List[Dict]]:
+        """Generate questions in the pool, yielding them in micro-batches.
+
+        A batch holds the questions that are ready (at most batch_size),
+        so each one arrives as soon as the worker produces it, while
+        consumers can still persist several at once when generation runs
+        ahead of them. Options go to iter_questions.
+
+        Closing the iterator early (e.g. the client disconnected) tells
+        the worker to stop; the request keeps its slot until it has.
+        """
+        batch_size = batch_size or settings.GENERATION_STREAM_BATCH
+        key = self._cache_key(source_hash, options)
+        cached = self._cached(key)
+        if cached is not None:
+            for start in range(0, len(cached), batch_size):
+                yield cached[start:start + batch_size]
+            return
+
+        generated = []
+        job = None
+        self._admit()
+        outcome = "failed"
+        try:
+            self.start()
+            queue = self._queue()
+            cancel = self._event()
+            loop = asyncio.get_running_loop()
+            job = loop.run_in_executor(self._executor, partial(
+                stream_for_request, text, document_id, content_id, topic_ids, options, queue, cancel
+            ))
+
+            finished = False
+            while not finished:
+                try:
+                    item = await loop.run_in_executor(None, partial(queue.get, timeout=0.5))
+                except Empty:
+                    # The worker always ends with None unless it died
+                    if job.done():
+                        break
+                    continue
+
+                batch = []
+                while item is not None:
+                    batch.append(item)
+                    if len(batch) >= batch_size:
+                        break
+                    try:
+                        item = queue.get_nowait()
+                    except Empty:
+                        break
+                else:
+                    finished = True
+                if batch:
+                    generated.extend(batch)
+                    yield batch
+
+            await job
+            outcome = "completed"
+        except BrokenProcessPool:
+            self._reset()
+            raise
+        except (asyncio.CancelledError, GeneratorExit):
+            # The consumer went away; that is not a failed generation
+            outcome = None
+            raise
+        finally:
+            if job is not None and not job.done():
+                cancel.set()
+                self._release_when_done(job, outcome)
+            else:
+                self._release(outcome)
+
+        if key is not None and generated:
+            self.cache.set(key, generated)
+
+    def _cache_key(self, source_hash: Optional[str], options: Dict) -> Optional[str]:
+        if self.cache is None or source_hash is None:
+            return None
+        return question_generator.cache_key(source_hash, **options)
+
+    def _cached(self, key: Optional[str]) -> Optional[List[Dict]]:
+        """Cached questions for a key, with their enum fields restored."""
+        if key is None:
+            return None
+        found, questions = self.cache.get(key)
+        if not found:
+            return None
+        for question in questions:
+            question["question_type"] = QuestionType(question["question_type"])
+            question["difficulty"] = DifficultyLevel(question["difficulty"])
+        return questions
+
+    def _admit(self) -> None:
+        with self._lock:
+            if self._in_flight >= max(self.workers, 1) + self.max_queued:
+                self._rejected += 1
+                raise GenerationQueueFullError(
+                    f"Question generation is busy ({self._in_flight} requests in progress). Try again shortly."
+                )
+            self._in_flight += 1
+
+    def _release(self, outcome: Optional[str]) -> None:
+        """Free a slot, counting the request as "completed", "failed" or
+        neither (cancelled)."""
+        with self._lock:
+            self._in_flight -= 1
+            if outcome == "completed":
+                self._completed += 1
+            elif outcome == "failed":
+                self._failed += 1
+
+    def _release_when_done(self, job: asyncio.Future, outcome: Optional[str]) -> None:
+        """Free a slot once a job nobody awaits any more has finished."""
+        def done(future: asyncio.Future) -> None:
+            # Retrieve the result so an error is not reported as unhandled
+            if not future.cancelled():
+                future.exception()
+            self._release(outcome)
+
+        job.add_done_callback(done)
+
+    def _reset(self) -> None:
+        # A worker died (e.g. out of memory); start a fresh pool next time
+        with self._lock:
+            self._executor = None
+
+    def _queue(self):
+        """A queue the generating worker can put questions on."""
+        if self._executor is None:
+            return Queue()
+        return self._shared_manager().Queue()
+
+    def _event(self):
+        """A flag the consumer can set to stop the generating worker."""
+        if self._executor is None:
+            return threading.Event()
+        return self._shared_manager().Event()
+
+    def _shared_manager(self):
+        with self._lock:
+            if self._manager is None:
+                self._manager = multiprocessing.get_context("spawn").Manager()
+            return self._manager
+
+    def nlp_status(self) -> str:
+        """"ready" once every worker has its model loaded; "not_started"
+        until the workers are started (at startup, or with NLP_WARMUP off
+        on the first generation request)."""
+        if not self._warmup:
+            return "not_started"
+        if not all(probe.done() for probe in self._warmup):
+            return "loading"
+        statuses = [probe.result() if probe.exception() is None else "failed" for probe in self._warmup]
+        return "failed" if "failed" in statuses else "ready"
+
+    def stats(self) -> Dict[str, int]:
+        """Concurrency and queue-depth counters, for monitoring."""
+        with self._lock:
+            return {
+                "workers": self.workers,
+                "in_flight": self._in_flight,
+                "queued": max(0, self._in_flight - max(self.workers, 1)),
+                "max_queued": self.max_queued,
+                "completed": self._completed,
+                "failed": self._failed,
+                "rejected": self._rejected
+            }
+
+    def shutdown(self) -> None:
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+            if self._manager is not None:
+                self._manager.shutdown()
+                self._manager = None
+
+
+_generation_pool: Optional[GenerationPool] = None
+
+
+def get_generation_pool() -> GenerationPool:
+    """Return the process-wide generation pool."""
+    global _generation_pool
+    if _generation_pool is None:
+        _generation_pool = GenerationPool(cache=get_nlp_cache())
+    return _generation_pool
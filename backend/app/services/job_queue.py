@@ -0,0 +1,71 @@
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+from app.core.config import settings
+from app.models.database import SessionLocal
+from app.models.processing_job import ProcessingJob, JobState
+from app.services.document_processing import DocumentProcessingService
+
+
+class InProcessJobQueue:
+    """Runs processing jobs on a thread pool inside the API process.
+
+    Suitable for single-node deployments. Jobs are persisted before they are
+    submitted, so unfinished ones can be picked up again after a restart.
+    """
+
+    def __init__(self, max_workers: int = None, service: DocumentProcessingService = None):
+        self.service = service or DocumentProcessingService()
+        self.executor = ThreadPoolExecutor(
+            max_workers=max_workers or settings.JOB_WORKERS,
+            thread_name_prefix="autoq-job"
+        )
+
+    def submit(self, job_id: int) -> None:
+        """Schedule a persisted job for execution."""
+        self.executor.submit(self.service.run, job_id)
+
+    def recover(self) -> int:
+        """Requeue jobs left queued or running by a previous process."""
+        db = SessionLocal()
+        try:
+            job_ids = [job_id for (job_id,) in db.query(ProcessingJob.id).filter(
+                ProcessingJob.state.in_([JobState.QUEUED, JobState.RUNNING])
+            ).all()]
+        finally:
+            db.close()
+
+        for job_id in job_ids:
+            self.submit(job_id)
+        return len(job_ids)
+
+    def shutdown(self) -> None:
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+
+class CeleryJobQueue:
+    """Sends processing jobs to Celery workers over Redis."""
+
+    def submit(self, job_id: int) -> None:
+        from app.worker import process_document_job
+        process_document_job.delay(job_id)
+
+    def recover(self) -> int:
+        # Celery redelivers unacknowledged tasks itself
+        return 0
+
+    def shutdown(self) -> None:
+        pass
+
+
+_job_queue: Optional[object] = None
+
+
+def get_job_queue():
+    """Return the process-wide job queue for the configured backend."""
+    global _job_queue
+    if _job_queue is None:
+        if settings.JOB_BACKEND == "celery":
+            _job_queue = CeleryJobQueue()
+        else:
+            _job_queue = InProcessJobQueue()
+    return _job_queue
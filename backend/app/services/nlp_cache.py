@@ -0,0 +1,123 @@
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+import json
+import threading
+from app.core.config import settings
+
+_REDIS_FAILED = object()
+
+
+class NLPCache:
+    """Memo for NLPEngine results, shared by every request in the process.
+
+    The in-process tier is an LRU bounded by the encoded size of its
+    values rather than their count, since one book's entity list can
+    outweigh thousands of topic results. With a Redis URL, results are
+    also written to Redis so other workers and restarts can reuse them;
+    Redis errors are counted and otherwise ignored. Values are stored
+    JSON-encoded, so every hit returns a fresh copy that callers may
+    shuffle or mutate.
+    """
+
+    def __init__(self, max_bytes: int = None, redis_url: str = None, ttl: int = None):
+        self.max_bytes = settings.NLP_CACHE_MAX_BYTES if max_bytes is None else max_bytes
+        self.ttl = ttl or settings.NLP_CACHE_TTL
+        self._entries: "OrderedDict[str, bytes]" = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+        self._redis = None
+        if redis_url:
+            import redis
+            self._redis = redis.Redis.from_url(redis_url, socket_timeout=0.5)
+        self._counters = dict.fromkeys(
+            ("hits", "misses", "redis_hits", "redis_misses", "redis_errors", "evictions"), 0
+        )
+
+    def get(self, key: str) -> Tuple[bool, Any]:
+        """Return (found, value) for a key."""
+        with self._lock:
+            data = self._entries.get(key)
+            if data is not None:
+                self._entries.move_to_end(key)
+                self._counters["hits"] += 1
+                return True, json.loads(data)
+
+        if self._redis is not None:
+            data = self._redis_call("get", key)
+            if data is not None and data is not _REDIS_FAILED:
+                self._count("redis_hits")
+                self._store(key, data)
+                return True, json.loads(data)
+            if data is None:
+                self._count("redis_misses")
+
+        self._count("misses")
+        return False, None
+
+    def set(self, key: str, value: Any) -> None:
+        """Store a JSON-serializable value in every tier."""
+        data = json.dumps(value, separators=(",", ":")).encode("utf-8")
+        self._store(key, data)
+        if self._redis is not None:
+            self._redis_call("set", key, data, ex=self.ttl)
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters and current size, for monitoring."""
+        with self._lock:
+            stats = dict(self._counters)
+            lookups = stats["hits"] + stats["misses"]
+            stats.update(
+                entries=len(self._entries),
+                bytes=self._size,
+                max_bytes=self.max_bytes,
+                hit_rate=round(stats["hits"] / lookups, 3) if lookups else None,
+                redis=self._redis is not None
+            )
+        return stats
+
+    def clear(self) -> None:
+        """Drop the in-process tier (Redis entries expire on their own)."""
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+    def _store(self, key: str, data: bytes) -> None:
+        if len(data) > self.max_bytes:
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._size -= len(previous)
+            self._entries[key] = data
+            self._size += len(data)
+            while self._size > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._size -= len(evicted)
+                self._counters["evictions"] += 1
+
+    def _redis_call(self, method: str, *args, **kwargs):
+        import redis
+        try:
+            return getattr(self._redis, method)(*args, **kwargs)
+        except (redis.RedisError, OSError):
+            self._count("redis_errors")
+            return _REDIS_FAILED
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            self._counters[name] += 1
+
+
+_nlp_cache: Optional[NLPCache] = None
+_nlp_cache_lock = threading.Lock()
+
+
+def get_nlp_cache() -> Optional[NLPCache]:
+    """Return the process-wide result cache, or None when caching is disabled."""
+    global _nlp_cache
+    if settings.NLP_CACHE_MAX_BYTES <= 0:
+        return None
+    with _nlp_cache_lock:
+        if _nlp_cache is None:
+            _nlp_cache = NLPCache(redis_url=settings.REDIS_URL if settings.NLP_CACHE_REDIS else None)
+        return _nlp_cache
@@ -1,72 +1,473 @@
 import spacy
-from typing import List, Dict, Tuple
+from spacy.tokens import DocBin
+from typing import List, Dict, Optional, Set, Tuple, Iterable, Iterator, Union
+from functools import cached_property, wraps
+import hashlib
+import heapq
+import json
 import re
+import threading
 from collections import Counter
+from app.core.config import settings
+from app.services.nlp_cache import NLPCache, get_nlp_cache
+
+
+# Named pipeline profiles, smallest first; each provides everything the
+# ones before it do. Values are the model components kept besides the
+# rule-based sentencizer (None = the model's full default pipeline).
+PIPELINE_PROFILES = {
+    "sentences": (),  # sentence boundaries and lexical attributes
+    "entities": ("tok2vec", "ner", "entity_ruler"),  # + named entities
+    "full": None,  # + tags, lemmas, dependencies, noun chunks
+}
+
+_SENTENCIZER = "profile_sentencizer"
+
+# Part of every result cache key; bump when an extractor's output changes
+EXTRACTOR_VERSION = 1
+
+# A key sentence of the right length with an entity and an important verb;
+# non-exhaustive extraction stops once it has top_n sentences this good
+KEY_SENTENCE_GOOD_SCORE = 3.5
+
+
+# Where a chunk may end: after sentence punctuation (and closing quotes or
+# brackets) plus whitespace, or at a paragraph break
+_SENTENCE_BREAK = re.compile(r'[.!?]["\')\]]*\s+|\n\s*\n')
+
+# Definition cues, in priority order: "<term> is a|an|the <definition>.",
+# "refers to", "means", "can be defined as". Only the cue is matched; the
+# leading whitespace run is anchored at its first character so each run
+# is tried once, which keeps the scan linear in the sentence length.
+_DEFINITION_CUE = re.compile(
+    r'(?<!\s)\s+(?:(is\s+(?:a|an|the))|(refers to)|(means)|(can be defined as))(?=\s)',
+    re.IGNORECASE
+)
+_DEFINITION_END = re.compile(r'[.,]')
+_NON_SPACE = re.compile(r'\S')
+
+
+def _covers(profile: str, required: str) -> bool:
+    order = list(PIPELINE_PROFILES)
+    return order.index(profile) >= order.index(required)
+
+
+def _text_digest(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def _memoized(method):
+    """Serve an extractor from the engine's result cache when it has one.
+    
+    Results are keyed on the input text's hash, the method and its
+    arguments, the pipeline version and EXTRACTOR_VERSION, so the text
+    is only parsed when the result is not cached yet.
+    """
+    name = method.__name__
+    
+    @wraps(method)
+    def wrapper(self, text, *args, **kwargs):
+        if self.cache is None:
+            return method(self, text, *args, **kwargs)
+        
+        digest = _text_digest(text) if isinstance(text, str) else text.digest
+        params = json.dumps([args, sorted(kwargs.items())], separators=(",", ":"))
+        key = f"nlp:{EXTRACTOR_VERSION}:{self.pipeline_version}:{name}:{digest}:{params}"
+        found, result = self.cache.get(key)
+        if not found:
+            result = method(self, text, *args, **kwargs)
+            self.cache.set(key, result)
+        return result
+    
+    return wrapper
+
+
+def split_sentence_safe(text: str, max_chars: int) -> Iterator[str]:
+    """Split text into consecutive chunks of at most max_chars.
+    
+    Chunks end after the last sentence break in their window, falling
+    back to the last space and then to a hard cut. Concatenating the
+    chunks gives back the original text exactly.
+    """
+    start = 0
+    while len(text) - start > max_chars:
+        window_end = start + max_chars
+        cut = None
+        for match in _SENTENCE_BREAK.finditer(text, start, window_end):
+            cut = match.end()
+        if cut is None:
+            space = text.rfind(' ', start, window_end)
+            cut = space + 1 if space > start else window_end
+        yield text[start:cut]
+        start = cut
+    if start < len(text):
+        yield text[start:]
+
+
+def _match_definition(sentence: str) -> Optional[Tuple[str, str]]:
+    """Find (term, definition) in one sentence, or None.
+    
+    Matches what the former patterns, e.g. r'(.+?)\s+is\s+(?:a|an|the)\s+(.+?)[.,]',
+    found with re.search: the earliest cue of the highest-priority kind
+    that has a term on its line before it and a "." or "," later on the
+    definition's line. Line bounds and line failures are tracked as the
+    cues are visited in order, so no span of text is rescanned.
+    """
+    best = None
+    line_start = scanned = 0
+    line_end = dead_until = -1
+    for match in _DEFINITION_CUE.finditer(sentence):
+        priority = match.lastindex
+        if best is not None and priority >= best[0]:
+            continue
+        
+        term_end = match.start()
+        newline = sentence.rfind('\n', scanned, term_end)
+        if newline >= 0:
+            line_start = newline + 1
+        scanned = term_end
+        if term_end <= line_start:
+            continue
+        
+        body = _NON_SPACE.search(sentence, match.end())
+        if body is None:
+            break
+        def_start = body.start()
+        if def_start < dead_until:
+            continue
+        if def_start > line_end:
+            line_end = sentence.find('\n', def_start)
+            if line_end < 0:
+                line_end = len(sentence)
+        
+        end = _DEFINITION_END.search(sentence, def_start + 1, line_end)
+        if end is None:
+            # Later cues on this line would search a suffix of it
+            dead_until = line_end
+            continue
+        best = (priority, sentence[line_start:term_end].strip(), sentence[def_start:end.start()].strip())
+        if priority == 1:
+            break
+    
+    return best[1:] if best else None
+
+
+class TextAnalysis:
+    """A text parsed once, with the views the extractors read from it.
+    
+    Views are computed on first access and cached, so passing the same
+    analysis to several extractors never re-runs the pipeline. `profile`
+    names the pipeline profile the Doc was produced with.
+    """
+    
+    def __init__(self, doc, profile: str = "full"):
+        self.doc = doc
+        self.profile = profile
+    
+    @property
+    def text(self) -> str:
+        return self.doc.text
+    
+    @cached_property
+    def digest(self) -> str:
+        return _text_digest(self.text)
+    
+    @cached_property
+    def sentences(self) -> List:
+        return list(self.doc.sents)
+    
+    @cached_property
+    def entities(self) -> List:
+        return list(self.doc.ents)
+    
+    @cached_property
+    def sentence_entities(self) -> List[List]:
+        """Entities of each sentence, aligned with `sentences`.
+        
+        Built in one merge pass; Span.ents would rescan every entity in
+        the document for each sentence.
+        """
+        grouped = [[] for _ in self.sentences]
+        i = 0
+        for ent in self.entities:
+            while i < len(self.sentences) and self.sentences[i].end <= ent.start:
+                i += 1
+            if i < len(self.sentences) and ent.end <= self.sentences[i].end:
+                grouped[i].append(ent)
+        return grouped
+    
+    @cached_property
+    def sentence_lookup(self) -> Dict[str, object]:
+        """Sentence spans keyed by their stripped text (first occurrence wins)."""
+        lookup = {}
+        for sent in self.sentences:
+            lookup.setdefault(sent.text.strip(), sent)
+        return lookup
+    
+    @cached_property
+    def noun_chunks(self) -> List:
+        return list(self.doc.noun_chunks)
+    
+    @cached_property
+    def root_verbs(self) -> List:
+        """Sentence roots that are verbs, in document order."""
+        return [token for token in self.doc if token.dep_ == "ROOT" and token.pos_ == "VERB"]
+
+
+class ChunkedAnalysis:
+    """A long text parsed as consecutive sentence-aligned chunks.
+    
+    Chunk Docs are kept serialized in a DocBin (compact arrays, no
+    tensors) and restored one at a time while iterating, so memory holds
+    a single live chunk instead of one Doc for the whole book.
+    """
+    
+    def __init__(self, doc_bin: DocBin, vocab, profile: str = "full"):
+        self.doc_bin = doc_bin
+        self.vocab = vocab
+        self.profile = profile
+    
+    @property
+    def text(self) -> str:
+        return "".join(doc.text for doc in self.iter_docs())
+    
+    @cached_property
+    def digest(self) -> str:
+        return _text_digest(self.text)
+    
+    def iter_docs(self) -> Iterator:
+        return self.doc_bin.get_docs(self.vocab)
+
+
+class LazyAnalysis:
+    """Text whose parse is put off until an extractor needs it.
+    
+    Memoized extractors answer from the result cache without a Doc; the
+    first miss parses the text once with `profile` and later misses
+    reuse that parse.
+    """
+    
+    def __init__(self, text: str, profile: str = "full"):
+        self.text = text
+        self.profile = profile
+        self.analysis = None
+    
+    @cached_property
+    def digest(self) -> str:
+        return _text_digest(self.text)
+
+
+Analysis = Union[TextAnalysis, ChunkedAnalysis, LazyAnalysis]
 
 
 class NLPEngine:
     """NLP service for text analysis and concept extraction."""
     
-    def __init__(self, model_name: str = "en_core_web_sm"):
+    def __init__(self, model_name: str = "en_core_web_sm", cache: NLPCache = None):
+        self.cache = cache
         try:
             self.nlp = spacy.load(model_name)
         except OSError:
             raise Exception(f"spaCy model '{model_name}' not found. Run: python -m spacy download {model_name}")
+        
+        # A rule-based sentencizer lets light profiles skip the parser
+        if _SENTENCIZER not in self.nlp.pipe_names:
+            self.nlp.add_pipe("sentencizer", name=_SENTENCIZER, first=True)
+        self._disabled = {profile: self._disabled_components(profile) for profile in PIPELINE_PROFILES}
+    
+    def _disabled_components(self, profile: str) -> List[str]:
+        """Components to skip for a profile, passed per call as `disable`.
+        
+        Disabling per call (rather than select_pipes) leaves the shared
+        pipeline untouched, so concurrent callers can use different profiles.
+        """
+        keep = PIPELINE_PROFILES[profile]
+        if keep is None:
+            # Let the model's own parser/senter decide sentence boundaries
+            has_own = any(name in self.nlp.pipe_names for name in ("parser", "senter", "sentencizer"))
+            return [_SENTENCIZER] if has_own else []
+        return [name for name in self.nlp.pipe_names if name != _SENTENCIZER and name not in keep]
+    
+    @property
+    def pipeline_version(self) -> str:
+        """Identifies the loaded pipeline; stored parses from another one are stale."""
+        meta = self.nlp.meta
+        return f"{meta.get('lang')}_{meta.get('name')}-{meta.get('version')}/spacy-{spacy.__version__}"
+    
+    def to_bytes(self, analysis: Analysis) -> bytes:
+        """Serialize an analysis as a (zlib-compressed) DocBin."""
+        if isinstance(analysis, ChunkedAnalysis):
+            return analysis.doc_bin.to_bytes()
+        doc_bin = DocBin(store_user_data=False)
+        doc_bin.add(analysis.doc)
+        return doc_bin.to_bytes()
+    
+    def from_bytes(self, data: bytes, profile: str = "full") -> Analysis:
+        """Restore an analysis written by to_bytes without re-parsing."""
+        doc_bin = DocBin().from_bytes(data)
+        if len(doc_bin) > 1:
+            return ChunkedAnalysis(doc_bin, self.nlp.vocab, profile)
+        return TextAnalysis(next(doc_bin.get_docs(self.nlp.vocab)), profile)
+    
+    def iter_docs(self, texts: Iterable[str], batch_size: int = None, n_process: int = None,
+                  profile: str = "full") -> Iterator:
+        """Parse a stream of texts (e.g. PDFProcessor.iter_chunks) lazily.
+        
+        Texts are pulled from the iterable batch by batch, so a whole book
+        never has to be materialized or parsed as one Doc. Batch size and
+        worker processes default to NLP_BATCH_SIZE and NLP_N_PROCESS.
+        """
+        yield from self.nlp.pipe(
+            texts,
+            batch_size=batch_size or settings.NLP_BATCH_SIZE,
+            n_process=n_process or settings.NLP_N_PROCESS,
+            disable=self._disabled[profile]
+        )
+    
+    def analyze(self, text: Union[str, Analysis], profile: str = "full") -> Analysis:
+        """Parse text once for use by any number of extractors.
+        
+        Only the components of `profile` run. An existing analysis is
+        returned unchanged when its profile covers the one requested, so
+        every extractor below accepts either raw text or the result of
+        this method; a lighter analysis is re-parsed with more components.
+        Texts longer than NLP_CHUNK_CHARS become a ChunkedAnalysis.
+        """
+        if isinstance(text, LazyAnalysis):
+            if text.analysis is None or not _covers(text.analysis.profile, profile):
+                wanted = profile if _covers(profile, text.profile) else text.profile
+                text.analysis = self.analyze(text.text, wanted)
+            return text.analysis
+        if isinstance(text, (TextAnalysis, ChunkedAnalysis)):
+            if _covers(text.profile, profile):
+                return text
+            text = text.text
+        if len(text) > settings.NLP_CHUNK_CHARS:
+            return self._analyze_chunked(text, profile)
+        return TextAnalysis(self.nlp(text, disable=self._disabled[profile]), profile)
+    
+    def _analyze_chunked(self, text: str, profile: str) -> ChunkedAnalysis:
+        """Map step: parse sentence-aligned chunks through nlp.pipe.
+        
+        Chunks are fanned out over NLP_N_PROCESS workers one per batch and
+        each Doc is folded into a DocBin as soon as it comes back, so no
+        more than the in-flight chunks are ever held as live Docs. This
+        also keeps every parse below the model's max_length.
+        """
+        doc_bin = DocBin(store_user_data=False)
+        chunks = split_sentence_safe(text, settings.NLP_CHUNK_CHARS)
+        for doc in self.iter_docs(chunks, batch_size=1, profile=profile):
+            doc_bin.add(doc)
+        return ChunkedAnalysis(doc_bin, self.nlp.vocab, profile)
     
-    def extract_entities(self, text: str) -> List[Dict[str, str]]:
-        """Extract named entities from text."""
-        doc = self.nlp(text)
+    def _chunks(self, analysis: Analysis) -> Iterator[Tuple[int, TextAnalysis]]:
+        """(character offset, analysis) of each chunk; a single Doc is one chunk."""
+        if isinstance(analysis, TextAnalysis):
+            yield 0, analysis
+            return
+        
+        offset = 0
+        for doc in analysis.iter_docs():
+            yield offset, TextAnalysis(doc, analysis.profile)
+            offset += len(doc.text)
+    
+    def sentence_docs(self, sentences: List[str], analysis: Analysis = None,
+                      profile: str = "full") -> List:
+        """Parsed form of each sentence, reusing spans from `analysis`.
+        
+        Sentences taken from the analyzed text come back as their existing
+        spans; any others are parsed together in one nlp.pipe pass with
+        the given profile.
+        """
+        if isinstance(analysis, LazyAnalysis):
+            analysis = analysis.analysis
+        reusable = isinstance(analysis, TextAnalysis) and _covers(analysis.profile, profile)
+        lookup = analysis.sentence_lookup if reusable else {}
+        missing = list(dict.fromkeys(s for s in sentences if s not in lookup))
+        parsed = dict(zip(missing, self.iter_docs(missing, profile=profile))) if missing else {}
+        return [lookup[s] if s in lookup else parsed[s] for s in sentences]
+    
+    @_memoized
+    def extract_entities(self, text: Union[str, Analysis], limit: int = None) -> List[Dict[str, str]]:
+        """Extract named entities from text (the first `limit`, if given)."""
+        analysis = self.analyze(text, profile="entities")
         entities = []
         
-        for ent in doc.ents:
-            entities.append({
-                "text": ent.text,
-                "label": ent.label_,
-                "start": ent.start_char,
-                "end": ent.end_char
-            })
+        for offset, chunk in self._chunks(analysis):
+            for ent in chunk.entities:
+                entities.append({
+                    "text": ent.text,
+                    "label": ent.label_,
+                    "start": offset + ent.start_char,
+                    "end": offset + ent.end_char
+                })
+                if limit is not None and len(entities) >= limit:
+                    return entities
         
         return entities
     
-    def extract_noun_phrases(self, text: str) -> List[str]:
+    @_memoized
+    def extract_noun_phrases(self, text: Union[str, Analysis]) -> List[str]:
         """Extract noun phrases (potential concepts)."""
-        doc = self.nlp(text)
-        noun_phrases = []
+        analysis = self.analyze(text, profile="full")
+        noun_phrases = set()
         
-        for chunk in doc.noun_chunks:
-            # Filter out very short or common phrases
-            if len(chunk.text.split()) >= 2 and len(chunk.text) > 5:
-                noun_phrases.append(chunk.text.strip())
+        for _, part in self._chunks(analysis):
+            for chunk in part.noun_chunks:
+                # Filter out very short or common phrases
+                if len(chunk.text.split()) >= 2 and len(chunk.text) > 5:
+                    noun_phrases.add(chunk.text.strip())
         
-        return list(set(noun_phrases))
+        return list(noun_phrases)
     
-    def extract_key_sentences(self, text: str, top_n: int = 10) -> List[str]:
-        """Extract key sentences that could be used for questions."""
-        doc = self.nlp(text)
-        sentences = [sent.text.strip() for sent in doc.sents]
+    @_memoized
+    def extract_key_sentences(self, text: Union[str, Analysis], top_n: int = 10,
+                              exhaustive: bool = True) -> List[str]:
+        """Extract key sentences that could be used for questions.
+        
+        Sentences stream through a heap bounded by top_n. With
+        exhaustive=False (interactive requests), the scan stops once top_n
+        sentences score at least KEY_SENTENCE_GOOD_SCORE, so the rest of
+        a long document is never scored or, when chunked, restored.
+        """
+        analysis = self.analyze(text, profile="full")
+        if top_n <= 0:
+            return []
         
         # Score sentences based on:
         # 1. Length (not too short, not too long)
         # 2. Presence of important entities
         # 3. Presence of key verbs
         
-        scored_sentences = []
-        for sent in sentences:
-            score = self._score_sentence(sent)
+        # Global top N across chunks: a min-heap of (score, -position), so
+        # equal scores keep document order as a stable sort would
+        best = []
+        sentences = (pair for _, chunk in self._chunks(analysis)
+                     for pair in zip(chunk.sentences, chunk.sentence_entities))
+        for position, (sent, sent_ents) in enumerate(sentences):
+            score = self._score_span(sent, sent_ents)
             if score > 0:
-                scored_sentences.append((sent, score))
+                item = (score, -position, sent.text.strip())
+                if len(best) < top_n:
+                    heapq.heappush(best, item)
+                elif item > best[0]:
+                    heapq.heapreplace(best, item)
+            if not exhaustive and len(best) == top_n and best[0][0] >= KEY_SENTENCE_GOOD_SCORE:
+                break
         
-        # Sort by score and return top N
-        scored_sentences.sort(key=lambda x: x[1], reverse=True)
-        return [sent for sent, score in scored_sentences[:top_n]]
+        return [sent for score, _, sent in sorted(best, reverse=True)]
     
     def _score_sentence(self, sentence: str) -> float:
         """Score a sentence for its suitability as a question source."""
-        doc = self.nlp(sentence)
+        doc = self.analyze(sentence, profile="full").doc
+        return self._score_span(doc, doc.ents)
+    
+    def _score_span(self, sent, ents) -> float:
+        """Score an already-parsed sentence (Doc or Span) and its entities."""
         score = 0.0
         
         # Length score (prefer 10-30 words)
-        word_count = len([token for token in doc if not token.is_punct])
+        word_count = len([token for token in sent if not token.is_punct])
         if 10 <= word_count <= 30:
             score += 2.0
         elif 5 <= word_count < 10 or 30 < word_count <= 50:
@@ -75,69 +476,67 @@ class NLPEngine:
             return 0.0  # Too short or too long
         
         # Entity score
-        if doc.ents:
-            score += len(doc.ents) * 0.5
+        if ents:
+            score += len(ents) * 0.5
         
         # Important verbs
         important_verbs = {'is', 'are', 'was', 'were', 'define', 'explain', 'describe', 
                           'calculate', 'determine', 'show', 'prove', 'demonstrate'}
-        for token in doc:
+        for token in sent:
             if token.pos_ == "VERB" and token.lemma_ in important_verbs:
                 score += 1.0
         
         # Has numbers (good for factual questions)
-        if any(token.like_num for token in doc):
+        if any(token.like_num for token in sent):
             score += 0.5
         
         return score
     
-    def extract_definitions(self, text: str) -> List[Dict[str, str]]:
-        """Extract definition-like sentences."""
-        doc = self.nlp(text)
+    @_memoized
+    def extract_definitions(self, text: Union[str, Analysis], limit: int = None) -> List[Dict[str, str]]:
+        """Extract definition-like sentences (the first `limit`, if given)."""
+        analysis = self.analyze(text, profile="sentences")
         definitions = []
         
-        # Patterns for definitions
-        definition_patterns = [
-            r'(.+?)\s+is\s+(?:a|an|the)\s+(.+?)[\.\,]',
-            r'(.+?)\s+refers to\s+(.+?)[\.\,]',
-            r'(.+?)\s+means\s+(.+?)[\.\,]',
-            r'(.+?)\s+can be defined as\s+(.+?)[\.\,]',
-        ]
-        
-        for sent in doc.sents:
-            sent_text = sent.text.strip()
-            for pattern in definition_patterns:
-                match = re.search(pattern, sent_text, re.IGNORECASE)
+        for _, chunk in self._chunks(analysis):
+            for sent in chunk.sentences:
+                sent_text = sent.text.strip()
+                match = _match_definition(sent_text)
                 if match:
                     definitions.append({
-                        "term": match.group(1).strip(),
-                        "definition": match.group(2).strip(),
+                        "term": match[0],
+                        "definition": match[1],
                         "sentence": sent_text
                     })
-                    break
+                if limit is not None and len(definitions) >= limit:
+                    return definitions
         
         return definitions
     
-    def extract_facts(self, text: str) -> List[str]:
-        """Extract factual statements."""
-        doc = self.nlp(text)
+    @_memoized
+    def extract_facts(self, text: Union[str, Analysis], limit: int = None) -> List[str]:
+        """Extract factual statements (the first `limit`, if given)."""
+        analysis = self.analyze(text, profile="entities")
         facts = []
         
-        for sent in doc.sents:
-            sent_text = sent.text.strip()
-            
-            # Look for sentences with numbers, dates, or strong factual indicators
-            has_number = any(token.like_num for token in sent)
-            has_date = any(ent.label_ == "DATE" for ent in sent.ents)
-            has_quantity = any(ent.label_ in ["QUANTITY", "PERCENT", "MONEY"] for ent in sent.ents)
-            
-            if has_number or has_date or has_quantity:
-                if 10 <= len(sent_text.split()) <= 40:
-                    facts.append(sent_text)
+        for _, chunk in self._chunks(analysis):
+            for sent, sent_ents in zip(chunk.sentences, chunk.sentence_entities):
+                sent_text = sent.text.strip()
+                
+                # Look for sentences with numbers, dates, or strong factual indicators
+                has_number = any(token.like_num for token in sent)
+                has_date = any(ent.label_ == "DATE" for ent in sent_ents)
+                has_quantity = any(ent.label_ in ["QUANTITY", "PERCENT", "MONEY"] for ent in sent_ents)
+                
+                if has_number or has_date or has_quantity:
+                    if 10 <= len(sent_text.split()) <= 40:
+                        facts.append(sent_text)
+                        if limit is not None and len(facts) >= limit:
+                            return facts
         
         return facts
     
-    def identify_topics(self, text: str, num_topics: int = 5) -> List[str]:
+    def identify_topics(self, text: Union[str, Analysis], num_topics: int = 5) -> List[str]:
         """Identify main topics using noun phrase frequency."""
         noun_phrases = self.extract_noun_phrases(text)
         
@@ -149,51 +548,117 @@ class NLPEngine:
         
         return top_topics
     
-    def extract_relationships(self, text: str) -> List[Dict[str, str]]:
-        """Extract subject-verb-object relationships."""
-        doc = self.nlp(text)
+    @_memoized
+    def extract_relationships(self, text: Union[str, Analysis], limit: int = None) -> List[Dict[str, str]]:
+        """Extract subject-verb-object relationships (the first `limit`, if given)."""
+        analysis = self.analyze(text, profile="full")
         relationships = []
         
-        for sent in doc.sents:
-            for token in sent:
-                if token.dep_ == "ROOT" and token.pos_ == "VERB":
-                    subject = None
-                    obj = None
-                    
-                    for child in token.children:
-                        if child.dep_ in ["nsubj", "nsubjpass"]:
-                            subject = child.text
-                        elif child.dep_ in ["dobj", "pobj"]:
-                            obj = child.text
-                    
-                    if subject and obj:
-                        relationships.append({
-                            "subject": subject,
-                            "verb": token.text,
-                            "object": obj,
-                            "sentence": sent.text.strip()
-                        })
+        for _, chunk in self._chunks(analysis):
+            for token in chunk.root_verbs:
+                subject = None
+                obj = None
+                
+                for child in token.children:
+                    if child.dep_ in ["nsubj", "nsubjpass"]:
+                        subject = child.text
+                    elif child.dep_ in ["dobj", "pobj"]:
+                        obj = child.text
+                
+                if subject and obj:
+                    relationships.append({
+                        "subject": subject,
+                        "verb": token.text,
+                        "object": obj,
+                        "sentence": token.sent.text.strip()
+                    })
+                    if limit is not None and len(relationships) >= limit:
+                        return relationships
         
         return relationships
     
-    def calculate_text_complexity(self, text: str) -> Dict[str, float]:
+    @_memoized
+    def calculate_text_complexity(self, text: Union[str, Analysis]) -> Dict[str, float]:
         """Calculate text complexity metrics."""
-        doc = self.nlp(text)
-        
-        sentences = list(doc.sents)
-        words = [token for token in doc if not token.is_punct and not token.is_space]
+        analysis = self.analyze(text, profile="sentences")
         
-        avg_sentence_length = len(words) / len(sentences) if sentences else 0
-        avg_word_length = sum(len(token.text) for token in words) / len(words) if words else 0
+        # Running sums, so chunks can be folded in one at a time
+        num_sentences = num_words = word_chars = complex_words = 0
+        for _, chunk in self._chunks(analysis):
+            num_sentences += len(chunk.sentences)
+            for token in chunk.doc:
+                if token.is_punct or token.is_space:
+                    continue
+                num_words += 1
+                word_chars += len(token.text)
+                # Count complex words (3+ syllables - approximation)
+                if len(token.text) > 6:
+                    complex_words += 1
         
-        # Count complex words (3+ syllables - approximation)
-        complex_words = sum(1 for token in words if len(token.text) > 6)
-        complex_word_ratio = complex_words / len(words) if words else 0
+        avg_sentence_length = num_words / num_sentences if num_sentences else 0
+        avg_word_length = word_chars / num_words if num_words else 0
+        complex_word_ratio = complex_words / num_words if num_words else 0
         
         return {
             "avg_sentence_length": avg_sentence_length,
             "avg_word_length": avg_word_length,
             "complex_word_ratio": complex_word_ratio,
-            "total_sentences": len(sentences),
-            "total_words": len(words)
+            "total_sentences": num_sentences,
+            "total_words": num_words
         }
+
+
+# Process-wide engines, one per model name, loaded on first use
+_engines: Dict[str, NLPEngine] = {}
+_load_errors: Dict[str, str] = {}
+_loading: Set[str] = set()
+_engines_lock = threading.Lock()
+
+
+def get_nlp_engine(model_name: str = None) -> NLPEngine:
+    """Return the shared NLPEngine for a model, loading it once per process.
+    
+    Shared engines memoize their results in the process-wide NLPCache.
+    """
+    model_name = model_name or settings.SPACY_MODEL
+    engine = _engines.get(model_name)
+    if engine is not None:
+        return engine
+    
+    with _engines_lock:
+        engine = _engines.get(model_name)
+        if engine is None:
+            _loading.add(model_name)
+            try:
+                engine = NLPEngine(model_name, cache=get_nlp_cache())
+            except Exception as e:
+                _load_errors[model_name] = str(e)
+                raise
+            finally:
+                _loading.discard(model_name)
+            _engines[model_name] = engine
+            _load_errors.pop(model_name, None)
+    return engine
+
+
+def warmup_nlp(model_name: str = None) -> bool:
+    """Load a model ahead of the first request. Returns whether it loaded."""
+    try:
+        get_nlp_engine(model_name)
+    except Exception as e:
+        print(f"⚠️  NLP model not loaded: {e}")
+        return False
+    return True
+
+
+def nlp_status(model_name: str = None) -> str:
+    """"ready", "loading", "failed" or "not_started" (nothing asked for the
+    model yet, e.g. with NLP_WARMUP off) for this process."""
+    model_name = model_name or settings.SPACY_MODEL
+    if model_name in _engines:
+        return "ready"
+    if model_name in _load_errors:
+        return "failed"
+    if model_name in _loading:
+        return "loading"
+    return "not_started"
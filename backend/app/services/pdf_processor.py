@@ -1,126 +1,564 @@
 import fitz  # PyMuPDF
-from typing import List, Dict, Tuple
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from itertools import repeat
+from typing import List, Dict, Tuple, Callable, Optional, Iterable, Iterator, Union
+from contextlib import contextmanager
+import mmap
+import multiprocessing
+import os
 import re
 from pathlib import Path
 import hashlib
+from app.core.config import settings
+
+
+# Common heading patterns
+HEADING_PATTERNS = [
+    re.compile(r'^(Chapter|CHAPTER)\s+\d+[:\.\s]+(.+)$', re.MULTILINE),
+    re.compile(r'^(\d+\.\s+)([A-Z][^.!?]*?)$', re.MULTILINE),
+    re.compile(r'^([A-Z][A-Z\s]{3,}?)$', re.MULTILINE),  # ALL CAPS headings
+    re.compile(r'^(Unit|UNIT)\s+\d+[:\.\s]+(.+)$', re.MULTILINE),
+]
+
+
+# HEADING_PATTERNS as one alternation over whole lines of a multi-line
+# text. Horizontal whitespace is [^\S\n] so no branch can run past the
+# end of its line, and every branch ends on a non-space character so
+# lines match exactly as their stripped form would.
+_HEADING_BODY = (
+    r'[^\S\n]*('
+    r'(?:Chapter|CHAPTER|Unit|UNIT)[^\S\n]+\d+(?:[:.]|[^\S\n])+.*?\S'
+    r'|\d+\.[^\S\n]+[A-Z][^.!?\n]*?'
+    r'|[A-Z](?:[A-Z]|[^\S\n]){2,}[A-Z]'
+    r')[^\S\n]*$'
+)
+_HEADING_LINE = re.compile(_HEADING_BODY, re.MULTILINE)
+# Headings after the first line; the literal "\n" prefix lets the regex
+# engine skip straight to line breaks instead of trying every offset.
+_NEXT_HEADING = re.compile(r'\n' + _HEADING_BODY, re.MULTILINE)
+_NON_SPACE = re.compile(r'\S')
+
+
+def _is_heading(line: str) -> bool:
+    return _HEADING_LINE.match(line) is not None
+
+
+def _scan_sections(text: str) -> Iterator[Tuple[Optional[str], int, int]]:
+    """Yield (title, body_start, body_end) for each heading in text.
+    
+    The first item has title None and covers the text before the first
+    heading. Only offsets are produced; no section text is copied.
+    """
+    start = 0
+    title = None
+    
+    first = _HEADING_LINE.match(text)
+    if first:
+        yield None, 0, 0
+        title = first.group(1).rstrip()
+        start = first.end()
+    
+    for match in _NEXT_HEADING.finditer(text, start):
+        yield title, start, match.start()
+        title = match.group(1).rstrip()
+        start = match.end()
+    yield title, start, len(text)
+
+
+def _join_lines(text: str, start: int, end: int) -> str:
+    """Non-blank lines of text[start:end], stripped and joined by spaces."""
+    return " ".join(filter(None, map(str.strip, text[start:end].split('\n'))))
+
+
+class SectionSpan:
+    """A detected section stored as offsets into its source text."""
+    
+    __slots__ = ("source", "title", "start", "end")
+    
+    def __init__(self, source: str, title: str, start: int, end: int):
+        self.source = source
+        self.title = title
+        self.start = start
+        self.end = end
+    
+    @property
+    def content(self) -> str:
+        """Section body with its lines joined, built on each access."""
+        return _join_lines(self.source, self.start, self.end) + " "
+    
+    def to_dict(self) -> Dict[str, str]:
+        return {"title": self.title, "content": self.content}
+
+
+def _clean_text(text: str) -> str:
+    """Clean extracted text."""
+    # Remove excessive whitespace
+    text = re.sub(r'\s+', ' ', text)
+    
+    # Remove page numbers (simple pattern)
+    text = re.sub(r'\n\d+\n', '\n', text)
+    
+    # Remove special characters but keep punctuation
+    text = re.sub(r'[^\w\s.,;:!?()\-\'"]+', '', text)
+    
+    return text.strip()
+
+
+@contextmanager
+def _open_pdf(pdf_path: str):
+    """Open a PDF backed by a read-only memory map of the file.
+    
+    Falls back to a regular path-based open if this PyMuPDF build does not
+    accept buffer streams.
+    """
+    with open(pdf_path, "rb") as f:
+        try:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:  # empty file
+            mapped = None
+        
+        view = memoryview(mapped) if mapped is not None else None
+        try:
+            try:
+                doc = fitz.open(stream=view, filetype="pdf")
+            except TypeError:
+                doc = fitz.open(pdf_path)
+            try:
+                yield doc
+            finally:
+                doc.close()
+                del doc
+        finally:
+            if view is not None:
+                view.release()
+                mapped.close()
+
+
+# Layout-based heading detection
+HEADING_SIZE_RATIO = 1.15  # font size relative to the page's body text
+MAX_HEADING_WORDS = 15
+
+# Numbered chapter/unit lines count as headings even at body size
+NUMBERED_HEADING_PATTERNS = [HEADING_PATTERNS[0], HEADING_PATTERNS[3]]
+
+# Text spans only; skipping images keeps get_text("dict") cheap
+_DICT_FLAGS = fitz.TEXTFLAGS_DICT & ~fitz.TEXT_PRESERVE_IMAGES
+_BOLD_FLAG = 16
+
+
+def _page_lines(page) -> List[Tuple[str, float, bool]]:
+    """Lines of a page as (text, largest font size, all spans bold)."""
+    lines = []
+    for block in page.get_text("dict", flags=_DICT_FLAGS)["blocks"]:
+        for line in block.get("lines", []):
+            spans = [span for span in line["spans"] if span["text"].strip()]
+            if not spans:
+                continue
+            
+            text = "".join(span["text"] for span in line["spans"]).strip()
+            size = max(span["size"] for span in spans)
+            bold = all(span["flags"] & _BOLD_FLAG or "Bold" in span["font"] for span in spans)
+            lines.append((text, size, bold))
+    return lines
+
+
+def _body_style(lines: List[Tuple[str, float, bool]]) -> Tuple[float, bool]:
+    """Font size and boldness covering the most characters on the page."""
+    chars_by_size: Dict[float, int] = {}
+    bold_chars = 0
+    total_chars = 0
+    
+    for text, size, bold in lines:
+        size = round(size, 1)
+        chars_by_size[size] = chars_by_size.get(size, 0) + len(text)
+        total_chars += len(text)
+        if bold:
+            bold_chars += len(text)
+    
+    if not chars_by_size:
+        return 0.0, False
+    return max(chars_by_size, key=chars_by_size.get), bold_chars * 2 > total_chars
+
+
+def _is_layout_heading(text: str, size: float, bold: bool, body_size: float, body_bold: bool) -> bool:
+    """Decide whether a line is a heading from its font relative to body text."""
+    if any(pattern.match(text) for pattern in NUMBERED_HEADING_PATTERNS):
+        return True
+    
+    if len(text.split()) > MAX_HEADING_WORDS or text.endswith(('.', ',', ';', ':')):
+        return False
+    
+    if size >= body_size * HEADING_SIZE_RATIO:
+        return True
+    
+    # Bold lines at body size, unless the body text itself is bold
+    return bold and not body_bold and size >= body_size
+
+
+def _analyze_page(page, page_number: int) -> Dict[str, any]:
+    """Walk one page's lines once, collecting text, counts and headings.
+    
+    Headings are recognized from span font sizes and weights captured by
+    get_text("dict"), so section boundaries come out of the same pass as
+    the text. Lines before the first heading on the page are returned as
+    "lead"; they continue whichever section the previous page ended in.
+    """
+    lines = _page_lines(page)
+    body_size, body_bold = _body_style(lines)
+    
+    lead: List[str] = []
+    sections: List[Dict[str, any]] = []
+    current = lead
+    
+    for text, size, bold in lines:
+        if _is_layout_heading(text, size, bold, body_size, body_bold):
+            current = []
+            sections.append({"title": text, "font_size": round(size, 1), "lines": current})
+        else:
+            current.append(text)
+    
+    raw_text = "\n".join(text for text, _, _ in lines)
+    
+    return {
+        "page_number": page_number,
+        "text": _clean_text(raw_text),
+        "word_count": len(raw_text.split()),
+        "lead": " ".join(lead),
+        "sections": [
+            {"title": s["title"], "font_size": s["font_size"], "content": " ".join(s["lines"])}
+            for s in sections
+        ]
+    }
+
+
+def _analyze_page_range(pdf_path: str, start: int, end: int) -> List[Dict[str, any]]:
+    """Analyze pages [start, end). Runs in a worker process."""
+    with _open_pdf(pdf_path) as doc:
+        return [_analyze_page(doc[page_num], page_num + 1) for page_num in range(start, end)]
+
+
+def _extract_page_range(pdf_path: str, start: int, end: int) -> List[str]:
+    """Extract raw text for pages [start, end). Runs in a worker process."""
+    doc = fitz.open(pdf_path)
+    try:
+        return [doc[page_num].get_text() for page_num in range(start, end)]
+    finally:
+        doc.close()
 
 
 class PDFProcessor:
     """Service for extracting text and metadata from PDF files."""
     
-    def __init__(self):
+    def __init__(self, workers: Optional[int] = None, batch_size: Optional[int] = None):
         self.min_text_length = 50
+        self.workers = workers or settings.PDF_EXTRACTION_WORKERS or os.cpu_count() or 1
+        self.batch_size = batch_size or settings.PDF_EXTRACTION_BATCH_SIZE
+        self.parallel_min_pages = settings.PDF_PARALLEL_MIN_PAGES
     
-    def extract_text(self, pdf_path: str) -> str:
-        """Extract all text from a PDF file."""
+    def extract_text(
+        self,
+        pdf_path: str,
+        progress_callback: Optional[Callable[[int, int], None]] = None,
+        workers: Optional[int] = None,
+        batch_size: Optional[int] = None
+    ) -> str:
+        """Extract all text from a PDF file.
+        
+        Documents with at least PDF_PARALLEL_MIN_PAGES pages are split into
+        page batches extracted by a process pool when more than one worker
+        is available. If given, progress_callback is called as
+        (pages_done, total_pages).
+        """
+        workers = workers or self.workers
+        batch_size = batch_size or self.batch_size
+        
         try:
             doc = fitz.open(pdf_path)
-            text = ""
+            total_pages = len(doc)
             
-            for page_num in range(len(doc)):
-                page = doc[page_num]
-                text += page.get_text()
+            if workers > 1 and total_pages >= max(self.parallel_min_pages, 2 * batch_size):
+                doc.close()
+                page_texts = self._run_page_batches(
+                    _extract_page_range, pdf_path, total_pages, workers, batch_size, progress_callback
+                )
+            else:
+                page_texts = []
+                for page_num in range(total_pages):
+                    page_texts.append(doc[page_num].get_text())
+                    
+                    if progress_callback:
+                        progress_callback(page_num + 1, total_pages)
+                doc.close()
             
-            doc.close()
-            return self._clean_text(text)
+            return self._clean_text("".join(page_texts))
         except Exception as e:
             raise Exception(f"Error extracting text from PDF: {str(e)}")
     
+    def _run_page_batches(
+        self,
+        worker_fn: Callable[[str, int, int], List],
+        pdf_path: str,
+        total_pages: int,
+        workers: int,
+        batch_size: int,
+        progress_callback: Optional[Callable[[int, int], None]] = None
+    ) -> List:
+        """Run worker_fn over page batches in worker processes; results in page order."""
+        ranges = [(start, min(start + batch_size, total_pages))
+                  for start in range(0, total_pages, batch_size)]
+        batches: List[List] = [None] * len(ranges)
+        pages_done = 0
+        
+        # spawn: workers are started from job threads, where fork is unsafe
+        context = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(max_workers=min(workers, len(ranges)), mp_context=context) as pool:
+            futures = {
+                pool.submit(worker_fn, pdf_path, start, end): index
+                for index, (start, end) in enumerate(ranges)
+            }
+            for future in as_completed(futures):
+                index = futures[future]
+                batches[index] = future.result()
+                pages_done += len(batches[index])
+                
+                if progress_callback:
+                    progress_callback(pages_done, total_pages)
+        
+        return [item for batch in batches for item in batch]
+    
+    def analyze(
+        self,
+        pdf_path: str,
+        progress_callback: Optional[Callable[[int, int], None]] = None,
+        workers: Optional[int] = None,
+        batch_size: Optional[int] = None
+    ) -> Dict[str, any]:
+        """Open a PDF once and extract everything processing needs in one pass.
+        
+        Returns a dict with "text" (cleaned full text), "pages" (per-page
+        text and word counts), "metadata", "headings" (heading candidates
+        with their page numbers) and "sections" as detect_sections would
+        build them. Large documents are analyzed in parallel page batches
+        like extract_text.
+        """
+        workers = workers or self.workers
+        batch_size = batch_size or self.batch_size
+        
+        try:
+            with _open_pdf(pdf_path) as doc:
+                total_pages = len(doc)
+                metadata = self._metadata_from(doc, pdf_path)
+                
+                if workers > 1 and total_pages >= max(self.parallel_min_pages, 2 * batch_size):
+                    page_records = None
+                else:
+                    page_records = []
+                    for page_num in range(total_pages):
+                        page_records.append(_analyze_page(doc[page_num], page_num + 1))
+                        
+                        if progress_callback:
+                            progress_callback(page_num + 1, total_pages)
+            
+            if page_records is None:
+                page_records = self._run_page_batches(
+                    _analyze_page_range, pdf_path, total_pages, workers, batch_size, progress_callback
+                )
+            
+            return self._assemble_analysis(page_records, metadata)
+        except Exception as e:
+            raise Exception(f"Error analyzing PDF: {str(e)}")
+    
+    def iter_page_batches(
+        self,
+        pdf_path: str,
+        start_page: int = 0,
+        batch_size: Optional[int] = None,
+        workers: Optional[int] = None
+    ) -> Iterator[List[Dict[str, any]]]:
+        """Yield analyze-style page records in consecutive batches.
+        
+        Starts at start_page (0-based) so interrupted processing can resume
+        after its last stored batch. Batches always arrive in page order;
+        with more than one worker they are analyzed in a process pool ahead
+        of the consumer.
+        """
+        workers = workers or self.workers
+        batch_size = batch_size or self.batch_size
+        
+        with _open_pdf(pdf_path) as doc:
+            total_pages = len(doc)
+            
+            if not (workers > 1 and total_pages - start_page >= max(self.parallel_min_pages, 2 * batch_size)):
+                for start in range(start_page, total_pages, batch_size):
+                    end = min(start + batch_size, total_pages)
+                    yield [_analyze_page(doc[page_num], page_num + 1) for page_num in range(start, end)]
+                return
+        
+        starts = list(range(start_page, total_pages, batch_size))
+        ends = [min(start + batch_size, total_pages) for start in starts]
+        
+        # spawn: workers are started from job threads, where fork is unsafe
+        context = multiprocessing.get_context("spawn")
+        pool = ProcessPoolExecutor(max_workers=min(workers, len(starts)), mp_context=context)
+        try:
+            yield from pool.map(_analyze_page_range, repeat(pdf_path), starts, ends)
+        finally:
+            pool.shutdown(wait=True, cancel_futures=True)
+    
+    def assemble_analysis(self, page_records: List[Dict[str, any]],
+                          metadata: Dict[str, any]) -> Dict[str, any]:
+        """Build document-level results from page records in page order."""
+        return self._assemble_analysis(page_records, metadata)
+    
+    def _assemble_analysis(self, page_records: List[Dict[str, any]],
+                           metadata: Dict[str, any]) -> Dict[str, any]:
+        """Stitch per-page records into document-level results."""
+        text = " ".join(record["text"] for record in page_records if record["text"])
+        
+        sections = []
+        current = {"title": "Introduction", "parts": []}
+        headings = []
+        
+        for record in page_records:
+            if record["lead"]:
+                current["parts"].append(record["lead"])
+            
+            for section in record["sections"]:
+                headings.append({
+                    "page_number": record["page_number"],
+                    "title": section["title"],
+                    "font_size": section.get("font_size")
+                })
+                if current["parts"]:
+                    sections.append({"title": current["title"], "content": " ".join(current["parts"])})
+                current = {"title": section["title"], "parts": [section["content"]] if section["content"] else []}
+        
+        if current["parts"]:
+            sections.append({"title": current["title"], "content": " ".join(current["parts"])})
+        
+        # If no sections detected, treat entire text as one section
+        if not sections:
+            sections.append({"title": "Main Content", "content": text})
+        
+        return {
+            "text": text,
+            "pages": [
+                {"page_number": r["page_number"], "text": r["text"], "word_count": r["word_count"]}
+                for r in page_records
+            ],
+            "metadata": metadata,
+            "headings": headings,
+            "sections": sections
+        }
+    
     def extract_text_by_pages(self, pdf_path: str) -> List[Dict[str, any]]:
         """Extract text from PDF with page information."""
         try:
-            doc = fitz.open(pdf_path)
-            pages = []
-            
+            return list(self.iter_cleaned_pages(pdf_path))
+        except Exception as e:
+            raise Exception(f"Error extracting text by pages: {str(e)}")
+    
+    def iter_pages(self, pdf_path: str) -> Iterator[Dict[str, any]]:
+        """Yield raw page text one page at a time.
+        
+        Only the current page is held in memory; line breaks are kept so the
+        result can be fed straight to detect_sections.
+        """
+        with _open_pdf(pdf_path) as doc:
             for page_num in range(len(doc)):
-                page = doc[page_num]
-                text = page.get_text()
-                
-                pages.append({
+                text = doc[page_num].get_text()
+                yield {
                     "page_number": page_num + 1,
-                    "text": self._clean_text(text),
+                    "text": text,
                     "word_count": len(text.split())
-                })
-            
-            doc.close()
-            return pages
-        except Exception as e:
-            raise Exception(f"Error extracting text by pages: {str(e)}")
+                }
+    
+    def iter_cleaned_pages(self, pdf_path: str) -> Iterator[Dict[str, any]]:
+        """Yield cleaned page text one page at a time."""
+        for page in self.iter_pages(pdf_path):
+            page["text"] = self._clean_text(page["text"])
+            yield page
     
     def extract_metadata(self, pdf_path: str) -> Dict[str, any]:
         """Extract metadata from PDF."""
         try:
             doc = fitz.open(pdf_path)
-            metadata = doc.metadata
-            
-            info = {
-                "title": metadata.get("title", ""),
-                "author": metadata.get("author", ""),
-                "subject": metadata.get("subject", ""),
-                "keywords": metadata.get("keywords", ""),
-                "creator": metadata.get("creator", ""),
-                "producer": metadata.get("producer", ""),
-                "page_count": len(doc),
-                "file_size": Path(pdf_path).stat().st_size
-            }
-            
+            info = self._metadata_from(doc, pdf_path)
             doc.close()
             return info
         except Exception as e:
             raise Exception(f"Error extracting metadata: {str(e)}")
     
-    def detect_sections(self, text: str) -> List[Dict[str, str]]:
-        """Detect sections/chapters in the text based on headings."""
-        sections = []
-        
-        # Common heading patterns
-        heading_patterns = [
-            r'^(Chapter|CHAPTER)\s+\d+[:\.\s]+(.+)$',
-            r'^(\d+\.\s+)([A-Z][^.!?]*?)$',
-            r'^([A-Z][A-Z\s]{3,}?)$',  # ALL CAPS headings
-            r'^(Unit|UNIT)\s+\d+[:\.\s]+(.+)$',
-        ]
+    def _metadata_from(self, doc, pdf_path: str) -> Dict[str, any]:
+        metadata = doc.metadata or {}
         
-        lines = text.split('\n')
-        current_section = {"title": "Introduction", "content": ""}
+        return {
+            "title": metadata.get("title", ""),
+            "author": metadata.get("author", ""),
+            "subject": metadata.get("subject", ""),
+            "keywords": metadata.get("keywords", ""),
+            "creator": metadata.get("creator", ""),
+            "producer": metadata.get("producer", ""),
+            "page_count": len(doc),
+            "file_size": Path(pdf_path).stat().st_size
+        }
+    
+    def section_spans(self, text: str) -> List[SectionSpan]:
+        """Locate sections in text in a single regex pass.
         
-        for i, line in enumerate(lines):
-            line = line.strip()
-            if not line:
-                continue
-            
-            is_heading = False
-            for pattern in heading_patterns:
-                match = re.match(pattern, line, re.MULTILINE)
-                if match:
-                    # Save previous section
-                    if current_section["content"].strip():
-                        sections.append(current_section)
-                    
-                    # Start new section
-                    current_section = {
-                        "title": line,
-                        "content": ""
-                    }
-                    is_heading = True
-                    break
-            
-            if not is_heading:
-                current_section["content"] += line + " "
+        Returns spans holding (start, end) offsets; content is only built
+        when a span's content is read. Sections with a blank body are
+        skipped, and text before the first heading is "Introduction".
+        """
+        return [
+            SectionSpan(text, title or "Introduction", start, end)
+            for title, start, end in _scan_sections(text)
+            if _NON_SPACE.search(text, start, end)
+        ]
+    
+    def detect_sections(self, text: Union[str, Iterable]) -> List[Dict[str, str]]:
+        """Detect sections/chapters in the text based on headings.
         
-        # Add last section
-        if current_section["content"].strip():
-            sections.append(current_section)
+        Accepts either a full string or an iterable of page texts / page
+        dicts (e.g. from iter_pages), which is consumed one page at a time.
+        """
+        if isinstance(text, str):
+            sections = [span.to_dict() for span in self.section_spans(text)]
+        else:
+            sections = self._detect_page_sections(text)
         
         # If no sections detected, treat entire text as one section
         if not sections:
             sections.append({
                 "title": "Main Content",
-                "content": text
+                "content": text if isinstance(text, str) else ""
             })
         
         return sections
     
+    def _detect_page_sections(self, pages: Iterable) -> List[Dict[str, str]]:
+        """Section detection over pages; a section may continue across pages."""
+        sections = []
+        current = {"title": "Introduction", "parts": []}
+        
+        for page in pages:
+            page_text = page["text"] if isinstance(page, dict) else page
+            for title, start, end in _scan_sections(page_text):
+                if title is not None:
+                    if current["parts"]:
+                        sections.append({"title": current["title"], "content": " ".join(current["parts"]) + " "})
+                    current = {"title": title, "parts": []}
+                
+                body = _join_lines(page_text, start, end)
+                if body:
+                    current["parts"].append(body)
+        
+        if current["parts"]:
+            sections.append({"title": current["title"], "content": " ".join(current["parts"]) + " "})
+        
+        return sections
+    
     def extract_key_concepts(self, text: str, top_n: int = 20) -> List[str]:
         """Extract key concepts/terms from text using simple frequency analysis."""
         # Remove common words
@@ -148,16 +586,7 @@ class PDFProcessor:
     
     def _clean_text(self, text: str) -> str:
         """Clean extracted text."""
-        # Remove excessive whitespace
-        text = re.sub(r'\s+', ' ', text)
-        
-        # Remove page numbers (simple pattern)
-        text = re.sub(r'\n\d+\n', '\n', text)
-        
-        # Remove special characters but keep punctuation
-        text = re.sub(r'[^\w\s.,;:!?()\-\'"]+', '', text)
-        
-        return text.strip()
+        return _clean_text(text)
     
     def calculate_text_hash(self, text: str) -> str:
         """Calculate hash of text for duplicate detection."""
@@ -165,12 +594,44 @@ class PDFProcessor:
     
     def split_into_chunks(self, text: str, chunk_size: int = 1000, overlap: int = 200) -> List[str]:
         """Split text into overlapping chunks for processing."""
-        words = text.split()
-        chunks = []
+        return list(self.iter_chunks([text], chunk_size, overlap))
+    
+    def iter_chunks(self, pages: Iterable, chunk_size: int = 1000, overlap: int = 200) -> Iterator[str]:
+        """Yield overlapping word chunks from a stream of page texts.
         
-        for i in range(0, len(words), chunk_size - overlap):
-            chunk = ' '.join(words[i:i + chunk_size])
-            if len(chunk) > self.min_text_length:
-                chunks.append(chunk)
+        Chunks run across page boundaries. Only a sliding window of at most
+        chunk_size words is held, never the full word list. Accepts strings
+        or page dicts (from iter_pages / iter_cleaned_pages) and produces the
+        same chunks as split_into_chunks on the joined text.
+        
+        Raises ValueError right away if overlap is not smaller than
+        chunk_size, since the window could then never advance.
+        """
+        if overlap >= chunk_size:
+            raise ValueError(f"overlap ({overlap}) must be smaller than chunk_size ({chunk_size})")
+        if isinstance(pages, str):
+            pages = [pages]
+        return self._iter_chunks(pages, chunk_size, chunk_size - overlap)
+    
+    def _iter_chunks(self, pages: Iterable, chunk_size: int, step: int) -> Iterator[str]:
+        window = deque()
+        
+        for page in pages:
+            page_text = page["text"] if isinstance(page, dict) else page
+            for word in page_text.split():
+                window.append(word)
+                
+                if len(window) == chunk_size:
+                    chunk = ' '.join(window)
+                    if len(chunk) > self.min_text_length:
+                        yield chunk
+                    for _ in range(step):
+                        window.popleft()
         
-        return chunks
+        # Trailing chunks shorter than chunk_size
+        while window:
+            chunk = ' '.join(window)
+            if len(chunk) > self.min_text_length:
+                yield chunk
+            for _ in range(min(step, len(window))):
+                window.popleft()
@@ -1,25 +1,84 @@
-from typing import List, Dict, Optional
+from typing import Any, List, Dict, Iterator, Optional
+import hashlib
+import json
 import random
 import re
-from app.services.nlp_engine import NLPEngine
+from app.core.config import settings
+from app.services.nlp_engine import EXTRACTOR_VERSION, Analysis, LazyAnalysis, NLPEngine, get_nlp_engine
 from app.models.question import QuestionType, DifficultyLevel
 
+# Part of every result cache key; bump when the questions generated from
+# the same candidates and seed change
+GENERATOR_VERSION = 1
+
+# Part of every stored candidate pool's version; bump when build_candidates
+# changes what it keeps, so stored pools are rebuilt
+CANDIDATES_VERSION = 1
+
+# Most key sentences one request draws on, so also the most a pool keeps
+MAX_KEY_SENTENCES = 20
+
 
 class QuestionGenerator:
     """Service for generating questions from extracted text."""
     
-    def __init__(self):
-        self.nlp_engine = NLPEngine()
+    def __init__(self, nlp_engine: NLPEngine = None):
+        self._nlp_engine = nlp_engine
         self.question_templates = self._load_templates()
     
+    @property
+    def nlp_engine(self) -> NLPEngine:
+        """The given engine, or the shared one (loaded on first use)."""
+        return self._nlp_engine or get_nlp_engine()
+    
     def generate_questions(
         self,
         text: str,
         num_questions: int = 10,
         question_types: Optional[List[QuestionType]] = None,
-        difficulty_mix: Optional[Dict[DifficultyLevel, float]] = None
+        difficulty_mix: Optional[Dict[DifficultyLevel, float]] = None,
+        analysis: Optional[Analysis] = None,
+        exhaustive: bool = True,
+        candidates: Optional[Dict[str, Any]] = None,
+        seed: Optional[int] = None
     ) -> List[Dict]:
-        """Generate questions from text based on configuration - FAST & ACCURATE."""
+        """Generate questions from text based on configuration - FAST & ACCURATE.
+        
+        Pass `candidates` (a stored pool from build_candidates) to skip
+        text analysis entirely, or `analysis` (e.g. a stored parse of
+        `text`) to skip parsing. With exhaustive=False, key sentences are
+        taken from the first strong candidates instead of the whole text
+        (interactive requests). The same seed and input always give the
+        same questions; without one, every call differs.
+        """
+        questions = list(self.iter_questions(
+            text, num_questions, question_types, difficulty_mix, analysis, exhaustive, candidates, seed
+        ))
+        
+        # Final validation
+        if len(questions) == 0:
+            raise ValueError("Failed to generate any questions. Please check if the document has sufficient text content.")
+        
+        return questions
+    
+    def iter_questions(
+        self,
+        text: str,
+        num_questions: int = 10,
+        question_types: Optional[List[QuestionType]] = None,
+        difficulty_mix: Optional[Dict[DifficultyLevel, float]] = None,
+        analysis: Optional[Analysis] = None,
+        exhaustive: bool = True,
+        candidates: Optional[Dict[str, Any]] = None,
+        seed: Optional[int] = None
+    ) -> Iterator[Dict]:
+        """Yield questions one at a time as generate_questions would return them.
+        
+        Without a large enough candidate pool, text analysis happens
+        before the first question; after that each question is yielded as
+        soon as it is built, so callers can stream or persist them
+        incrementally.
+        """
         
         # Validate input
         if not text or len(text.strip()) < 100:
@@ -35,21 +94,31 @@ class QuestionGenerator:
                 DifficultyLevel.HARD: 0.2
             }
         
-        try:
-            # FAST: Extract content for question generation (optimized)
-            definitions = self.nlp_engine.extract_definitions(text)[:num_questions * 2]
-            facts = self.nlp_engine.extract_facts(text)[:num_questions * 2]
-            key_sentences = self.nlp_engine.extract_key_sentences(text, top_n=min(20, num_questions * 2))
-            entities = self.nlp_engine.extract_entities(text)[:num_questions * 2]
-            relationships = self.nlp_engine.extract_relationships(text)[:num_questions]
-        except Exception as e:
-            raise ValueError(f"Failed to analyze text: {str(e)}")
+        # A stored pool only needs sampling; otherwise build one just
+        # large enough for this request
+        if candidates is None or candidates["size"] < num_questions * 2:
+            try:
+                candidates = self.build_candidates(text, analysis, num_questions * 2, exhaustive)
+            except Exception as e:
+                raise ValueError(f"Failed to analyze text: {str(e)}")
+        
+        definitions = candidates["definitions"][:num_questions * 2]
+        facts = candidates["facts"][:num_questions * 2]
+        key_sentences = candidates["key_sentences"][:min(MAX_KEY_SENTENCES, num_questions * 2)]
+        entities = candidates["entities"][:num_questions * 2]
+        relationships = candidates["relationships"][:num_questions]
         
         # Check if we have enough content
         if not definitions and not facts and not key_sentences:
             raise ValueError("Could not extract enough content from text. The document may be too short or not contain suitable content for questions.")
         
-        questions = []
+        # Every random choice comes from this request's generator
+        rng = random.Random(seed)
+        
+        # Difficulties are drawn for the requested count up front, so each
+        # question can be labelled as soon as it exists
+        difficulties = self._difficulty_plan(num_questions, difficulty_mix, rng)
+        produced = 0
         
         # Calculate EXACT questions per type
         questions_per_type = num_questions // len(question_types)
@@ -58,53 +127,140 @@ class QuestionGenerator:
         for idx, q_type in enumerate(question_types):
             # Distribute remainder to first types
             count = questions_per_type + (1 if idx < remainder else 0)
-            type_questions = []
+            type_questions = iter(())
+            
+            if q_type == QuestionType.MCQ:
+                type_questions = self._generate_mcq(definitions, facts, entities, count, rng)
+            elif q_type == QuestionType.TRUE_FALSE:
+                type_questions = self._generate_true_false(facts, key_sentences, count, rng)
+            elif q_type == QuestionType.SHORT_ANSWER:
+                type_questions = self._generate_short_answer(definitions, key_sentences, count, rng)
+            elif q_type == QuestionType.LONG_ANSWER:
+                type_questions = self._generate_long_answer(key_sentences, relationships, count, rng)
+            elif q_type == QuestionType.FILL_BLANK:
+                type_questions = self._generate_fill_blank(definitions, facts, count, rng)
+            elif q_type == QuestionType.PROGRAMMING:
+                type_questions = self._generate_programming(text, count)
             
             try:
-                if q_type == QuestionType.MCQ:
-                    type_questions = self._generate_mcq(definitions, facts, entities, count)
-                elif q_type == QuestionType.TRUE_FALSE:
-                    type_questions = self._generate_true_false(facts, key_sentences, count)
-                elif q_type == QuestionType.SHORT_ANSWER:
-                    type_questions = self._generate_short_answer(definitions, key_sentences, count)
-                elif q_type == QuestionType.LONG_ANSWER:
-                    type_questions = self._generate_long_answer(key_sentences, relationships, count)
-                elif q_type == QuestionType.FILL_BLANK:
-                    type_questions = self._generate_fill_blank(definitions, facts, count)
-                elif q_type == QuestionType.PROGRAMMING:
-                    type_questions = self._generate_programming(text, count)
+                for question in type_questions:
+                    # ENSURE EXACT COUNT - 30 bola to 30 hi milega!
+                    if produced >= num_questions:
+                        return
+                    question["difficulty"] = difficulties[produced]
+                    produced += 1
+                    yield question
             except Exception as e:
                 print(f"Warning: Failed to generate {q_type} questions: {e}")
                 # Continue with other types
                 continue
-            
-            questions.extend(type_questions)
-        
-        # Assign difficulties based on mix
-        questions = self._assign_difficulties(questions, difficulty_mix)
         
-        # ENSURE EXACT COUNT - 30 bola to 30 hi milega!
-        if len(questions) > num_questions:
-            questions = questions[:num_questions]
-        elif len(questions) < num_questions:
-            # If less, generate more from first type
-            needed = num_questions - len(questions)
-            try:
-                extra = self._generate_mcq(definitions, facts, entities, needed)
-                questions.extend(extra[:needed])
-            except Exception as e:
-                print(f"Warning: Could not generate additional questions: {e}")
+        # If less, generate more from first type
+        try:
+            for question in self._generate_mcq(definitions, facts, entities, num_questions - produced, rng):
+                if produced >= num_questions:
+                    return
+                question["difficulty"] = difficulties[produced]
+                produced += 1
+                yield question
+        except Exception as e:
+            print(f"Warning: Could not generate additional questions: {e}")
+    
+    def cache_key(self, source_hash: str, num_questions: int = 10,
+                  question_types: Optional[List[QuestionType]] = None,
+                  difficulty_mix: Optional[Dict[DifficultyLevel, float]] = None,
+                  exhaustive: bool = True, seed: Optional[int] = None) -> Optional[str]:
+        """Result cache key for a request on the text with hash `source_hash`.
+        
+        Only seeded requests are reproducible, so unseeded ones get None.
+        The key does not load the model: it names SPACY_MODEL rather than
+        its installed version, so cached results of an upgraded model
+        linger until they expire.
+        """
+        if seed is None:
+            return None
+        params = json.dumps([
+            num_questions,
+            [QuestionType(q_type).value for q_type in question_types] if question_types is not None else None,
+            sorted((DifficultyLevel(level).value, share) for level, share in difficulty_mix.items())
+            if difficulty_mix is not None else None,
+            exhaustive,
+            seed
+        ], separators=(",", ":"))
+        digest = hashlib.sha256(params.encode("utf-8")).hexdigest()[:32]
+        version = f"{GENERATOR_VERSION}.{CANDIDATES_VERSION}.{EXTRACTOR_VERSION}/{settings.SPACY_MODEL}"
+        return f"questions:{version}:{source_hash}:{digest}"
+    
+    @property
+    def candidates_version(self) -> str:
+        """Version of the candidate pools build_candidates produces now."""
+        return f"{CANDIDATES_VERSION}.{EXTRACTOR_VERSION}/{self.nlp_engine.pipeline_version}"
+    
+    def build_candidates(self, text: str, analysis: Optional[Analysis] = None, size: int = 20,
+                         exhaustive: bool = True) -> Dict[str, Any]:
+        """Extract the material questions are built from, up to `size` of each kind.
+        
+        The pool holds definition pairs, fact sentences with their entities
+        and blankable words, scored key sentences with their noun-chunk
+        topics, entities and relationships, all as plain JSON so it can be
+        stored with a document and sampled later without the text.
+        """
+        # Parse at most once, and only if some result is not cached;
+        # every extractor reads from the same analysis
+        if analysis is None:
+            analysis = LazyAnalysis(text)
+        definitions = self.nlp_engine.extract_definitions(analysis, limit=size)
+        fact_texts = self.nlp_engine.extract_facts(analysis, limit=size)
+        key_texts = self.nlp_engine.extract_key_sentences(
+            analysis, top_n=min(MAX_KEY_SENTENCES, size), exhaustive=exhaustive
+        )
         
-        # Final validation
-        if len(questions) == 0:
-            raise ValueError("Failed to generate any questions. Please check if the document has sufficient text content.")
+        facts = []
+        for fact, doc in zip(fact_texts, self.nlp_engine.sentence_docs(fact_texts, analysis, profile="full")):
+            facts.append({
+                "text": fact,
+                "entities": [ent.text for ent in doc.ents],
+                "blanks": [token.text for token in doc if token.pos_ in ["NOUN", "PROPN", "NUM"]
+                           and not token.is_stop]
+            })
+        
+        key_sentences = []
+        for sent, doc in zip(key_texts, self.nlp_engine.sentence_docs(key_texts, analysis, profile="full")):
+            # Noun chunks need a dependency parse
+            chunks = doc.noun_chunks if doc.doc.has_annotation("DEP") else []
+            key_sentences.append({
+                "text": sent,
+                "score": self.nlp_engine._score_span(doc, doc.ents),
+                "topics": [chunk.text for chunk in chunks if len(chunk.text.split()) >= 2]
+            })
         
-        return questions
+        return {
+            "version": self.candidates_version,
+            "size": size,
+            "definitions": definitions,
+            "facts": facts,
+            "key_sentences": key_sentences,
+            "entities": self.nlp_engine.extract_entities(analysis, limit=size),
+            "relationships": self.nlp_engine.extract_relationships(analysis, limit=size)
+        }
     
-    def _generate_mcq(self, definitions: List[Dict], facts: List[str], 
-                      entities: List[Dict], count: int) -> List[Dict]:
+    def merge_candidates(self, pools: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """One pool for the concatenated texts of several pools (e.g. topics)."""
+        merged = {
+            "version": self.candidates_version,
+            "size": min((pool["size"] for pool in pools), default=0)
+        }
+        for kind in ("definitions", "facts", "key_sentences", "entities", "relationships"):
+            merged[kind] = [item for pool in pools for item in pool[kind]]
+        # Key sentences are ranked across the whole text; sorted() keeps
+        # text order among equal scores
+        merged["key_sentences"].sort(key=lambda sent: sent["score"], reverse=True)
+        return merged
+    
+    def _generate_mcq(self, definitions: List[Dict], facts: List[Dict],
+                      entities: List[Dict], count: int, rng: random.Random) -> Iterator[Dict]:
         """Generate multiple choice questions."""
-        questions = []
+        produced = 0
         
         # From definitions
         for defn in definitions[:count]:
@@ -119,54 +275,54 @@ class QuestionGenerator:
             # Generate distractors (wrong options)
             options = [defn['definition']]
             # Add plausible distractors (simplified - in production, use better methods)
-            options.extend(self._generate_distractors(defn['definition'], 3))
-            random.shuffle(options)
+            options.extend(self._generate_distractors(defn['definition'], 3, rng))
+            rng.shuffle(options)
             
             question["option_a"] = options[0]
             question["option_b"] = options[1]
             question["option_c"] = options[2]
             question["option_d"] = options[3]
             
-            questions.append(question)
+            yield question
+            produced += 1
             
-            if len(questions) >= count:
+            if produced >= count:
                 break
         
         # From facts with entities
-        for fact in facts[:count - len(questions)]:
-            doc = self.nlp_engine.nlp(fact)
-            if doc.ents:
-                entity = doc.ents[0]
-                question_text = fact.replace(entity.text, "______")
+        for fact in facts[:count - produced]:
+            if fact["entities"]:
+                entity = fact["entities"][0]
+                question_text = fact["text"].replace(entity, "______")
                 
                 question = {
                     "question_text": f"Fill in the blank: {question_text}",
                     "question_type": QuestionType.MCQ,
-                    "correct_answer": entity.text,
-                    "explanation": f"From the text: {fact}",
+                    "correct_answer": entity,
+                    "explanation": f"From the text: {fact['text']}",
                     "suggested_marks": 1.0
                 }
                 
-                options = [entity.text]
-                options.extend(self._generate_distractors(entity.text, 3))
-                random.shuffle(options)
+                options = [entity]
+                options.extend(self._generate_distractors(entity, 3, rng))
+                rng.shuffle(options)
                 
                 question["option_a"] = options[0]
                 question["option_b"] = options[1]
                 question["option_c"] = options[2]
                 question["option_d"] = options[3]
                 
-                questions.append(question)
-        
-        return questions
+                yield question
+                produced += 1
     
-    def _generate_true_false(self, facts: List[str], sentences: List[str], count: int) -> List[Dict]:
+    def _generate_true_false(self, facts: List[Dict], sentences: List[Dict], count: int,
+                            rng: random.Random) -> Iterator[Dict]:
         """Generate true/false questions."""
-        questions = []
+        produced = 0
         
-        for fact in facts[:count]:
+        for fact in (fact["text"] for fact in facts[:count]):
             # True statement
-            if random.random() > 0.5:
+            if rng.random() > 0.5:
                 question = {
                     "question_text": f"True or False: {fact}",
                     "question_type": QuestionType.TRUE_FALSE,
@@ -189,16 +345,16 @@ class QuestionGenerator:
                     "suggested_marks": 0.5
                 }
             
-            questions.append(question)
+            yield question
+            produced += 1
             
-            if len(questions) >= count:
+            if produced >= count:
                 break
-        
-        return questions
     
-    def _generate_short_answer(self, definitions: List[Dict], sentences: List[str], count: int) -> List[Dict]:
+    def _generate_short_answer(self, definitions: List[Dict], sentences: List[Dict], count: int,
+                               rng: random.Random) -> Iterator[Dict]:
         """Generate short answer questions."""
-        questions = []
+        produced = 0
         
         # From definitions
         for defn in definitions[:count]:
@@ -209,19 +365,20 @@ class QuestionGenerator:
             ]
             
             question = {
-                "question_text": random.choice(templates),
+                "question_text": rng.choice(templates),
                 "question_type": QuestionType.SHORT_ANSWER,
                 "correct_answer": defn['definition'],
                 "explanation": f"Expected answer: {defn['definition']}",
                 "suggested_marks": 2.0
             }
-            questions.append(question)
+            yield question
+            produced += 1
             
-            if len(questions) >= count:
+            if produced >= count:
                 break
         
         # From key sentences
-        for sent in sentences[:count - len(questions)]:
+        for sent in (sent["text"] for sent in sentences[:count - produced]):
             # Convert statement to question
             question_text = self._statement_to_question(sent)
             
@@ -232,13 +389,13 @@ class QuestionGenerator:
                 "explanation": f"Expected answer should cover: {sent}",
                 "suggested_marks": 3.0
             }
-            questions.append(question)
-        
-        return questions
+            yield question
+            produced += 1
     
-    def _generate_long_answer(self, sentences: List[str], relationships: List[Dict], count: int) -> List[Dict]:
+    def _generate_long_answer(self, sentences: List[Dict], relationships: List[Dict], count: int,
+                              rng: random.Random) -> Iterator[Dict]:
         """Generate long answer questions."""
-        questions = []
+        produced = 0
         
         templates = [
             "Explain in detail",
@@ -249,18 +406,11 @@ class QuestionGenerator:
             "Evaluate"
         ]
         
-        # Extract topics from sentences
-        topics = []
-        for sent in sentences:
-            doc = self.nlp_engine.nlp(sent)
-            for chunk in doc.noun_chunks:
-                if len(chunk.text.split()) >= 2:
-                    topics.append(chunk.text)
-        
-        topics = list(set(topics))[:count]
+        # Topics of the key sentences, each once
+        topics = list(dict.fromkeys(topic for sent in sentences for topic in sent["topics"]))[:count]
         
         for topic in topics:
-            template = random.choice(templates)
+            template = rng.choice(templates)
             
             question = {
                 "question_text": f"{template} {topic}.",
@@ -269,45 +419,39 @@ class QuestionGenerator:
                 "explanation": "This is an open-ended question requiring detailed explanation.",
                 "suggested_marks": 5.0
             }
-            questions.append(question)
+            yield question
+            produced += 1
             
-            if len(questions) >= count:
+            if produced >= count:
                 break
-        
-        return questions
     
-    def _generate_fill_blank(self, definitions: List[Dict], facts: List[str], count: int) -> List[Dict]:
+    def _generate_fill_blank(self, definitions: List[Dict], facts: List[Dict], count: int,
+                             rng: random.Random) -> Iterator[Dict]:
         """Generate fill-in-the-blank questions."""
-        questions = []
+        produced = 0
         
         for fact in facts[:count]:
-            doc = self.nlp_engine.nlp(fact)
-            
-            # Find important words to blank out
-            important_tokens = [token for token in doc if token.pos_ in ["NOUN", "PROPN", "NUM"] 
-                              and not token.is_stop]
-            
-            if important_tokens:
-                token_to_blank = random.choice(important_tokens)
-                question_text = fact.replace(token_to_blank.text, "______")
+            # Important words to blank out were found when building the pool
+            if fact["blanks"]:
+                word_to_blank = rng.choice(fact["blanks"])
+                question_text = fact["text"].replace(word_to_blank, "______")
                 
                 question = {
                     "question_text": f"Fill in the blank: {question_text}",
                     "question_type": QuestionType.FILL_BLANK,
-                    "correct_answer": token_to_blank.text,
-                    "explanation": f"Complete sentence: {fact}",
+                    "correct_answer": word_to_blank,
+                    "explanation": f"Complete sentence: {fact['text']}",
                     "suggested_marks": 1.0
                 }
-                questions.append(question)
+                yield question
+                produced += 1
             
-            if len(questions) >= count:
+            if produced >= count:
                 break
-        
-        return questions
     
-    def _generate_programming(self, text: str, count: int) -> List[Dict]:
+    def _generate_programming(self, text: str, count: int) -> Iterator[Dict]:
         """Generate programming questions (if applicable)."""
-        questions = []
+        produced = 0
         
         # Look for code-related keywords
         code_keywords = ['algorithm', 'function', 'program', 'code', 'implement', 
@@ -324,18 +468,15 @@ class QuestionGenerator:
                 "explanation": "Evaluate based on correctness, efficiency, and code quality.",
                 "suggested_marks": 10.0
             }
-            questions.append(question)
+            yield question
+            produced += 1
             
-            if len(questions) >= count:
+            if produced >= count:
                 break
-        
-        return questions
     
-    def _assign_difficulties(self, questions: List[Dict], 
-                           difficulty_mix: Dict[DifficultyLevel, float]) -> List[Dict]:
-        """Assign difficulty levels to questions based on mix."""
-        total = len(questions)
-        
+    def _difficulty_plan(self, total: int, difficulty_mix: Dict[DifficultyLevel, float],
+                         rng: random.Random) -> List[DifficultyLevel]:
+        """Shuffled difficulty levels for `total` questions, following the mix."""
         easy_count = int(total * difficulty_mix.get(DifficultyLevel.EASY, 0.4))
         medium_count = int(total * difficulty_mix.get(DifficultyLevel.MEDIUM, 0.4))
         hard_count = total - easy_count - medium_count
@@ -346,17 +487,10 @@ class QuestionGenerator:
             [DifficultyLevel.HARD] * hard_count
         )
         
-        random.shuffle(difficulties)
-        
-        for i, question in enumerate(questions):
-            if i < len(difficulties):
-                question["difficulty"] = difficulties[i]
-            else:
-                question["difficulty"] = DifficultyLevel.MEDIUM
-        
-        return questions
+        rng.shuffle(difficulties)
+        return difficulties
     
-    def _generate_distractors(self, correct_answer: str, count: int) -> List[str]:
+    def _generate_distractors(self, correct_answer: str, count: int, rng: random.Random) -> List[str]:
         """Generate plausible wrong answers (distractors) for MCQs."""
         # Simplified distractor generation
         # In production, use more sophisticated methods (word embeddings, etc.)
@@ -368,7 +502,7 @@ class QuestionGenerator:
             if len(words) > 3:
                 # Shuffle words
                 shuffled = words.copy()
-                random.shuffle(shuffled)
+                rng.shuffle(shuffled)
                 distractors.append(' '.join(shuffled))
             else:
                 # Add generic distractors
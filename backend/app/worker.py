@@ -0,0 +1,20 @@
+"""Celery worker for background document processing.
+
+Start with: celery -A app.worker worker --loglevel=info
+and set JOB_BACKEND=celery for the API.
+"""
+from celery import Celery
+from app.core.config import settings
+from app.services.document_processing import DocumentProcessingService
+
+celery_app = Celery("autoq", broker=settings.REDIS_URL, backend=settings.REDIS_URL)
+celery_app.conf.task_acks_late = True
+celery_app.conf.worker_prefetch_multiplier = 1
+
+processing_service = DocumentProcessingService()
+
+
+@celery_app.task(name="autoq.process_document")
+def process_document_job(job_id: int) -> None:
+    """Run a persisted document processing job."""
+    processing_service.run(job_id)
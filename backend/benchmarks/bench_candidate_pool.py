@@ -0,0 +1,66 @@
+"""Question generation from a stored candidate pool vs. from the stored parse.
+
+Usage (from the backend directory):
+
+    python -m benchmarks.bench_candidate_pool --pages 20 100 --questions 10 50 100
+
+For each text, parses once and builds the candidate pool as document
+processing does (timed, with its stored JSON size). Then times
+generate_questions() for each question count, once from the stored parse
+(the previous request path: every extractor runs) and once from the
+pool after a JSON round trip (the new path: sampling only). The NLP
+result cache is disabled so the parse path does its real work.
+"""
+import argparse
+import json
+import random
+import time
+
+from app.core.config import settings
+from app.services.question_generator import QuestionGenerator
+from benchmarks.nlp_models import load_engine, make_text
+
+
+def timed(fn, repeat=3):
+    best = float("inf")
+    for _ in range(repeat):
+        random.seed(0)
+        started = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pages", type=int, nargs="+", default=[20, 100])
+    parser.add_argument("--questions", type=int, nargs="+", default=[10, 50, 100])
+    parser.add_argument("--model", default="en_core_web_sm")
+    args = parser.parse_args()
+
+    engine = load_engine(args.model)
+    engine.cache = None
+    generator = QuestionGenerator(engine)
+
+    for pages in args.pages:
+        text = make_text(pages)
+        analysis = engine.from_bytes(engine.to_bytes(engine.analyze(text)))
+
+        started = time.perf_counter()
+        pool = generator.build_candidates(text, analysis, settings.CANDIDATE_POOL_SIZE)
+        build_s = time.perf_counter() - started
+        stored = json.dumps(pool)
+        print(f"\n{pages} pages: pool built in {build_s:.2f} s, {len(stored) / 1024:.0f} KB as JSON")
+
+        print(f"{'questions':>9} {'parse ms':>9} {'pool ms':>8} {'speedup':>8}")
+        for num_questions in args.questions:
+            from_parse = timed(lambda: generator.generate_questions(text, num_questions, analysis=analysis))
+            from_pool = timed(lambda: generator.generate_questions(
+                text, num_questions, candidates=json.loads(stored)
+            ))
+            print(f"{num_questions:>9} {from_parse * 1000:>9.1f} {from_pool * 1000:>8.1f} "
+                  f"{from_parse / from_pool:>7.0f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""Definition matching: the former per-pattern regexes vs. the linear matcher.
+
+Usage (from the backend directory):
+
+    python -m benchmarks.bench_definitions --lengths 500 1000 2000 4000
+
+Times both on adversarial sentences of growing length that defeat the
+lazy `(.+?)` patterns: long runs of words with cues but no closing "."
+or ",", which make re.search retry every start position and, for each,
+every cue. A textbook sentence is timed as a baseline, and both
+matchers are checked to agree on every input.
+"""
+import argparse
+import re
+import time
+
+from app.services.nlp_engine import _match_definition
+from benchmarks.nlp_models import SENTENCES
+
+LEGACY_PATTERNS = [
+    r'(.+?)\s+is\s+(?:a|an|the)\s+(.+?)[\.\,]',
+    r'(.+?)\s+refers to\s+(.+?)[\.\,]',
+    r'(.+?)\s+means\s+(.+?)[\.\,]',
+    r'(.+?)\s+can be defined as\s+(.+?)[\.\,]',
+]
+
+
+def legacy_match(sentence):
+    for pattern in LEGACY_PATTERNS:
+        match = re.search(pattern, sentence, re.IGNORECASE)
+        if match:
+            return match.group(1).strip(), match.group(2).strip()
+    return None
+
+
+def adversarial(kind, chars):
+    """Sentences of about `chars` characters."""
+    unit = {
+        "no cue": "the cell wall of plants ",
+        "cues, no end": "water is the medium that means life ",
+        "cues, end at tail": "water is the medium that means life ",
+    }[kind]
+    text = (unit * (chars // len(unit) + 1))[:chars].strip()
+    return text + "." if kind == "cues, end at tail" else text
+
+
+def timed(fn, sentence, repeats):
+    started = time.perf_counter()
+    for _ in range(repeats):
+        result = fn(sentence)
+    return (time.perf_counter() - started) / repeats * 1000, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--lengths", type=int, nargs="+", default=[500, 1000, 2000, 4000])
+    args = parser.parse_args()
+
+    cases = [("textbook", sentence) for sentence in SENTENCES]
+    for kind in ("no cue", "cues, no end", "cues, end at tail"):
+        cases += [(kind, adversarial(kind, chars)) for chars in args.lengths]
+
+    print(f"{'input':<18} {'chars':>6} {'legacy ms':>10} {'linear ms':>10} {'speedup':>8}")
+    for kind, sentence in cases:
+        repeats = 200 if len(sentence) < 200 else 1
+        legacy_ms, expected = timed(legacy_match, sentence, repeats)
+        linear_ms, result = timed(_match_definition, sentence, max(repeats, 20))
+        assert result == expected, (sentence[:60], expected, result)
+        print(f"{kind:<18} {len(sentence):>6} {legacy_ms:>10.3f} {linear_ms:>10.3f} {legacy_ms / linear_ms:>7.0f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+"""Re-parsing a document vs. loading its stored DocBin.
+
+Usage (from the backend directory):
+
+    python -m benchmarks.bench_docbin --pages 10 50 --repeats 8
+
+For each size, reports the time of one full parse (what every
+/questions/generate call used to pay), the time to restore the stored
+DocBin, the DocBin size, and the total NLP time for `--repeats`
+generations against the same document (an instructor iterating on a
+paper), where the stored variant parses once at processing time.
+"""
+import argparse
+import time
+
+from benchmarks.nlp_models import load_engine, make_text
+
+
+def timed(fn):
+    started = time.perf_counter()
+    result = fn()
+    return time.perf_counter() - started, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pages", type=int, nargs="+", default=[10, 50])
+    parser.add_argument("--repeats", type=int, default=8)
+    parser.add_argument("--model", default="en_core_web_sm")
+    args = parser.parse_args()
+
+    engine = load_engine(args.model)
+    print(f"{'pages':>6} {'text KB':>8} {'docbin KB':>10} {'parse s':>8} {'load s':>7} "
+          f"{'x' + str(args.repeats) + ' parse s':>12} {'x' + str(args.repeats) + ' stored s':>13}")
+
+    for pages in args.pages:
+        text = make_text(pages)
+        parse_s, analysis = timed(lambda: engine.analyze(text))
+        data = engine.to_bytes(analysis)
+        load_s, restored = timed(lambda: engine.from_bytes(data))
+        assert [s.text for s in restored.sentences] == [s.text for s in analysis.sentences]
+
+        print(f"{pages:>6} {len(text) / 1024:>8.0f} {len(data) / 1024:>10.0f} {parse_s:>8.2f} {load_s:>7.3f} "
+              f"{parse_s * args.repeats:>12.1f} {parse_s + load_s * args.repeats:>13.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+"""Latency of a cheap endpoint while question generation is running.
+
+Usage (from the backend directory):
+
+    python -m benchmarks.bench_event_loop --workers 2 --clients 4 --seconds 20
+    python -m benchmarks.bench_event_loop --app-dir /path/to/older/checkout/backend
+
+Starts the API under uvicorn against a fresh SQLite database holding
+one processed document, waits until /health reports ready, then runs
+`--clients` threads that POST /questions/generate back to back while
+another thread polls GET /health every 20 ms. Reports /health p50, p99
+and max latency, and the generate requests completed or rejected (503).
+The NLP result cache is disabled so every request does real work.
+
+When en_core_web_sm is not installed, the untrained stand-in is saved
+as ./en_core_web_sm in the run directory (see bench_startup).
+"""
+import argparse
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.request
+
+from benchmarks.nlp_models import make_text, stand_in_model
+
+SEED = """
+import sys
+from app.models.database import SessionLocal, init_db
+from app.models.document import Document
+from app.models.document_content import DocumentContent
+
+init_db()
+db = SessionLocal()
+content = DocumentContent(content_hash="0" * 64, file_path="bench.pdf", extracted_text=sys.stdin.read(),
+                          is_processed=True)
+db.add(content)
+db.flush()
+db.add(Document(filename="bench.pdf", original_filename="bench.pdf", file_path="bench.pdf",
+                content_id=content.id, is_processed=True, processing_status="completed", owner_id=1))
+db.commit()
+"""
+
+
+def request(url, payload=None):
+    data = json.dumps(payload).encode() if payload is not None else None
+    req = urllib.request.Request(url, data=data, headers={"Content-Type": "application/json"})
+    try:
+        with urllib.request.urlopen(req, timeout=120) as response:
+            return response.status, json.loads(response.read())
+    except urllib.error.HTTPError as e:
+        return e.code, None
+
+
+def wait_ready(base, timeout=180):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            status, body = request(f"{base}/health")
+            if status == 200 and body.get("ready"):
+                return body
+        except OSError:
+            pass
+        time.sleep(0.5)
+    raise RuntimeError("API did not become ready")
+
+
+def percentile(values, p):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * p / 100))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--app-dir", default=".")
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--clients", type=int, default=4)
+    parser.add_argument("--seconds", type=float, default=20)
+    parser.add_argument("--pages", type=int, default=20)
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="autoq_bench_loop_")
+    server = None
+    try:
+        import spacy.util
+        if not spacy.util.is_package("en_core_web_sm"):
+            stand_in_model(os.path.join(workdir, "en_core_web_sm"))
+        env = dict(os.environ, PYTHONPATH=os.path.abspath(args.app_dir),
+                   DATABASE_URL=f"sqlite:///{workdir}/bench.db", UPLOAD_DIR=f"{workdir}/uploads",
+                   GENERATION_WORKERS=str(args.workers), NLP_CACHE_MAX_BYTES="0", NLP_WARMUP="true")
+        subprocess.run([sys.executable, "-c", SEED], cwd=workdir, env=env, input=make_text(args.pages),
+                       text=True, check=True, capture_output=True)
+
+        server = subprocess.Popen(
+            [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(args.port), "--log-level", "warning"],
+            cwd=workdir, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+        )
+        base = f"http://127.0.0.1:{args.port}"
+        wait_ready(base)
+        payload = {"document_id": 1, "num_questions": 10}
+        request(f"{base}/api/v1/questions/generate", payload)  # store the parse once
+
+        stop = time.time() + args.seconds
+        outcomes = []
+        latencies = []
+
+        def client():
+            while time.time() < stop:
+                status, _ = request(f"{base}/api/v1/questions/generate", payload)
+                outcomes.append(status)
+                if status == 503:
+                    time.sleep(0.2)
+
+        def prober():
+            while time.time() < stop:
+                started = time.perf_counter()
+                request(f"{base}/health")
+                latencies.append((time.perf_counter() - started) * 1000)
+                time.sleep(0.02)
+
+        threads = [threading.Thread(target=client) for _ in range(args.clients)] + [threading.Thread(target=prober)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        print(f"app: {os.path.abspath(args.app_dir)}, workers: {args.workers}, clients: {args.clients}, "
+              f"cpus: {os.cpu_count()}")
+        print(f"/health: n={len(latencies)} p50={statistics.median(latencies):.1f} ms "
+              f"p99={percentile(latencies, 99):.1f} ms max={max(latencies):.1f} ms")
+        print(f"generate: {outcomes.count(200)} ok, {outcomes.count(503)} rejected, "
+              f"{len(outcomes) - outcomes.count(200) - outcomes.count(503)} failed")
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+        shutil.rmtree(workdir)
+
+
+if __name__ == "__main__":
+    main()
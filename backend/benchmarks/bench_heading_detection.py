@@ -0,0 +1,107 @@
+"""Regex vs. layout-based heading detection on synthetic textbook PDFs.
+
+Usage (from the backend directory):
+
+    python -m benchmarks.bench_heading_detection --pages 200 --repeat 3
+
+Each page has a larger-font heading, a bold sub-heading, body prose and
+a couple of ALL-CAPS body lines (acronym lists, table rows) that the old
+regexes mistake for headings. "regex" is the previous pass: get_text()
+lines matched against HEADING_PATTERNS. "layout" is the current
+_analyze_page, which reads get_text("dict") font sizes and weights in
+the same pass. Reports time per page plus precision and recall against
+the headings that were actually drawn.
+"""
+import argparse
+import os
+import shutil
+import tempfile
+import time
+
+import fitz
+
+from app.services.pdf_processor import _analyze_page, _is_heading
+
+BODY = (
+    "The cell membrane controls what enters and leaves the cell. Diffusion moves particles "
+    "from high to low concentration without energy. Active transport uses ATP to move "
+    "substances against a gradient. "
+)
+CAPS_LINES = ["DNA RNA ATP ADP NADH", "TABLE OF VALUES"]
+
+
+def make_pdf(path: str, pages: int) -> set:
+    """Write the PDF and return the set of heading lines it contains."""
+    doc = fitz.open()
+    headings = set()
+    for page_num in range(pages):
+        page = doc.new_page()
+        title = f"Chapter {page_num + 1}: Cell Transport"
+        subtitle = f"Key Terms {page_num + 1}"
+        headings.update({title, subtitle})
+
+        page.insert_text((72, 60), title, fontsize=16)
+        page.insert_text((72, 90), subtitle, fontsize=11, fontname="hebo")
+        y = 110
+        for caps in CAPS_LINES:
+            page.insert_text((72, y), caps, fontsize=11)
+            y += 16
+        page.insert_textbox(fitz.Rect(72, y, 540, 780), BODY * 8, fontsize=11)
+    doc.save(path)
+    doc.close()
+    return headings
+
+
+def regex_headings(page) -> list:
+    return [line.strip() for line in page.get_text().split("\n") if line.strip() and _is_heading(line.strip())]
+
+
+def layout_headings(page, page_number: int) -> list:
+    return [section["title"] for section in _analyze_page(page, page_number)["sections"]]
+
+
+def measure(label: str, detect, path: str, truth: set, repeat: int) -> dict:
+    best = float("inf")
+    found = []
+    for _ in range(repeat):
+        doc = fitz.open(path)
+        started = time.perf_counter()
+        found = [title for page_num in range(len(doc)) for title in detect(doc[page_num], page_num + 1)]
+        best = min(best, time.perf_counter() - started)
+        pages = len(doc)
+        doc.close()
+
+    hits = sum(1 for title in found if title in truth)
+    return {
+        "label": label,
+        "ms_per_page": best / pages * 1000,
+        "precision": hits / len(found) if found else 0.0,
+        "recall": len(truth & set(found)) / len(truth),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pages", type=int, default=200)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="autoq_bench_headings_")
+    try:
+        path = os.path.join(workdir, "textbook.pdf")
+        truth = make_pdf(path, args.pages)
+        results = [
+            measure("regex", lambda page, _: regex_headings(page), path, truth, args.repeat),
+            measure("layout", layout_headings, path, truth, args.repeat),
+        ]
+
+        print(f"{args.pages} pages, {len(truth)} true headings")
+        print(f"{'detector':<8} {'ms/page':>8} {'precision':>10} {'recall':>8}")
+        for r in results:
+            print(f"{r['label']:<8} {r['ms_per_page']:>8.3f} {r['precision']:>10.0%} {r['recall']:>8.0%}")
+    finally:
+        shutil.rmtree(workdir)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""Key-sentence selection: full sort vs. bounded heap vs. early termination.
+
+Usage (from the backend directory):
+
+    python -m benchmarks.bench_key_sentences --pages 50 200 --top-n 20
+
+Parses each text once (as one Doc and as NLP_CHUNK_CHARS chunks), then
+times selection only: the previous score-everything-and-sort code, the
+exhaustive heap, and the interactive mode that stops at top_n sentences
+scoring KEY_SENTENCE_GOOD_SCORE. The untrained stand-in finds no
+entities, so when en_core_web_sm is missing an entity ruler for the
+corpus's dates, people and chemicals is added to give realistic scores.
+"""
+import argparse
+import time
+
+from app.core.config import settings
+from app.services.nlp_engine import KEY_SENTENCE_GOOD_SCORE
+from benchmarks.nlp_models import load_engine, make_text
+
+ENTITY_PATTERNS = [
+    {"label": "DATE", "pattern": "1779"},
+    {"label": "PERSON", "pattern": "Jan Ingenhousz"},
+    {"label": "PERCENT", "pattern": "3 percent"},
+    {"label": "ORG", "pattern": "Calvin cycle"},
+    {"label": "PRODUCT", "pattern": "ATP"},
+    {"label": "PRODUCT", "pattern": "NADPH"},
+]
+
+
+def legacy_key_sentences(engine, analysis, top_n):
+    """Selection as it was before the heap: score all, sort, slice."""
+    scored = []
+    for sent, sent_ents in zip(analysis.sentences, analysis.sentence_entities):
+        score = engine._score_span(sent, sent_ents)
+        if score > 0:
+            scored.append((sent.text.strip(), score))
+    scored.sort(key=lambda x: x[1], reverse=True)
+    return [sent for sent, score in scored[:top_n]]
+
+
+def timed(fn, repeats=3):
+    best = None
+    for _ in range(repeats):
+        started = time.perf_counter()
+        result = fn()
+        elapsed = (time.perf_counter() - started) * 1000
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pages", type=int, nargs="+", default=[50, 200])
+    parser.add_argument("--top-n", type=int, default=20)
+    parser.add_argument("--model", default="en_core_web_sm")
+    args = parser.parse_args()
+
+    engine = load_engine(args.model)
+    if engine.nlp.meta.get("name") != "core_web_sm":
+        engine.nlp.add_pipe("entity_ruler", config={"overwrite_ents": True}).add_patterns(ENTITY_PATTERNS)
+    top_n = args.top_n
+    print(f"top_n: {top_n}, good score: {KEY_SENTENCE_GOOD_SCORE}")
+    print(f"{'pages':>6} {'sentences':>9} {'analysis':<8} {'sort ms':>8} {'heap ms':>8} {'early ms':>9} {'early min':>9}")
+
+    for pages in args.pages:
+        text = make_text(pages)
+        settings.NLP_CHUNK_CHARS = len(text) + 1
+        whole = engine.analyze(text)
+        settings.NLP_CHUNK_CHARS = 100000
+        chunked = engine.analyze(text)
+
+        for name, analysis in (("one doc", whole), ("chunked", chunked)):
+            heap_ms, heap = timed(lambda: engine.extract_key_sentences(analysis, top_n=top_n))
+            early_ms, early = timed(lambda: engine.extract_key_sentences(analysis, top_n=top_n, exhaustive=False))
+            if name == "one doc":
+                sort_ms, expected = timed(lambda: legacy_key_sentences(engine, analysis, top_n))
+                assert heap == expected
+                sort_col = f"{sort_ms:>8.1f}"
+            else:
+                sort_col = f"{'-':>8}"
+            scores = {s.text.strip(): engine._score_span(s, e)
+                      for s, e in zip(whole.sentences, whole.sentence_entities)}
+            print(f"{pages:>6} {len(whole.sentences):>9} {name:<8} {sort_col} {heap_ms:>8.1f} {early_ms:>9.2f} "
+                  f"{min(scores[s] for s in early):>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
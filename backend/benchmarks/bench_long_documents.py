@@ -0,0 +1,76 @@
+"""Whole-document parse vs. sentence-aligned chunks for long texts.
+
+Usage (from the backend directory):
+
+    python -m benchmarks.bench_long_documents --pages 50 200 --chunk-chars 100000 --n-process 1 -1
+
+For each size, parses the text as one Doc (the previous behaviour, which
+needs nlp.max_length raised past 1M characters) and through the chunked
+map step with each --n-process value, then runs the extractors used by
+question generation. Reports wall time, and the peak memory traced by
+tracemalloc over a second, separately run pass (tracing slows the
+allocation-heavy parse, so it is kept out of the timing). -1 starts one worker per
+CPU; on a single-core machine extra workers only add start-up cost.
+"""
+import argparse
+import os
+import time
+import tracemalloc
+
+from app.core.config import settings
+from benchmarks.nlp_models import load_engine, make_text
+
+
+def run(engine, text):
+    """Parse and extract the way generate_questions does."""
+    analysis = engine.analyze(text)
+    engine.extract_definitions(analysis, limit=20)
+    engine.extract_facts(analysis, limit=20)
+    engine.extract_key_sentences(analysis, top_n=20)
+    engine.extract_entities(analysis, limit=20)
+    engine.extract_relationships(analysis, limit=10)
+    return analysis
+
+
+def measured(fn):
+    started = time.perf_counter()
+    result = fn()
+    seconds = time.perf_counter() - started
+
+    tracemalloc.start()
+    fn()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return seconds, peak / 1024 / 1024, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pages", type=int, nargs="+", default=[50, 200])
+    parser.add_argument("--chunk-chars", type=int, default=settings.NLP_CHUNK_CHARS)
+    parser.add_argument("--n-process", type=int, nargs="+", default=[1])
+    parser.add_argument("--model", default="en_core_web_sm")
+    args = parser.parse_args()
+
+    engine = load_engine(args.model)
+    print(f"cpus: {os.cpu_count()}, chunk: {args.chunk_chars} chars")
+    print(f"{'pages':>6} {'text KB':>8} {'mode':<14} {'seconds':>8} {'peak MB':>8}")
+
+    for pages in args.pages:
+        text = make_text(pages)
+        kb = len(text) / 1024
+
+        settings.NLP_CHUNK_CHARS = len(text) + 1
+        seconds, peak, _ = measured(lambda: run(engine, text))
+        print(f"{pages:>6} {kb:>8.0f} {'single doc':<14} {seconds:>8.2f} {peak:>8.0f}")
+
+        settings.NLP_CHUNK_CHARS = args.chunk_chars
+        for n_process in args.n_process:
+            settings.NLP_N_PROCESS = n_process
+            seconds, peak, analysis = measured(lambda: run(engine, text))
+            mode = f"chunked n={n_process}"
+            print(f"{pages:>6} {kb:>8.0f} {mode:<14} {seconds:>8.2f} {peak:>8.0f}  ({len(analysis.doc_bin)} chunks)")
+
+
+if __name__ == "__main__":
+    main()
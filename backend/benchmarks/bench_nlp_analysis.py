@@ -0,0 +1,77 @@
+"""Per-extractor parsing vs. one shared NLPEngine.analyze() result.
+
+Usage (from the backend directory):
+
+    python -m benchmarks.bench_nlp_analysis --pages 200 --model en_core_web_sm
+
+Runs the five extractors generate_questions needs (definitions, facts,
+key sentences, entities, relationships) over the same text twice:
+"per-call" hands each one the raw string, so each parses it again;
+"shared" parses once with analyze() and hands every extractor the
+result. Outputs are checked equal. Pipeline calls are counted by
+wrapping the pipeline, split into full-document parses and the smaller
+per-sentence calls made while scoring key sentences.
+"""
+import argparse
+import time
+
+from benchmarks.nlp_models import load_engine, make_text
+
+
+class CountingPipeline:
+    """Wraps a spaCy pipeline and records the length of every text it parses."""
+
+    def __init__(self, nlp):
+        self.nlp = nlp
+        self.lengths = []
+
+    def __call__(self, text, *args, **kwargs):
+        self.lengths.append(len(text))
+        return self.nlp(text, *args, **kwargs)
+
+    def __getattr__(self, name):
+        return getattr(self.nlp, name)
+
+
+def extract_all(engine, source) -> tuple:
+    return (
+        engine.extract_definitions(source),
+        engine.extract_facts(source),
+        engine.extract_key_sentences(source, top_n=20),
+        engine.extract_entities(source),
+        engine.extract_relationships(source),
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pages", type=int, default=200)
+    parser.add_argument("--model", default="en_core_web_sm")
+    args = parser.parse_args()
+
+    engine = load_engine(args.model)
+    text = make_text(args.pages)
+    counter = CountingPipeline(engine.nlp)
+    engine.nlp = counter
+    print(f"text: {args.pages} pages, {len(text) / 1024:.0f} KB")
+
+    results = {}
+    for label, run in (("per-call", lambda: extract_all(engine, text)),
+                       ("shared", lambda: extract_all(engine, engine.analyze(text)))):
+        counter.lengths = []
+        started = time.perf_counter()
+        output = run()
+        seconds = time.perf_counter() - started
+        full = sum(1 for length in counter.lengths if length == len(text))
+        results[label] = (output, seconds, full, len(counter.lengths) - full)
+
+    assert results["per-call"][0] == results["shared"][0], "extractor output differs"
+
+    baseline = results["per-call"][1]
+    print(f"{'mode':<9} {'seconds':>8} {'speedup':>8} {'full parses':>12} {'other calls':>12}")
+    for label, (_, seconds, full, other) in results.items():
+        print(f"{label:<9} {seconds:>8.2f} {baseline / seconds:>7.1f}x {full:>12} {other:>12}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""Repeated question generation with and without the NLP result cache.
+
+Usage (from the backend directory):
+
+    python -m benchmarks.bench_nlp_cache --pages 1 10 --repeats 5
+    python -m benchmarks.bench_nlp_cache --redis redis://localhost:6379/0
+
+Generates questions from the same text `--repeats` times (a topic
+regenerated with different counts, or a retry), once with caching off
+and once with an NLPCache in front of the extractors. The first cached
+call is a miss; the rest should skip parsing entirely. --redis also
+writes through to Redis and reports a cold in-process tier served from
+Redis (another worker, or after a restart).
+"""
+import argparse
+import time
+
+from app.services.nlp_cache import NLPCache
+from app.services.question_generator import QuestionGenerator
+from benchmarks.nlp_models import load_engine, make_text
+
+
+def timed_runs(generator, text, counts):
+    times = []
+    for count in counts:
+        started = time.perf_counter()
+        generator.generate_questions(text, num_questions=count)
+        times.append((time.perf_counter() - started) * 1000)
+    return times
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pages", type=int, nargs="+", default=[1, 10])
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--redis", default=None)
+    parser.add_argument("--model", default="en_core_web_sm")
+    args = parser.parse_args()
+
+    engine = load_engine(args.model)
+    generator = QuestionGenerator(engine)
+    # Same request repeated, as a retry or regeneration would send it
+    counts = [10] * args.repeats
+
+    print(f"{'pages':>6} {'mode':<16} {'first ms':>9} {'repeat ms':>10}")
+    for pages in args.pages:
+        text = make_text(pages, seed=pages)
+        modes = [("no cache", None), ("in-process", NLPCache())]
+        if args.redis:
+            modes.append(("redis", NLPCache(redis_url=args.redis)))
+
+        for mode, cache in modes:
+            engine.cache = cache
+            times = timed_runs(generator, text, counts)
+            print(f"{pages:>6} {mode:<16} {times[0]:>9.1f} {sum(times[1:]) / len(times[1:]):>10.1f}")
+            if mode == "redis":
+                cache.clear()
+                cold = timed_runs(generator, text, counts[:1])[0]
+                print(f"{pages:>6} {'redis, cold LRU':<16} {cold:>9.1f}")
+        if cache is not None:
+            print(f"{'':>6} stats: {cache.stats()}")
+
+
+if __name__ == "__main__":
+    main()
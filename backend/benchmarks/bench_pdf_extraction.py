@@ -0,0 +1,79 @@
+"""Serial vs. parallel PDFProcessor.extract_text on synthetic PDFs.
+
+Usage (from the backend directory):
+
+    python -m benchmarks.bench_pdf_extraction --pages 100 500 1000 --workers 4 --batch-size 50
+
+"serial" forces one worker; "parallel" uses the given worker count and
+page-batch size. Both paths produce identical text, which is checked.
+"""
+import argparse
+import os
+import shutil
+import tempfile
+import time
+
+import fitz
+
+from app.services.pdf_processor import PDFProcessor
+
+PARAGRAPH = (
+    "Photosynthesis is the process by which green plants convert light energy into chemical "
+    "energy. The rate of photosynthesis depends on light intensity, carbon dioxide concentration "
+    "and temperature. In 1779 Jan Ingenhousz showed that light is essential to the process. "
+)
+
+
+def make_pdf(path: str, pages: int) -> None:
+    """Write a PDF whose pages are filled with textbook-like prose."""
+    doc = fitz.open()
+    body = PARAGRAPH * 12
+    for page_num in range(pages):
+        page = doc.new_page()
+        page.insert_text((72, 60), f"Chapter {page_num + 1}: Section heading", fontsize=14)
+        page.insert_textbox(fitz.Rect(72, 80, 540, 780), body, fontsize=9)
+    doc.save(path)
+    doc.close()
+
+
+def time_extract(processor: PDFProcessor, path: str, repeat: int) -> tuple:
+    best = float("inf")
+    text = ""
+    for _ in range(repeat):
+        started = time.perf_counter()
+        text = processor.extract_text(path)
+        best = min(best, time.perf_counter() - started)
+    return best, text
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pages", type=int, nargs="+", default=[100, 500, 1000])
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--batch-size", type=int, default=50)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    serial = PDFProcessor(workers=1)
+    parallel = PDFProcessor(workers=args.workers, batch_size=args.batch_size)
+    parallel.parallel_min_pages = 0
+
+    workdir = tempfile.mkdtemp(prefix="autoq_bench_pdf_")
+    try:
+        print(f"workers={args.workers} batch_size={args.batch_size} cpus={os.cpu_count()}")
+        print(f"{'pages':>6} {'serial s':>10} {'parallel s':>11} {'speedup':>8}")
+        for pages in args.pages:
+            path = os.path.join(workdir, f"synthetic_{pages}.pdf")
+            make_pdf(path, pages)
+
+            serial_time, serial_text = time_extract(serial, path, args.repeat)
+            parallel_time, parallel_text = time_extract(parallel, path, args.repeat)
+            assert serial_text == parallel_text, "parallel extraction changed the text"
+
+            print(f"{pages:>6} {serial_time:>10.3f} {parallel_time:>11.3f} {serial_time / parallel_time:>7.2f}x")
+    finally:
+        shutil.rmtree(workdir)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""Cost of each pipeline profile, and of extractors called on raw text.
+
+Usage (from the backend directory):
+
+    python -m benchmarks.bench_pipeline_profiles --pages 20
+
+First times NLPEngine.analyze() with each profile. Then times the
+extractors that declare a lighter profile when handed a string, once
+forced through the full pipeline (the previous behaviour) and once with
+their declared profile.
+"""
+import argparse
+import time
+
+from benchmarks.nlp_models import load_engine, make_text
+
+EXTRACTORS = [
+    ("extract_definitions", "sentences"),
+    ("calculate_text_complexity", "sentences"),
+    ("extract_entities", "entities"),
+    ("extract_facts", "entities"),
+]
+
+
+def timed(fn):
+    started = time.perf_counter()
+    fn()
+    return time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pages", type=int, default=20)
+    parser.add_argument("--model", default="en_core_web_sm")
+    args = parser.parse_args()
+
+    engine = load_engine(args.model)
+    text = make_text(args.pages)
+    print(f"text: {args.pages} pages, {len(text) / 1024:.0f} KB, pipeline: {', '.join(engine.nlp.pipe_names)}")
+
+    full_s = timed(lambda: engine.analyze(text, profile="full"))
+    print(f"\n{'profile':<10} {'seconds':>8} {'vs full':>8}")
+    for profile in ("sentences", "entities", "full"):
+        seconds = full_s if profile == "full" else timed(lambda: engine.analyze(text, profile=profile))
+        print(f"{profile:<10} {seconds:>8.2f} {full_s / seconds:>7.1f}x")
+
+    print(f"\n{'extractor':<26} {'profile':<10} {'full s':>7} {'profile s':>10} {'speedup':>8}")
+    for name, profile in EXTRACTORS:
+        extractor = getattr(engine, name)
+        forced = timed(lambda: extractor(engine.analyze(text, profile="full")))
+        declared = timed(lambda: extractor(text))
+        print(f"{name:<26} {profile:<10} {forced:>7.2f} {declared:>10.2f} {forced / declared:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
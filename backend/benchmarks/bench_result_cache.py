@@ -0,0 +1,87 @@
+"""Latency of repeated seeded generate requests (result cache).
+
+Usage (from the backend directory):
+
+    python -m benchmarks.bench_result_cache --questions 10 100 --repeat 5
+
+Starts the API under uvicorn as bench_event_loop does (result cache on),
+then for each question count times POST /questions/generate: the first
+seeded request (generated in a worker), the same request repeated
+(served from the cache), and unseeded requests (never cached). Timings
+include saving the questions, which every request still does.
+"""
+import argparse
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+from benchmarks.bench_event_loop import SEED, request, wait_ready
+from benchmarks.nlp_models import make_text, stand_in_model
+
+
+def timed_request(url, payload):
+    started = time.perf_counter()
+    status, body = request(url, payload)
+    if status != 200:
+        raise RuntimeError(f"generate returned {status}")
+    return time.perf_counter() - started, body
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--questions", type=int, nargs="+", default=[10, 100])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--pages", type=int, default=20)
+    parser.add_argument("--port", type=int, default=8767)
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="autoq_bench_cache_")
+    server = None
+    try:
+        import spacy.util
+        if not spacy.util.is_package("en_core_web_sm"):
+            stand_in_model(os.path.join(workdir, "en_core_web_sm"))
+        env = dict(os.environ, PYTHONPATH=os.path.abspath("."),
+                   DATABASE_URL=f"sqlite:///{workdir}/bench.db", UPLOAD_DIR=f"{workdir}/uploads",
+                   GENERATION_WORKERS=str(args.workers), NLP_WARMUP="true")
+        subprocess.run([sys.executable, "-c", SEED], cwd=workdir, env=env, input=make_text(args.pages),
+                       text=True, check=True, capture_output=True)
+
+        server = subprocess.Popen(
+            [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(args.port), "--log-level", "warning"],
+            cwd=workdir, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+        )
+        base = f"http://127.0.0.1:{args.port}"
+        url = f"{base}/api/v1/questions/generate"
+        wait_ready(base)
+        request(url, {"document_id": 1, "num_questions": 10})  # store the parse and candidate pool
+
+        print(f"text: {args.pages} pages, workers: {args.workers}")
+        print(f"{'questions':>9} {'first ms':>9} {'repeat ms':>10} {'unseeded ms':>12} {'same output':>12}")
+        for num_questions in args.questions:
+            payload = {"document_id": 1, "num_questions": num_questions, "seed": num_questions}
+            first_s, first = timed_request(url, payload)
+            repeats = [timed_request(url, payload) for _ in range(args.repeat)]
+            unseeded = [timed_request(url, {"document_id": 1, "num_questions": num_questions})[0]
+                        for _ in range(args.repeat)]
+
+            strip = lambda questions: [{k: v for k, v in q.items() if k not in ("id", "created_at")}
+                                       for q in questions]
+            same = all(strip(body) == strip(first) for _, body in repeats)
+            print(f"{num_questions:>9} {first_s * 1000:>9.1f} "
+                  f"{statistics.median(s for s, _ in repeats) * 1000:>10.1f} "
+                  f"{statistics.median(unseeded) * 1000:>12.1f} {str(same):>12}")
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+        shutil.rmtree(workdir)
+
+
+if __name__ == "__main__":
+    main()
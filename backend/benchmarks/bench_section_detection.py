@@ -0,0 +1,94 @@
+"""Line-by-line vs. single-pass section detection on a large text.
+
+Usage (from the backend directory):
+
+    python -m benchmarks.bench_section_detection --megabytes 5 --headings 5000
+
+"legacy" is the previous detect_sections: four re.match calls per line
+and `content +=` accumulation. "spans" is PDFProcessor.section_spans,
+which only records offsets; "sections" additionally materializes every
+section's content through detect_sections. Outputs are checked equal.
+"""
+import argparse
+import random
+import time
+
+from app.services.pdf_processor import HEADING_PATTERNS, PDFProcessor
+
+WORDS = ("energy cell membrane diffusion gradient protein enzyme substrate reaction "
+         "rate temperature light carbon oxygen water glucose molecule transport").split()
+
+
+def legacy_detect_sections(text: str) -> list:
+    sections = []
+    current_section = {"title": "Introduction", "content": ""}
+    for line in text.split('\n'):
+        line = line.strip()
+        if not line:
+            continue
+        if any(pattern.match(line) for pattern in HEADING_PATTERNS):
+            if current_section["content"].strip():
+                sections.append(current_section)
+            current_section = {"title": line, "content": ""}
+        else:
+            current_section["content"] += line + " "
+    if current_section["content"].strip():
+        sections.append(current_section)
+    if not sections:
+        sections.append({"title": "Main Content", "content": text})
+    return sections
+
+
+def make_text(megabytes: float, headings: int, rng: random.Random) -> str:
+    """Prose lines with Chapter / numbered / ALL-CAPS headings spread evenly."""
+    target = int(megabytes * 1024 * 1024)
+    lines_per_section = max(1, target // (headings * 80))
+    kinds = [
+        lambda n: f"Chapter {n}: Topic {n}",
+        lambda n: f"{n}. Overview of part {n}",
+        lambda n: f"SECTION REVIEW {'I' * (n % 5 + 1)}",
+        lambda n: f"  Unit {n}. Practice  ",
+    ]
+    lines = []
+    for n in range(1, headings + 1):
+        lines.append(kinds[n % len(kinds)](n))
+        for _ in range(lines_per_section):
+            lines.append(" ".join(rng.choice(WORDS) for _ in range(11)).capitalize() + ".")
+        lines.append("")
+    return "\n".join(lines)
+
+
+def best_of(repeat: int, fn, *args):
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = fn(*args)
+        best = min(best, time.perf_counter() - started)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--megabytes", type=float, default=5)
+    parser.add_argument("--headings", type=int, default=5000)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=3)
+    args = parser.parse_args()
+
+    text = make_text(args.megabytes, args.headings, random.Random(args.seed))
+    processor = PDFProcessor()
+
+    legacy_s, expected = best_of(args.repeat, legacy_detect_sections, text)
+    spans_s, spans = best_of(args.repeat, processor.section_spans, text)
+    sections_s, sections = best_of(args.repeat, processor.detect_sections, text)
+    assert sections == expected, "section output differs from legacy detector"
+
+    print(f"text: {len(text) / 1024 / 1024:.1f} MB, {text.count(chr(10)) + 1} lines, {len(spans)} sections")
+    print(f"{'detector':<9} {'ms':>9} {'speedup':>8}")
+    for label, seconds in (("legacy", legacy_s), ("spans", spans_s), ("sections", sections_s)):
+        print(f"{label:<9} {seconds * 1000:>9.1f} {legacy_s / seconds:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+"""Per-sentence parsing vs. reused spans vs. batched nlp.pipe.
+
+Usage (from the backend directory):
+
+    python -m benchmarks.bench_sentence_scoring --pages 30 --batch-size 64 --n-process 1
+
+Covers the per-sentence work done after the document parse:
+key-sentence scoring and the generator's per-fact analysis.
+
+  nlp() each    one pipeline call per sentence (the previous behaviour)
+  nlp.pipe      sentence_docs() without an analysis: one batched pass
+  spans         sentence_docs() / span scoring on the document parse
+"""
+import argparse
+import time
+
+from benchmarks.nlp_models import load_engine, make_text
+
+
+def timed(fn):
+    started = time.perf_counter()
+    result = fn()
+    return time.perf_counter() - started, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pages", type=int, default=30)
+    parser.add_argument("--batch-size", type=int, default=64)
+    parser.add_argument("--n-process", type=int, default=1)
+    parser.add_argument("--model", default="en_core_web_sm")
+    args = parser.parse_args()
+
+    engine = load_engine(args.model)
+    analysis = engine.analyze(make_text(args.pages))
+    sentences = [sent.text.strip() for sent in analysis.sentences]
+    print(f"text: {args.pages} pages, {len(sentences)} sentences")
+
+    rows = [
+        ("score: nlp() each", timed(lambda: [engine._score_sentence(s) for s in sentences])[0]),
+        ("score: spans", timed(lambda: [engine._score_span(s, e) for s, e in
+                                         zip(analysis.sentences, analysis.sentence_entities)])[0]),
+        ("parse: nlp() each", timed(lambda: [engine.nlp(s) for s in sentences])[0]),
+        ("parse: nlp.pipe", timed(lambda: list(engine.nlp.pipe(sentences, batch_size=args.batch_size,
+                                                              n_process=args.n_process)))[0]),
+        ("parse: spans", timed(lambda: engine.sentence_docs(sentences, analysis))[0]),
+    ]
+
+    print(f"{'operation':<18} {'ms':>9} {'per sentence':>13}")
+    for label, seconds in rows:
+        print(f"{label:<18} {seconds * 1000:>9.1f} {seconds / len(sentences) * 1e6:>11.0f}us")
+
+
+if __name__ == "__main__":
+    main()
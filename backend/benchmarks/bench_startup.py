@@ -0,0 +1,81 @@
+"""Cold-start time and resident memory of the API process.
+
+Usage (from the backend directory):
+
+    python -m benchmarks.bench_startup --runs 3
+    python -m benchmarks.bench_startup --app-dir /path/to/older/checkout/backend
+
+Each run starts a fresh interpreter that imports app.main, then loads
+the NLP model the way startup does (a no-op when the model was already
+loaded at import), and reports the import time, the time until the
+model is ready, and VmRSS after each step. Point --app-dir at another
+checkout to compare revisions.
+
+When en_core_web_sm is not installed, an untrained stand-in with the
+same components is saved as ./en_core_web_sm in the run directory,
+which spacy.load resolves as a path. The stand-in's weights are much
+smaller than the real model's, so absolute RSS understates production;
+the number of model copies is what the comparison shows.
+"""
+import argparse
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+
+from benchmarks.nlp_models import stand_in_model
+
+CHILD = """
+import time
+
+def rss_mb():
+    with open("/proc/self/status") as f:
+        for line in f:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1]) / 1024
+    return 0.0
+
+started = time.perf_counter()
+import app.main
+imported = time.perf_counter() - started
+imported_rss = rss_mb()
+
+from app.services import nlp_engine
+if hasattr(nlp_engine, "warmup_nlp"):
+    nlp_engine.warmup_nlp()
+ready = time.perf_counter() - started
+print(imported, imported_rss, ready, rss_mb())
+"""
+
+
+def model_installed(name: str) -> bool:
+    import spacy.util
+    return spacy.util.is_package(name)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--app-dir", default=".")
+    parser.add_argument("--runs", type=int, default=3)
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="autoq_bench_startup_")
+    try:
+        if not model_installed("en_core_web_sm"):
+            stand_in_model(os.path.join(workdir, "en_core_web_sm"))
+            print("model: untrained stand-in saved as ./en_core_web_sm")
+
+        env = dict(os.environ, PYTHONPATH=os.path.abspath(args.app_dir))
+        print(f"{'run':>4} {'import s':>9} {'import MB':>10} {'ready s':>8} {'ready MB':>9}")
+        for run in range(1, args.runs + 1):
+            out = subprocess.run([sys.executable, "-c", CHILD], cwd=workdir, env=env,
+                                 capture_output=True, text=True, check=True).stdout
+            imported, imported_rss, ready, ready_rss = map(float, out.split()[-4:])
+            print(f"{run:>4} {imported:>9.2f} {imported_rss:>10.0f} {ready:>8.2f} {ready_rss:>9.0f}")
+    finally:
+        shutil.rmtree(workdir)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""Time to first question of the streaming generate endpoint.
+
+Usage (from the backend directory):
+
+    python -m benchmarks.bench_streaming --questions 50 100 --repeat 3
+
+Starts the API under uvicorn as bench_event_loop does, then for each
+question count times POST /questions/generate (whole response) and
+POST /questions/generate/stream (first "question" line, and the final
+"done" line). The parse is stored before timing and the NLP result cache
+is disabled, so every request re-runs extraction and generation.
+"""
+import argparse
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+
+from benchmarks.bench_event_loop import SEED, request, wait_ready
+from benchmarks.nlp_models import make_text, stand_in_model
+
+
+def time_stream(url, payload):
+    """Seconds to the first question event and to the end of the stream."""
+    req = urllib.request.Request(url, data=json.dumps(payload).encode(),
+                                 headers={"Content-Type": "application/json"})
+    started = time.perf_counter()
+    first = None
+    count = 0
+    with urllib.request.urlopen(req, timeout=300) as response:
+        for line in response:
+            event = json.loads(line)
+            if event["event"] == "question":
+                count += 1
+                if first is None:
+                    first = time.perf_counter() - started
+            elif event["event"] == "error":
+                raise RuntimeError(event["data"]["detail"])
+    return first, time.perf_counter() - started, count
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--questions", type=int, nargs="+", default=[50, 100])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--pages", type=int, default=20)
+    parser.add_argument("--port", type=int, default=8766)
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="autoq_bench_stream_")
+    server = None
+    try:
+        import spacy.util
+        if not spacy.util.is_package("en_core_web_sm"):
+            stand_in_model(os.path.join(workdir, "en_core_web_sm"))
+        env = dict(os.environ, PYTHONPATH=os.path.abspath("."),
+                   DATABASE_URL=f"sqlite:///{workdir}/bench.db", UPLOAD_DIR=f"{workdir}/uploads",
+                   GENERATION_WORKERS=str(args.workers), NLP_CACHE_MAX_BYTES="0", NLP_WARMUP="true")
+        subprocess.run([sys.executable, "-c", SEED], cwd=workdir, env=env, input=make_text(args.pages),
+                       text=True, check=True, capture_output=True)
+
+        server = subprocess.Popen(
+            [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(args.port), "--log-level", "warning"],
+            cwd=workdir, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+        )
+        base = f"http://127.0.0.1:{args.port}"
+        wait_ready(base)
+        request(f"{base}/api/v1/questions/generate", {"document_id": 1, "num_questions": 10})  # store the parse
+
+        print(f"text: {args.pages} pages, workers: {args.workers}")
+        print(f"{'questions':>9} {'generate s':>11} {'stream first s':>15} {'stream total s':>15} {'first/total':>12}")
+        for num_questions in args.questions:
+            payload = {"document_id": 1, "num_questions": num_questions}
+            whole, first, total = [], [], []
+            for _ in range(args.repeat):
+                started = time.perf_counter()
+                status, _ = request(f"{base}/api/v1/questions/generate", payload)
+                if status != 200:
+                    raise RuntimeError(f"generate returned {status}")
+                whole.append(time.perf_counter() - started)
+                first_s, total_s, _ = time_stream(f"{base}/api/v1/questions/generate/stream", payload)
+                first.append(first_s)
+                total.append(total_s)
+            whole_s, first_s, total_s = (statistics.median(v) for v in (whole, first, total))
+            print(f"{num_questions:>9} {whole_s:>11.2f} {first_s:>15.2f} {total_s:>15.2f} "
+                  f"{first_s / total_s:>11.0%}")
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+        shutil.rmtree(workdir)
+
+
+if __name__ == "__main__":
+    main()
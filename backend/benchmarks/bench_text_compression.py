@@ -0,0 +1,134 @@
+"""Database size and read latency of raw vs. compressed document text.
+
+Usage (from the backend directory):
+
+    python -m benchmarks.bench_text_compression --documents 20 --pages 300
+
+Builds a corpus of textbook-sized documents (Zipf-distributed vocabulary,
+about 3 KB of text per page), stores each document's full text and its
+pages in SQLite once with plain Text columns and once per codec with
+CompressedText, then reports file size and the time to read full texts
+and 10-page ranges back.
+"""
+import argparse
+import os
+import random
+import shutil
+import tempfile
+import time
+
+from sqlalchemy import Column, Integer, MetaData, Table, Text, create_engine, insert, select
+
+from app.core.config import settings
+from app.models.types import CompressedText
+
+SYLLABLES = ["ab", "ac", "al", "an", "ar", "at", "ce", "co", "de", "di", "en", "er", "es",
+             "ic", "in", "io", "is", "it", "la", "le", "ma", "ne", "no", "on", "or", "ph",
+             "ra", "re", "ro", "si", "ta", "te", "th", "ti", "to", "ul", "um", "ur", "ve"]
+
+
+def build_vocabulary(size: int, rng: random.Random) -> list:
+    words = ["the", "of", "and", "a", "to", "in", "is", "that", "for", "as", "are", "by"]
+    while len(words) < size:
+        words.append("".join(rng.choice(SYLLABLES) for _ in range(rng.randint(1, 4))))
+    return words
+
+
+def make_page(vocabulary: list, weights: list, rng: random.Random, chars: int = 3000) -> str:
+    sentences = []
+    length = 0
+    while length < chars:
+        words = rng.choices(vocabulary, weights=weights, k=rng.randint(8, 25))
+        sentence = " ".join(words).capitalize() + "."
+        sentences.append(sentence)
+        length += len(sentence) + 1
+    return " ".join(sentences)
+
+
+def make_tables(column_type) -> tuple:
+    metadata = MetaData()
+    documents = Table("documents", metadata,
+                      Column("id", Integer, primary_key=True),
+                      Column("extracted_text", column_type))
+    pages = Table("pages", metadata,
+                  Column("id", Integer, primary_key=True),
+                  Column("document_id", Integer, index=True),
+                  Column("page_number", Integer),
+                  Column("text", column_type))
+    return metadata, documents, pages
+
+
+def run(label: str, column_type, corpus: list, workdir: str) -> dict:
+    path = os.path.join(workdir, f"{label}.db")
+    engine = create_engine(f"sqlite:///{path}")
+    metadata, documents, pages = make_tables(column_type)
+    metadata.create_all(engine)
+
+    started = time.perf_counter()
+    with engine.begin() as conn:
+        for doc_id, doc_pages in enumerate(corpus, start=1):
+            conn.execute(insert(documents), [{"id": doc_id, "extracted_text": " ".join(doc_pages)}])
+            conn.execute(insert(pages), [
+                {"document_id": doc_id, "page_number": n, "text": text}
+                for n, text in enumerate(doc_pages, start=1)
+            ])
+    write_seconds = time.perf_counter() - started
+
+    with engine.connect() as conn:
+        conn.exec_driver_sql("VACUUM")
+
+    with engine.connect() as conn:
+        started = time.perf_counter()
+        for doc_id in range(1, len(corpus) + 1):
+            conn.execute(select(documents.c.extracted_text).where(documents.c.id == doc_id)).scalar_one()
+        full_read = (time.perf_counter() - started) / len(corpus)
+
+        started = time.perf_counter()
+        for doc_id in range(1, len(corpus) + 1):
+            conn.execute(select(pages.c.text).where(
+                pages.c.document_id == doc_id, pages.c.page_number.between(11, 20)
+            )).all()
+        range_read = (time.perf_counter() - started) / len(corpus)
+
+    engine.dispose()
+    return {
+        "label": label,
+        "size_mb": os.path.getsize(path) / 1024 / 1024,
+        "write_s": write_seconds,
+        "full_ms": full_read * 1000,
+        "range_ms": range_read * 1000,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--documents", type=int, default=20)
+    parser.add_argument("--pages", type=int, default=300)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    vocabulary = build_vocabulary(8000, rng)
+    weights = [1.0 / rank for rank in range(1, len(vocabulary) + 1)]
+    corpus = [[make_page(vocabulary, weights, rng) for _ in range(args.pages)] for _ in range(args.documents)]
+    raw_mb = sum(len(p) for doc in corpus for p in doc) / 1024 / 1024
+    print(f"corpus: {args.documents} documents x {args.pages} pages, {raw_mb:.1f} MB of page text")
+
+    workdir = tempfile.mkdtemp(prefix="autoq_bench_compress_")
+    try:
+        results = [run("raw", Text, corpus, workdir)]
+        for codec in ("zlib", "zstd"):
+            settings.TEXT_COMPRESSION = codec
+            results.append(run(codec, CompressedText, corpus, workdir))
+
+        baseline = results[0]["size_mb"]
+        print(f"{'storage':<8} {'db MB':>8} {'vs raw':>7} {'write s':>8} {'full text ms':>13} {'10 pages ms':>12}")
+        for r in results:
+            print(f"{r['label']:<8} {r['size_mb']:>8.1f} {r['size_mb'] / baseline:>6.0%} {r['write_s']:>8.2f} "
+                  f"{r['full_ms']:>13.2f} {r['range_ms']:>12.2f}")
+    finally:
+        shutil.rmtree(workdir)
+
+
+if __name__ == "__main__":
+    main()
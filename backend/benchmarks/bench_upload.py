@@ -0,0 +1,91 @@
+"""Peak memory of buffered vs. streamed uploads under concurrency.
+
+Usage (from the backend directory):
+
+    python -m benchmarks.bench_upload --size-mb 50 --concurrency 1 10 50
+
+The buffered path reproduces the old ``await file.read()`` handler; the
+streamed path is ``FileStorage.save_upload``. Peak memory is measured with
+tracemalloc, so it counts Python allocations made while copying uploads.
+"""
+import argparse
+import asyncio
+import os
+import shutil
+import tempfile
+import time
+import tracemalloc
+
+from fastapi import UploadFile
+
+from app.services.file_storage import FileStorage
+
+
+def make_source_file(directory: str, size_mb: int) -> str:
+    """Write a file of random-ish bytes to act as the client upload."""
+    path = os.path.join(directory, "source.pdf")
+    block = os.urandom(1024 * 1024)
+    with open(path, "wb") as f:
+        for _ in range(size_mb):
+            f.write(block)
+    return path
+
+
+async def buffered_save(upload: UploadFile, target_dir: str) -> int:
+    """The pre-streaming handler: read everything, then write once."""
+    path = os.path.join(target_dir, f"{id(upload)}.pdf")
+    with open(path, "wb") as f:
+        content = await upload.read()
+        f.write(content)
+    return len(content)
+
+
+async def run_round(mode: str, source: str, target_dir: str, concurrency: int, max_size: int) -> dict:
+    handles = [open(source, "rb") for _ in range(concurrency)]
+    uploads = [UploadFile(file=h, filename="upload.pdf") for h in handles]
+    storage = FileStorage(upload_dir=target_dir, max_size=max_size)
+
+    tracemalloc.start()
+    started = time.perf_counter()
+    try:
+        if mode == "buffered":
+            await asyncio.gather(*(buffered_save(u, target_dir) for u in uploads))
+        else:
+            await asyncio.gather(*(storage.save_upload(u) for u in uploads))
+        elapsed = time.perf_counter() - started
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+        for h in handles:
+            h.close()
+
+    return {"mode": mode, "concurrency": concurrency, "peak_mb": peak / 1024 / 1024, "seconds": elapsed}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--size-mb", type=int, default=50)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 10, 50])
+    parser.add_argument("--modes", nargs="+", default=["buffered", "streamed"], choices=["buffered", "streamed"])
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="autoq_bench_upload_")
+    try:
+        source = make_source_file(workdir, args.size_mb)
+        max_size = (args.size_mb + 1) * 1024 * 1024
+
+        print(f"{'mode':<10} {'concurrency':>11} {'peak MB':>10} {'seconds':>9}")
+        for concurrency in args.concurrency:
+            for mode in args.modes:
+                target_dir = os.path.join(workdir, f"{mode}_{concurrency}")
+                os.makedirs(target_dir)
+                result = asyncio.run(run_round(mode, source, target_dir, concurrency, max_size))
+                shutil.rmtree(target_dir)
+                print(f"{result['mode']:<10} {result['concurrency']:>11} "
+                      f"{result['peak_mb']:>10.1f} {result['seconds']:>9.2f}")
+    finally:
+        shutil.rmtree(workdir)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""Shared setup for the NLP benchmarks.
+
+load_engine() returns an NLPEngine for the requested spaCy model. When
+that model is not installed (e.g. on CI or an offline machine), it falls
+back to an untrained stand-in with the same component layout as
+en_core_web_sm (tok2vec, tagger, parser, ner, with a sentencizer so
+sentence boundaries stay realistic). The stand-in's annotations are
+meaningless, but its cost per parse is of the same order, which is all
+the timing comparisons rely on.
+"""
+import random
+import tempfile
+
+import spacy
+
+from app.services.nlp_engine import NLPEngine
+
+SENTENCES = [
+    "Photosynthesis is the process by which green plants convert light energy into chemical energy.",
+    "In 1779 Jan Ingenhousz showed that light is essential to the process.",
+    "The rate of photosynthesis depends on light intensity, carbon dioxide concentration and temperature.",
+    "Chlorophyll refers to the green pigment that absorbs red and blue light.",
+    "About 3 percent of the sunlight reaching a leaf is stored as chemical energy.",
+    "The Calvin cycle uses ATP and NADPH to fix carbon dioxide into sugars.",
+    "Stomata are small pores that regulate gas exchange in the leaf.",
+    "Respiration means the breakdown of glucose to release energy for the cell.",
+]
+
+
+def make_text(pages: int, chars_per_page: int = 3000, seed: int = 11) -> str:
+    """Textbook-like prose of about `pages` pages."""
+    rng = random.Random(seed)
+    target = pages * chars_per_page
+    parts = []
+    length = 0
+    while length < target:
+        sentence = rng.choice(SENTENCES)
+        parts.append(sentence)
+        length += len(sentence) + 1
+    return " ".join(parts)
+
+
+def stand_in_model(path: str = None) -> str:
+    """Save the untrained stand-in pipeline and return its directory."""
+    nlp = spacy.blank("en")
+    nlp.add_pipe("sentencizer")
+    nlp.add_pipe("tok2vec")
+    tagger = nlp.add_pipe("tagger")
+    for label in ("NN", "NNP", "VB", "VBZ", "DT", "CD", "JJ", "IN", "."):
+        tagger.add_label(label)
+    parser = nlp.add_pipe("parser")
+    for label in ("ROOT", "nsubj", "dobj", "pobj", "det", "prep", "amod", "punct"):
+        parser.add_label(label)
+    ner = nlp.add_pipe("ner")
+    for label in ("DATE", "PERSON", "PERCENT", "QUANTITY", "ORG"):
+        ner.add_label(label)
+    nlp.initialize()
+
+    path = path or tempfile.mkdtemp(prefix="autoq_bench_model_")
+    nlp.to_disk(path)
+    return path
+
+
+def load_engine(model_name: str = "en_core_web_sm") -> NLPEngine:
+    try:
+        engine = NLPEngine(model_name)
+        print(f"model: {model_name}")
+    except Exception:
+        engine = NLPEngine(stand_in_model())
+        print(f"model: untrained stand-in ({model_name} is not installed)")
+    engine.nlp.max_length = max(engine.nlp.max_length, 10_000_000)
+    return engine
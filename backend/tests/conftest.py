@@ -0,0 +1,19 @@
+import pytest
+import spacy
+from app.services.nlp_engine import NLPEngine
+
+
+@pytest.fixture(scope="session")
+def nlp_engine(tmp_path_factory):
+    """NLPEngine over a small rule-based pipeline (no trained model needed)."""
+    nlp = spacy.blank("en")
+    nlp.add_pipe("sentencizer")
+    ruler = nlp.add_pipe("entity_ruler")
+    ruler.add_patterns([
+        {"label": "DATE", "pattern": "1779"},
+        {"label": "PERSON", "pattern": "Jan Ingenhousz"},
+        {"label": "PERCENT", "pattern": "3 percent"},
+    ])
+    path = tmp_path_factory.mktemp("model") / "rules"
+    nlp.to_disk(path)
+    return NLPEngine(str(path))
@@ -0,0 +1,18 @@
+from app.models.types import compress_text, decompress_text
+
+
+def test_small_values_stay_inline():
+    """Test that values under the threshold are stored uncompressed."""
+    payload = compress_text("short", codec="zstd", threshold=1024)
+    assert payload == b"\x00short"
+    assert decompress_text(payload) == "short"
+
+
+def test_large_values_round_trip_with_any_codec():
+    """Test that large text is compressed and readable whatever codec wrote it."""
+    text = "Photosynthesis converts light energy into chemical energy. " * 200
+
+    for codec in ("zlib", "zstd"):
+        payload = compress_text(text, codec=codec, threshold=1024)
+        assert len(payload) < len(text) // 4
+        assert decompress_text(payload) == text
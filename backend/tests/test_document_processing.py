@@ -0,0 +1,204 @@
+import fitz
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from app.models import Base, Document, DocumentContent, DocumentPage, ProcessingJob, JobState, Topic
+from app.services.document_processing import DocumentProcessingService
+from app.services.pdf_processor import PDFProcessor
+from app.services.document_store import DocumentStore
+
+
+@pytest.fixture
+def session_factory():
+    engine = create_engine("sqlite://", poolclass=StaticPool, connect_args={"check_same_thread": False})
+    Base.metadata.create_all(bind=engine)
+    return sessionmaker(bind=engine)
+
+
+def _make_pdf(path, pages):
+    doc = fitz.open()
+    for i in range(pages):
+        page = doc.new_page()
+        page.insert_text((72, 72), f"CHAPTER {i + 1}: Topic {i + 1}", fontsize=16)
+        page.insert_text((72, 110), f"Body text for page {i + 1} describing the topic in detail.")
+    doc.save(str(path))
+    doc.close()
+
+
+def _queue_job(db, file_path):
+    content = DocumentContent(content_hash="cd" * 32, file_path=str(file_path), file_size=1)
+    db.add(content)
+    db.flush()
+    document = Document(filename="x.pdf", original_filename="x.pdf", file_path=str(file_path),
+                        content_id=content.id, owner_id=1, processing_status="queued")
+    db.add(document)
+    db.flush()
+    job = ProcessingJob(document_id=document.id)
+    db.add(job)
+    db.commit()
+    return job.id, document.id
+
+
+def test_run_job_records_progress_and_topics(session_factory, tmp_path):
+    """Test that a job extracts the document and completes with full progress."""
+    pdf_path = tmp_path / "book.pdf"
+    _make_pdf(pdf_path, 3)
+    db = session_factory()
+    job_id, document_id = _queue_job(db, pdf_path)
+
+    DocumentProcessingService(session_factory=session_factory).run(job_id)
+
+    db.expire_all()
+    job = db.get(ProcessingJob, job_id)
+    document = db.get(Document, document_id)
+    assert job.state == JobState.COMPLETED
+    assert job.progress == 1.0
+    assert document.is_processed
+    assert document.processing_status == "completed"
+    assert "Body text for page 2" in document.extracted_text
+    assert db.query(Topic).filter(Topic.document_id == document_id).count() > 0
+
+
+def test_run_job_marks_failure(session_factory, tmp_path):
+    """Test that extraction errors are stored on the job and document."""
+    db = session_factory()
+    job_id, document_id = _queue_job(db, tmp_path / "missing.pdf")
+
+    DocumentProcessingService(session_factory=session_factory).run(job_id)
+
+    db.expire_all()
+    job = db.get(ProcessingJob, job_id)
+    assert job.state == JobState.FAILED
+    assert job.error
+    assert db.get(Document, document_id).processing_status == "failed"
+
+
+class _CrashAfterFirstBatch(PDFProcessor):
+    def iter_page_batches(self, *args, **kwargs):
+        batches = super().iter_page_batches(*args, **kwargs)
+        yield next(batches)
+        raise RuntimeError("worker killed")
+
+
+def test_retry_resumes_from_checkpoint(session_factory, tmp_path):
+    """Test that a failed run keeps finished batches and a retry continues after them."""
+    pdf_path = tmp_path / "book.pdf"
+    _make_pdf(pdf_path, 5)
+    db = session_factory()
+    job_id, document_id = _queue_job(db, pdf_path)
+
+    crashing = DocumentProcessingService(pdf_processor=_CrashAfterFirstBatch(workers=1),
+                                         session_factory=session_factory)
+    crashing.checkpoint_pages = 2
+    crashing.run(job_id)
+
+    db.expire_all()
+    content = db.get(Document, document_id).content
+    assert db.get(ProcessingJob, job_id).state == JobState.FAILED
+    assert content.pages_processed == 2
+    assert not content.is_processed
+
+    retry = ProcessingJob(document_id=document_id)
+    db.add(retry)
+    db.commit()
+    resumed_from = []
+
+    class _Recording(PDFProcessor):
+        def iter_page_batches(self, pdf_path, start_page=0, **kwargs):
+            resumed_from.append(start_page)
+            return super().iter_page_batches(pdf_path, start_page=start_page, **kwargs)
+
+    service = DocumentProcessingService(pdf_processor=_Recording(workers=1), session_factory=session_factory)
+    service.checkpoint_pages = 2
+    service.run(retry.id)
+
+    db.expire_all()
+    content = db.get(Document, document_id).content
+    assert resumed_from == [2]
+    assert content.is_processed
+    assert db.query(DocumentPage).filter(DocumentPage.content_id == content.id).count() == 5
+    assert [s["title"] for s in content.sections] == [f"CHAPTER {i}: Topic {i}" for i in range(1, 6)]
+
+
+def test_jobs_sharing_content_do_not_store_pages_twice(tmp_path):
+    """Test that two documents with the same bytes can be processed at once."""
+    engine = create_engine(f"sqlite:///{tmp_path / 'jobs.db'}", connect_args={"check_same_thread": False})
+    Base.metadata.create_all(bind=engine)
+    session_factory = sessionmaker(bind=engine)
+    pdf_path = tmp_path / "book.pdf"
+    _make_pdf(pdf_path, 5)
+    db = session_factory()
+    first_job_id, first_document_id = _queue_job(db, pdf_path)
+    second_document = Document(filename="y.pdf", original_filename="y.pdf", file_path=str(pdf_path),
+                               content_id=db.get(Document, first_document_id).content_id, owner_id=1)
+    db.add(second_document)
+    db.flush()
+    second_job = ProcessingJob(document_id=second_document.id)
+    db.add(second_job)
+    db.commit()
+
+    class _OtherJobRunsFirst(PDFProcessor):
+        def iter_page_batches(self, *args, **kwargs):
+            batches = super().iter_page_batches(*args, **kwargs)
+            first = next(batches)
+            # The second document's job stores every page while this one holds its first batch
+            other = DocumentProcessingService(pdf_processor=PDFProcessor(workers=1), session_factory=session_factory)
+            other.checkpoint_pages = 2
+            other.run(second_job.id)
+            yield first
+            yield from batches
+
+    service = DocumentProcessingService(pdf_processor=_OtherJobRunsFirst(workers=1), session_factory=session_factory)
+    service.checkpoint_pages = 2
+    service.run(first_job_id)
+
+    db.expire_all()
+    content = db.get(Document, first_document_id).content
+    assert db.get(ProcessingJob, first_job_id).state == JobState.COMPLETED
+    assert db.get(ProcessingJob, second_job.id).state == JobState.COMPLETED
+    assert content.is_processed
+    assert db.query(DocumentPage).filter(DocumentPage.content_id == content.id).count() == 5
+    for document_id in (first_document_id, second_document.id):
+        assert db.query(Topic).filter(Topic.document_id == document_id).count() == 5
+
+
+def test_run_job_stores_reusable_parse(session_factory, tmp_path, nlp_engine):
+    """Test that processing keeps a DocBin that generation can load instead of parsing."""
+    pdf_path = tmp_path / "book.pdf"
+    _make_pdf(pdf_path, 2)
+    db = session_factory()
+    job_id, document_id = _queue_job(db, pdf_path)
+
+    DocumentProcessingService(session_factory=session_factory, nlp_engine=nlp_engine).run(job_id)
+
+    db.expire_all()
+    content = db.get(Document, document_id).content
+    store = DocumentStore()
+    analysis = store.load_parse(db, content, nlp_engine)
+    assert content.nlp_version == nlp_engine.pipeline_version
+    assert analysis.text == content.extracted_text
+    assert [s.text for s in analysis.sentences] == [s.text for s in nlp_engine.analyze(content.extracted_text).sentences]
+
+    content.nlp_version = "other-pipeline"
+    assert store.load_parse(db, content, nlp_engine) is None
+
+
+def test_run_job_stores_candidate_pools(session_factory, tmp_path, nlp_engine):
+    """Test that processing stores versioned candidate pools for the content and each topic."""
+    pdf_path = tmp_path / "book.pdf"
+    _make_pdf(pdf_path, 2)
+    db = session_factory()
+    job_id, document_id = _queue_job(db, pdf_path)
+
+    service = DocumentProcessingService(session_factory=session_factory, nlp_engine=nlp_engine)
+    service.run(job_id)
+
+    db.expire_all()
+    document = db.get(Document, document_id)
+    version = service.question_generator.candidates_version
+    store = DocumentStore()
+    assert store.load_candidates(db, document.content, version)["version"] == version
+    assert store.load_candidates(db, document.content, "older") is None
+    assert document.topics
+    assert all(topic.candidates["version"] == version for topic in document.topics)
@@ -0,0 +1,110 @@
+import io
+import pytest
+from fastapi import UploadFile
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from app.models import Base, Document, DocumentContent, Topic
+from app.services.document_store import DocumentStore
+from app.services.file_storage import FileStorage
+
+
+@pytest.fixture
+def db():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(bind=engine)
+    session = sessionmaker(bind=engine)()
+    yield session
+    session.close()
+
+
+def _make_document(db, content, name):
+    document = Document(
+        filename=name,
+        original_filename=name,
+        file_path=content.file_path,
+        content_hash=content.content_hash,
+        content_id=content.id,
+        owner_id=1
+    )
+    db.add(document)
+    db.flush()
+    return document
+
+
+def test_duplicate_upload_reuses_analysis(db, tmp_path):
+    """Test that a second upload of the same bytes links to the first analysis."""
+    blob = tmp_path / "blob.pdf"
+    blob.write_bytes(b"%PDF-1.4")
+    store = DocumentStore(FileStorage(upload_dir=str(tmp_path)))
+    stored = {"content_hash": "ab" * 32, "file_path": str(blob), "file_size": 8}
+
+    content = store.get_or_create_content(db, stored)
+    first = _make_document(db, content, "first.pdf")
+    store.save_analysis(db, content, "Some text", [{"title": "Intro", "content": "Some text"}])
+    store.link_analysis(db, first)
+    db.commit()
+
+    assert store.get_or_create_content(db, stored).id == content.id
+    second = _make_document(db, content, "second.pdf")
+    assert store.link_analysis(db, second) == 1
+    db.commit()
+
+    assert second.is_processed
+    assert second.extracted_text == "Some text"
+    assert db.query(Topic).filter(Topic.document_id == second.id).count() == 1
+
+    # The blob survives until the last document referencing it is removed
+    store.release(db, first)
+    db.delete(first)
+    db.commit()
+    assert blob.exists()
+
+    store.release(db, second)
+    db.delete(second)
+    db.commit()
+    assert not blob.exists()
+    assert db.query(DocumentContent).count() == 0
+
+
+@pytest.mark.asyncio
+async def test_upload_restores_blob_deleted_by_a_concurrent_release(db, tmp_path):
+    """Test that an upload racing with deleting the last document of the same bytes keeps its file."""
+    payload = b"%PDF-1.4 racing"
+    store = DocumentStore(FileStorage(upload_dir=str(tmp_path)))
+    first = await store.file_storage.save_upload(UploadFile(file=io.BytesIO(payload), filename="first.pdf"))
+    old = _make_document(db, store.get_or_create_content(db, first), "first.pdf")
+    db.commit()
+
+    # The new upload finds the blob in place, then the old document is deleted
+    upload = UploadFile(file=io.BytesIO(payload), filename="second.pdf")
+    second = await store.file_storage.save_upload(upload)
+    assert second["is_duplicate"]
+    store.release(db, old)
+    db.delete(old)
+    db.commit()
+
+    content = store.get_or_create_content(db, second)
+    await store.restore_blob(content, upload)
+    db.commit()
+
+    with open(content.file_path, "rb") as f:
+        assert f.read() == payload
+
+
+def test_pages_are_stored_and_text_is_deferred(db, tmp_path):
+    """Test page-range reads and that loading content rows skips the text."""
+    store = DocumentStore(FileStorage(upload_dir=str(tmp_path)))
+    content = store.get_or_create_content(
+        db, {"content_hash": "ef" * 32, "file_path": str(tmp_path / "x.pdf"), "file_size": 1}
+    )
+    document = _make_document(db, content, "book.pdf")
+    pages = [{"page_number": n, "text": f"Page {n} text", "word_count": 3} for n in range(1, 6)]
+    store.save_analysis(db, content, "full text", [], pages=pages)
+    db.commit()
+
+    assert [p.page_number for p in store.get_pages(db, document, 2, 4)] == [2, 3, 4]
+
+    db.expire_all()
+    loaded = db.query(DocumentContent).first()
+    assert "extracted_text" not in loaded.__dict__
+    assert loaded.extracted_text == "full text"
@@ -0,0 +1,47 @@
+import hashlib
+import io
+import os
+import pytest
+from fastapi import UploadFile
+from app.services.file_storage import FileStorage, UploadTooLargeError
+
+
+@pytest.mark.asyncio
+async def test_save_upload_streams_and_hashes(tmp_path):
+    """Test that uploads are copied in chunks with a matching SHA-256."""
+    payload = os.urandom(10_000)
+    storage = FileStorage(upload_dir=str(tmp_path), max_size=20_000, chunk_size=1024)
+
+    stored = await storage.save_upload(UploadFile(file=io.BytesIO(payload), filename="book.pdf"))
+
+    assert stored["file_size"] == len(payload)
+    assert stored["content_hash"] == hashlib.sha256(payload).hexdigest()
+    assert stored["filename"] == f"{stored['content_hash']}.pdf"
+    assert stored["is_duplicate"] is False
+    with open(stored["file_path"], "rb") as f:
+        assert f.read() == payload
+
+
+@pytest.mark.asyncio
+async def test_save_upload_rejects_oversized_file(tmp_path):
+    """Test that the size limit is enforced while streaming."""
+    storage = FileStorage(upload_dir=str(tmp_path), max_size=4096, chunk_size=1024)
+
+    with pytest.raises(UploadTooLargeError):
+        await storage.save_upload(UploadFile(file=io.BytesIO(b"x" * 5000), filename="big.pdf"))
+
+    assert os.listdir(tmp_path) == []
+
+
+@pytest.mark.asyncio
+async def test_save_upload_reuses_identical_blob(tmp_path):
+    """Test that identical bytes are stored once under their hash."""
+    payload = os.urandom(4096)
+    storage = FileStorage(upload_dir=str(tmp_path), max_size=8192, chunk_size=1024)
+
+    first = await storage.save_upload(UploadFile(file=io.BytesIO(payload), filename="a.pdf"))
+    second = await storage.save_upload(UploadFile(file=io.BytesIO(payload), filename="b.pdf"))
+
+    assert second["is_duplicate"] is True
+    assert second["file_path"] == first["file_path"]
+    assert [name for name in os.listdir(tmp_path) if name.endswith(".part")] == []
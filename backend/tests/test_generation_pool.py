@@ -0,0 +1,172 @@
+import asyncio
+import threading
+import time
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from app.models import Base, Document, Topic
+from app.models.question import DifficultyLevel, QuestionType
+from app.services import generation_pool as generation_pool_module
+from app.services.generation_pool import GenerationPool, GenerationQueueFullError, _load_candidates
+from app.services.nlp_cache import NLPCache
+from app.services.question_generator import QuestionGenerator
+
+
+@pytest.mark.asyncio
+async def test_run_limits_queue_and_reports_depth(monkeypatch):
+    """Test that requests beyond the queue limit are rejected and counted."""
+    release = threading.Event()
+
+    def blocking_generate(text, document_id, content_id, topic_ids, options):
+        release.wait(5)
+        return [{"question_text": text, **options}]
+
+    monkeypatch.setattr(generation_pool_module, "generate_for_request", blocking_generate)
+    pool = GenerationPool(workers=0, max_queued=1)
+
+    running = [asyncio.create_task(pool.run("q", num_questions=i)) for i in range(2)]
+    await asyncio.sleep(0.05)
+    assert pool.stats()["in_flight"] == 2
+    assert pool.stats()["queued"] == 1
+
+    with pytest.raises(GenerationQueueFullError):
+        await pool.run("q", num_questions=3)
+
+    release.set()
+    results = await asyncio.gather(*running)
+    assert [r[0]["num_questions"] for r in results] == [0, 1]
+    assert pool.stats() == {
+        "workers": 0, "in_flight": 0, "queued": 0, "max_queued": 1, "completed": 2, "failed": 0, "rejected": 1
+    }
+
+
+@pytest.mark.asyncio
+async def test_stream_yields_ready_questions_in_batches(monkeypatch):
+    """Test that streamed questions arrive in order, in batches no larger than batch_size."""
+    gate = threading.Event()
+
+    def slow_stream(text, document_id, content_id, topic_ids, options, queue, cancel):
+        try:
+            queue.put({"n": 0})
+            gate.wait(5)
+            for n in range(1, 6):
+                queue.put({"n": n})
+        finally:
+            queue.put(None)
+
+    monkeypatch.setattr(generation_pool_module, "stream_for_request", slow_stream)
+    pool = GenerationPool(workers=0, max_queued=1)
+
+    batches = pool.stream("q", batch_size=2)
+    # The first question arrives before the rest are generated
+    assert await batches.__anext__() == [{"n": 0}]
+    gate.set()
+    await asyncio.sleep(0.05)
+    rest = [batch async for batch in batches]
+
+    assert all(len(batch) <= 2 for batch in rest)
+    assert [q["n"] for batch in rest for q in batch] == [1, 2, 3, 4, 5]
+    assert pool.stats()["in_flight"] == 0
+
+
+@pytest.mark.asyncio
+async def test_seeded_requests_are_served_from_cache(monkeypatch):
+    """Test that a repeated seeded request skips generation and restores enum fields."""
+    calls = []
+
+    def generate(text, document_id, content_id, topic_ids, options):
+        calls.append(options)
+        return [{"question_text": text, "question_type": QuestionType.MCQ, "difficulty": DifficultyLevel.EASY}]
+
+    monkeypatch.setattr(generation_pool_module, "generate_for_request", generate)
+    pool = GenerationPool(workers=0, max_queued=1, cache=NLPCache(max_bytes=1 << 20))
+
+    first = await pool.run("q", source_hash="abc", num_questions=1, seed=5)
+    again = await pool.run("q", source_hash="abc", num_questions=1, seed=5)
+    streamed = [batch async for batch in pool.stream("q", source_hash="abc", num_questions=1, seed=5)]
+    await pool.run("q", source_hash="abc", num_questions=1)
+
+    assert again == first == streamed[0]
+    assert again[0]["question_type"] is QuestionType.MCQ
+    assert len(calls) == 2
+
+
+def test_topic_candidates_ignore_other_documents(monkeypatch, nlp_engine):
+    """Test that topic ids of another document never add to a request's candidate pool."""
+    engine = create_engine("sqlite://", poolclass=StaticPool, connect_args={"check_same_thread": False})
+    Base.metadata.create_all(bind=engine)
+    session_factory = sessionmaker(bind=engine)
+    monkeypatch.setattr(generation_pool_module, "SessionLocal", session_factory)
+    monkeypatch.setattr(generation_pool_module, "question_generator", QuestionGenerator(nlp_engine))
+
+    db = session_factory()
+    documents = [Document(filename=f"{name}.pdf", original_filename=f"{name}.pdf", file_path=f"{name}.pdf",
+                          owner_id=1) for name in ("a", "b")]
+    db.add_all(documents)
+    db.flush()
+    own = Topic(name="Own", document_id=documents[0].id,
+                description="Photosynthesis was described in 1779 by Jan Ingenhousz after careful study.")
+    other = Topic(name="Other", document_id=documents[1].id,
+                  description="Plants convert about 3 percent of sunlight into chemical energy every year.")
+    db.add_all([own, other])
+    db.commit()
+
+    candidates = _load_candidates(own.description, documents[0].id, None, [own.id, other.id])
+
+    assert [fact["text"] for fact in candidates["facts"]] == [own.description]
+    db.refresh(other)
+    assert other.candidates is None
+
+
+@pytest.mark.asyncio
+async def test_failed_generations_are_not_counted_as_completed(monkeypatch):
+    """Test that generation errors are reported as failures and free their slot."""
+    def failing_generate(text, document_id, content_id, topic_ids, options):
+        raise ValueError("Text is too short to generate questions.")
+
+    monkeypatch.setattr(generation_pool_module, "generate_for_request", failing_generate)
+    pool = GenerationPool(workers=0, max_queued=1)
+
+    with pytest.raises(ValueError):
+        await pool.run("q", num_questions=1)
+
+    stats = pool.stats()
+    assert (stats["in_flight"], stats["completed"], stats["failed"]) == (0, 0, 1)
+
+
+def test_nlp_status_before_workers_start():
+    """Test that a pool nobody has started yet is reported as not started, not loading."""
+    pool = GenerationPool(workers=2, max_queued=1)
+
+    assert pool.nlp_status() == "not_started"
+
+
+@pytest.mark.asyncio
+async def test_closing_a_stream_stops_the_worker_before_freeing_its_slot(monkeypatch):
+    """Test that a consumer leaving early cancels generation and the slot is held until it stops."""
+    stopped = threading.Event()
+
+    def endless_stream(text, document_id, content_id, topic_ids, options, queue, cancel):
+        try:
+            n = 0
+            while not cancel.is_set():
+                queue.put({"n": n})
+                n += 1
+                time.sleep(0.01)
+            stopped.set()
+        finally:
+            queue.put(None)
+
+    monkeypatch.setattr(generation_pool_module, "stream_for_request", endless_stream)
+    pool = GenerationPool(workers=0, max_queued=1)
+
+    batches = pool.stream("q", batch_size=1)
+    assert await batches.__anext__() == [{"n": 0}]
+    await batches.aclose()
+    assert pool.stats()["in_flight"] == 1
+
+    assert await asyncio.get_running_loop().run_in_executor(None, stopped.wait, 2)
+    await asyncio.sleep(0.05)
+    stats = pool.stats()
+    assert (stats["in_flight"], stats["completed"], stats["failed"]) == (0, 0, 0)
@@ -0,0 +1,51 @@
+from app.services.nlp_cache import NLPCache
+from app.services.nlp_engine import LazyAnalysis
+
+TEXT = ("Photosynthesis was described in 1779 by Jan Ingenhousz. "
+        "Plants convert about 3 percent of sunlight into chemical energy over many years.")
+
+
+def test_lru_is_bounded_by_encoded_size():
+    """Test that the least recently used entries are evicted by bytes."""
+    cache = NLPCache(max_bytes=30)
+    cache.set("a", "x" * 10)
+    cache.set("b", "y" * 10)
+    assert cache.get("a")[0]
+    cache.set("c", "z" * 10)
+
+    assert cache.get("b") == (False, None)
+    assert cache.get("a") == (True, "x" * 10)
+    assert cache.get("c") == (True, "z" * 10)
+    cache.set("huge", "w" * 100)
+    assert not cache.get("huge")[0]
+
+    stats = cache.stats()
+    assert stats["evictions"] == 1
+    assert stats["hits"] == 3 and stats["misses"] == 2
+    assert stats["bytes"] <= 30
+
+
+def test_hits_return_independent_copies():
+    """Test that callers may mutate a cached result."""
+    cache = NLPCache(max_bytes=1024)
+    cache.set("k", [{"text": "a"}])
+    cache.get("k")[1].append("mutated")
+
+    assert cache.get("k") == (True, [{"text": "a"}])
+
+
+def test_engine_serves_hits_without_parsing(nlp_engine, monkeypatch):
+    """Test that memoized extractors skip the parse on a cache hit."""
+    monkeypatch.setattr(nlp_engine, "cache", NLPCache(max_bytes=1 << 20))
+    first = nlp_engine.extract_facts(LazyAnalysis(TEXT))
+
+    def fail(*args, **kwargs):
+        raise AssertionError("parsed on a cache hit")
+
+    monkeypatch.setattr(nlp_engine, "analyze", fail)
+    again = LazyAnalysis(TEXT)
+
+    assert nlp_engine.extract_facts(again) == first
+    assert nlp_engine.extract_facts(TEXT) == first
+    assert again.analysis is None
+    assert nlp_engine.cache.stats()["hits"] == 2
@@ -0,0 +1,151 @@
+import spacy
+from app.services import nlp_engine as nlp_engine_module
+from app.core.config import settings
+from app.services.nlp_engine import (
+    ChunkedAnalysis, TextAnalysis, _match_definition, get_nlp_engine, nlp_status, split_sentence_safe,
+    warmup_nlp
+)
+
+TEXT = ("Photosynthesis was described in 1779 by Jan Ingenhousz. "
+        "Plants convert about 3 percent of sunlight into chemical energy over many years. "
+        "A leaf is an organ that captures light for the plant.")
+
+
+class _SpyPipeline:
+    """Records whether texts are parsed one by one or through nlp.pipe."""
+
+    def __init__(self, nlp):
+        self.nlp = nlp
+        self.calls = []
+
+    def __call__(self, text):
+        self.calls.append("call")
+        return self.nlp(text)
+
+    def pipe(self, texts, **kwargs):
+        self.calls.append("pipe")
+        return self.nlp.pipe(texts, **kwargs)
+
+
+def test_extractors_accept_shared_analysis(nlp_engine):
+    """Test that one analysis gives the same results as parsing per extractor."""
+    analysis = nlp_engine.analyze(TEXT)
+
+    assert nlp_engine.analyze(analysis) is analysis
+    assert isinstance(analysis, TextAnalysis)
+    assert nlp_engine.extract_facts(analysis) == nlp_engine.extract_facts(TEXT)
+    assert nlp_engine.extract_entities(analysis) == nlp_engine.extract_entities(TEXT)
+    assert nlp_engine.extract_definitions(analysis) == nlp_engine.extract_definitions(TEXT)
+    assert nlp_engine.calculate_text_complexity(analysis) == nlp_engine.calculate_text_complexity(TEXT)
+
+
+def test_sentence_entities_align_with_sentences(nlp_engine):
+    """Test that the merged per-sentence entity view matches Span.ents."""
+    analysis = nlp_engine.analyze(TEXT)
+
+    assert [[e.text for e in ents] for ents in analysis.sentence_entities] == \
+        [[e.text for e in sent.ents] for sent in analysis.sentences]
+
+
+def test_sentence_analysis_reuses_document_parse(nlp_engine, monkeypatch):
+    """Test that per-sentence work uses spans, batching anything left over."""
+    analysis = nlp_engine.analyze(TEXT)
+    spy = _SpyPipeline(nlp_engine.nlp)
+    monkeypatch.setattr(nlp_engine, "nlp", spy)
+
+    assert nlp_engine.extract_key_sentences(analysis, top_n=3)
+    facts = nlp_engine.extract_facts(analysis)
+    docs = nlp_engine.sentence_docs(facts + ["Water boils at 100 degrees.", "Ice melts."], analysis)
+
+    assert [d.doc for d in docs[:len(facts)]] == [analysis.doc] * len(facts)
+    assert [d.text for d in docs[len(facts):]] == ["Water boils at 100 degrees.", "Ice melts."]
+    assert spy.calls == ["pipe"]
+
+
+def test_registry_loads_each_model_once(tmp_path, monkeypatch):
+    """Test that the shared registry loads lazily, caches, and reports status."""
+    monkeypatch.setattr(nlp_engine_module, "_engines", {})
+    monkeypatch.setattr(nlp_engine_module, "_load_errors", {})
+    model_path = str(tmp_path / "blank")
+    spacy.blank("en").to_disk(model_path)
+
+    assert nlp_status(model_path) == "not_started"
+    engine = get_nlp_engine(model_path)
+    assert get_nlp_engine(model_path) is engine
+    assert nlp_status(model_path) == "ready"
+
+    assert not warmup_nlp(str(tmp_path / "missing"))
+    assert nlp_status(str(tmp_path / "missing")) == "failed"
+
+
+def test_pipeline_profiles_run_only_needed_components(nlp_engine):
+    """Test that light profiles skip components and are upgraded on demand."""
+    light = nlp_engine.analyze(TEXT, profile="sentences")
+
+    assert len(light.sentences) == 3
+    assert light.entities == []
+    assert nlp_engine.analyze(light, profile="sentences") is light
+
+    upgraded = nlp_engine.analyze(light, profile="entities")
+    assert upgraded.profile == "entities"
+    assert [e.text for e in upgraded.entities] == ["1779", "Jan Ingenhousz", "3 percent"]
+    assert nlp_engine.analyze(upgraded, profile="sentences") is upgraded
+
+
+def test_split_sentence_safe_covers_text_at_sentence_breaks():
+    """Test that chunks reassemble the text and end between sentences."""
+    text = TEXT * 5
+    chunks = list(split_sentence_safe(text, 120))
+
+    assert "".join(chunks) == text
+    assert all(len(chunk) <= 120 for chunk in chunks)
+    assert all(chunk.rstrip().endswith(".") for chunk in chunks)
+    assert list(split_sentence_safe("x" * 10, 4)) == ["xxxx", "xxxx", "xx"]
+
+
+def test_chunked_analysis_matches_single_parse(nlp_engine, monkeypatch):
+    """Test that map-reduce over chunks gives the single-Doc results."""
+    text = " ".join([TEXT] * 6)
+    whole = nlp_engine.analyze(text)
+    monkeypatch.setattr(settings, "NLP_CHUNK_CHARS", 200)
+    chunked = nlp_engine.analyze(text)
+
+    assert isinstance(chunked, ChunkedAnalysis)
+    assert len(chunked.doc_bin) > 1
+    assert chunked.text == text
+    assert nlp_engine.extract_entities(chunked) == nlp_engine.extract_entities(whole)
+    assert nlp_engine.extract_facts(chunked) == nlp_engine.extract_facts(whole)
+    assert nlp_engine.extract_definitions(chunked) == nlp_engine.extract_definitions(whole)
+    assert nlp_engine.extract_key_sentences(chunked, top_n=4) == nlp_engine.extract_key_sentences(whole, top_n=4)
+    assert nlp_engine.extract_facts(chunked, limit=2) == nlp_engine.extract_facts(whole)[:2]
+    assert nlp_engine.calculate_text_complexity(chunked)["total_words"] == \
+        nlp_engine.calculate_text_complexity(whole)["total_words"]
+
+    restored = nlp_engine.from_bytes(nlp_engine.to_bytes(chunked))
+    assert isinstance(restored, ChunkedAnalysis)
+    assert nlp_engine.extract_entities(restored) == nlp_engine.extract_entities(whole)
+
+
+def test_match_definition_follows_pattern_priority():
+    """Test definition cues, their priority, and sentences without a match."""
+    assert _match_definition("A leaf is an organ that captures light.") == \
+        ("A leaf", "organ that captures light")
+    assert _match_definition("Osmosis means diffusion of water, which is the solvent.") == \
+        ("Osmosis means diffusion of water, which", "solvent")
+    assert _match_definition("Chlorophyll refers to\nthe green pigment, found in leaves.") == \
+        ("Chlorophyll", "the green pigment")
+    assert _match_definition("Energy can be defined as capacity for work.") == \
+        ("Energy", "capacity for work")
+    assert _match_definition("Water is the medium that means life " * 200) is None
+
+
+def test_key_sentences_can_stop_at_good_enough_candidates(nlp_engine, monkeypatch):
+    """Test interactive early termination against the exhaustive top-k."""
+    filler = ["Leaves of many green plants turn toward the light every morning."] * 3
+    rich = "In 1779 Jan Ingenhousz showed that about 3 percent of light is stored."
+    text = " ".join(filler + [rich])
+    monkeypatch.setattr(nlp_engine_module, "KEY_SENTENCE_GOOD_SCORE", 2.0)
+
+    assert nlp_engine.extract_key_sentences(text, top_n=2) == [rich, filler[0]]
+    assert nlp_engine.extract_key_sentences(text, top_n=2, exhaustive=False) == filler[:2]
+    assert nlp_engine.extract_key_sentences(text, top_n=0) == []
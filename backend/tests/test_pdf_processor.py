@@ -0,0 +1,124 @@
+import fitz
+import pytest
+from app.services.pdf_processor import PDFProcessor
+
+
+@pytest.fixture
+def sample_pdf(tmp_path):
+    path = tmp_path / "sample.pdf"
+    doc = fitz.open()
+    for i in range(6):
+        page = doc.new_page()
+        page.insert_text((72, 72), f"CHAPTER {i + 1}: Heading {i + 1}", fontsize=16)
+        page.insert_text((72, 110), f"Body text for page {i + 1}.")
+    doc.save(str(path))
+    doc.close()
+    return str(path)
+
+
+def test_parallel_extraction_matches_serial(sample_pdf):
+    """Test that page batches from worker processes are joined in page order."""
+    serial = PDFProcessor(workers=1)
+    parallel = PDFProcessor(workers=2, batch_size=2)
+    parallel.parallel_min_pages = 0
+    progress = []
+
+    text = parallel.extract_text(sample_pdf, progress_callback=lambda done, total: progress.append((done, total)))
+
+    assert text == serial.extract_text(sample_pdf)
+    assert text.index("page 1.") < text.index("page 6.")
+    assert progress[-1] == (6, 6)
+
+
+def test_analyze_collects_pages_metadata_and_sections(sample_pdf):
+    """Test that a single analysis pass returns everything processing needs."""
+    processor = PDFProcessor(workers=1)
+
+    analysis = processor.analyze(sample_pdf)
+
+    assert analysis["metadata"]["page_count"] == 6
+    assert [p["page_number"] for p in analysis["pages"]] == [1, 2, 3, 4, 5, 6]
+    assert analysis["pages"][0]["word_count"] > 0
+    assert analysis["text"] == processor.extract_text(sample_pdf)
+    assert [h["title"] for h in analysis["headings"]][:2] == ["CHAPTER 1: Heading 1", "CHAPTER 2: Heading 2"]
+    assert analysis["sections"][0] == {"title": "CHAPTER 1: Heading 1", "content": "Body text for page 1."}
+
+
+def test_analyze_parallel_matches_serial(sample_pdf):
+    """Test that sections spanning batches are stitched in page order."""
+    parallel = PDFProcessor(workers=2, batch_size=2)
+    parallel.parallel_min_pages = 0
+
+    assert parallel.analyze(sample_pdf) == PDFProcessor(workers=1).analyze(sample_pdf)
+
+
+def test_streaming_api_matches_materialized_results(sample_pdf):
+    """Test that page and chunk generators agree with the list-based API."""
+    processor = PDFProcessor(workers=1)
+    processor.min_text_length = 0
+
+    assert list(processor.iter_cleaned_pages(sample_pdf)) == processor.extract_text_by_pages(sample_pdf)
+
+    text = processor.extract_text(sample_pdf)
+    pages = processor.iter_cleaned_pages(sample_pdf)
+    assert list(processor.iter_chunks(pages, chunk_size=7, overlap=2)) == \
+        processor.split_into_chunks(text, chunk_size=7, overlap=2)
+
+    sections = processor.detect_sections(processor.iter_pages(sample_pdf))
+    assert [s["title"] for s in sections] == [f"CHAPTER {i}: Heading {i}" for i in range(1, 7)]
+
+
+def test_headings_detected_from_font_layout(tmp_path):
+    """Test that headings come from font size and weight, not capitalization."""
+    path = tmp_path / "layout.pdf"
+    doc = fitz.open()
+    page = doc.new_page()
+    page.insert_text((72, 60), "Cell Transport", fontsize=16)
+    page.insert_text((72, 90), "Key Terms", fontsize=11, fontname="hebo")
+    page.insert_text((72, 110), "DNA RNA ATP", fontsize=11)
+    page.insert_text((72, 130), "Diffusion needs no energy.", fontsize=11)
+    doc.save(str(path))
+    doc.close()
+
+    analysis = PDFProcessor(workers=1).analyze(str(path))
+
+    assert [h["title"] for h in analysis["headings"]] == ["Cell Transport", "Key Terms"]
+    assert analysis["headings"][0]["font_size"] == 16.0
+    assert analysis["sections"][-1] == {"title": "Key Terms", "content": "DNA RNA ATP Diffusion needs no energy."}
+
+
+def test_section_spans_match_line_by_line_rules():
+    """Test that the single-pass detector applies the heading rules per stripped line."""
+    processor = PDFProcessor()
+    text = ("Preface line\n"
+            "  Chapter 1: Cells  \n"
+            "Cells are small.\n\n"
+            "   and divide.\n"
+            "Chapter 2\n"
+            "ABC \n"
+            "1. Membranes\n"
+            "UNIT 3. Review\n"
+            "  \n"
+            "TABLE OF VALUES\n"
+            "Osmosis moves water.")
+
+    spans = processor.section_spans(text)
+
+    assert [(s.title, s.content) for s in spans] == [
+        ("Introduction", "Preface line "),
+        ("Chapter 1: Cells", "Cells are small. and divide. Chapter 2 ABC "),
+        ("TABLE OF VALUES", "Osmosis moves water. "),
+    ]
+    assert spans[1].source is text
+    assert processor.detect_sections(text.split("\n\n")) == [s.to_dict() for s in spans]
+
+
+@pytest.mark.parametrize("overlap", [7, 9])
+def test_chunking_rejects_overlap_not_below_chunk_size(overlap):
+    """Test that an overlap the window could never advance past is rejected up front."""
+    processor = PDFProcessor(workers=1)
+
+    with pytest.raises(ValueError):
+        processor.iter_chunks(["one two three"] * 10, chunk_size=7, overlap=overlap)
+    with pytest.raises(ValueError):
+        processor.split_into_chunks("one two three " * 10, chunk_size=7, overlap=overlap)
@@ -0,0 +1,52 @@
+import json
+from app.models.question import QuestionType
+from app.services.question_generator import QuestionGenerator
+
+TEXT = ("Photosynthesis was described in 1779 by Jan Ingenhousz after careful study of many plants. "
+        "Plants convert about 3 percent of sunlight into chemical energy over many years of growth. "
+        "A leaf is an organ that captures light for the plant. "
+        "Chlorophyll refers to the green pigment that absorbs red and blue light in most leaves.")
+
+TYPES = [QuestionType.MCQ, QuestionType.SHORT_ANSWER, QuestionType.TRUE_FALSE, QuestionType.FILL_BLANK]
+
+
+def test_stored_pool_generates_same_questions(nlp_engine):
+    """Test that sampling a stored (JSON round-tripped) pool matches generating from text."""
+    generator = QuestionGenerator(nlp_engine)
+    pool = json.loads(json.dumps(generator.build_candidates(TEXT, size=200)))
+
+    assert pool["version"] == generator.candidates_version
+    assert pool["facts"][0]["entities"] == ["1779", "Jan Ingenhousz"]
+
+    from_text = generator.generate_questions(TEXT, num_questions=6, question_types=TYPES, seed=7)
+    from_pool = generator.generate_questions(TEXT, num_questions=6, question_types=TYPES, candidates=pool, seed=7)
+
+    assert from_pool == from_text
+
+
+def test_merged_pool_ranks_key_sentences_across_topics(nlp_engine):
+    """Test that merging topic pools keeps every candidate and ranks key sentences by score."""
+    generator = QuestionGenerator(nlp_engine)
+    first, second = TEXT.split(". ", 1)
+    pools = [generator.build_candidates(first + ".", size=200), generator.build_candidates(second, size=200)]
+
+    merged = generator.merge_candidates(pools)
+
+    assert merged["facts"] == pools[0]["facts"] + pools[1]["facts"]
+    scores = [sent["score"] for sent in merged["key_sentences"]]
+    assert scores == sorted(scores, reverse=True)
+    assert len(scores) == sum(len(pool["key_sentences"]) for pool in pools)
+
+
+def test_seed_makes_generation_reproducible(nlp_engine):
+    """Test that a seed fixes every random choice and keys the result cache."""
+    generator = QuestionGenerator(nlp_engine)
+    pool = generator.build_candidates(TEXT, size=200)
+
+    runs = [generator.generate_questions(TEXT, 6, TYPES, candidates=pool, seed=seed) for seed in (1, 1, 2)]
+
+    assert runs[0] == runs[1]
+    assert runs[0] != runs[2]
+    assert generator.cache_key("abc", 6, TYPES, seed=None) is None
+    assert generator.cache_key("abc", 6, TYPES, seed=1) == generator.cache_key("abc", 6, list(TYPES), seed=1)
+    assert generator.cache_key("abc", 6, TYPES, seed=1) != generator.cache_key("abc", 6, TYPES, seed=2)
@@ -0,0 +1,32 @@
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from app.api.v1.questions import QuestionResponse, _save_questions, pdf_processor
+from app.models import Base, DifficultyLevel, Question, QuestionType
+
+
+def test_save_questions_inserts_in_one_statement():
+    """Test that generated questions are stored with one INSERT and returned in order."""
+    engine = create_engine("sqlite://", poolclass=StaticPool, connect_args={"check_same_thread": False})
+    Base.metadata.create_all(bind=engine)
+    db = sessionmaker(bind=engine)()
+    generated = [
+        {"question_text": f"What is term {i}?", "question_type": QuestionType.MCQ,
+         "difficulty": DifficultyLevel.HARD, "option_a": "x", "correct_answer": f"answer {i}",
+         "suggested_marks": 1.0}
+        for i in range(5)
+    ]
+    statements = []
+    event.listen(engine, "before_cursor_execute", lambda conn, cursor, statement, *args: statements.append(statement))
+
+    rows = _save_questions(db, generated, document_id=3)
+
+    assert [s.split()[0] for s in statements] == ["INSERT"]
+    assert [row.question_text for row in rows] == [q["question_text"] for q in generated]
+    assert [row.id for row in rows] == sorted(row.id for row in rows)
+    response = QuestionResponse.model_validate(rows[0])
+    assert response.question_type is QuestionType.MCQ
+    assert response.created_at is not None
+    stored = db.query(Question).order_by(Question.id).all()
+    assert [q.hash_signature for q in stored] == [pdf_processor.calculate_text_hash(q["question_text"]) for q in generated]
+    assert {q.source_document_id for q in stored} == {3}
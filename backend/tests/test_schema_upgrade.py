@@ -0,0 +1,46 @@
+import hashlib
+from sqlalchemy import create_engine, inspect
+from sqlalchemy.orm import sessionmaker
+from app.models import Base, Document, Topic
+from app.models.database import upgrade_schema
+
+# The documents and topics tables as the first release created them
+LEGACY_SCHEMA = [
+    """CREATE TABLE documents (
+        id INTEGER PRIMARY KEY, filename VARCHAR NOT NULL, original_filename VARCHAR NOT NULL,
+        file_path VARCHAR NOT NULL, file_size INTEGER, mime_type VARCHAR, extracted_text TEXT,
+        is_processed BOOLEAN, processing_status VARCHAR, owner_id INTEGER NOT NULL,
+        created_at DATETIME, updated_at DATETIME)""",
+    """CREATE TABLE topics (
+        id INTEGER PRIMARY KEY, name VARCHAR NOT NULL, description TEXT, document_id INTEGER)""",
+]
+
+
+def test_upgrade_schema_moves_legacy_text_to_content_rows(tmp_path):
+    """Test that a database from before the content store is upgraded and its text kept."""
+    pdf_path = tmp_path / "old.pdf"
+    pdf_path.write_bytes(b"%PDF-1.4 legacy")
+    engine = create_engine(f"sqlite:///{tmp_path / 'autoq.db'}")
+    with engine.begin() as conn:
+        for statement in LEGACY_SCHEMA:
+            conn.exec_driver_sql(statement)
+        conn.exec_driver_sql(
+            "INSERT INTO documents (id, filename, original_filename, file_path, extracted_text, is_processed, owner_id) "
+            f"VALUES (1, 'old.pdf', 'old.pdf', '{pdf_path}', 'Legacy text.', 1, 1), "
+            "(2, 'gone.pdf', 'gone.pdf', '/missing/gone.pdf', 'Other text.', 1, 1)"
+        )
+        conn.exec_driver_sql("INSERT INTO topics (id, name, description, document_id) VALUES (1, 'T', 'd', 1)")
+
+    Base.metadata.create_all(bind=engine)
+    upgrade_schema(engine)
+    upgrade_schema(engine)
+
+    assert "candidates" in {column["name"] for column in inspect(engine).get_columns("topics")}
+    db = sessionmaker(bind=engine)()
+    first, second = db.query(Document).order_by(Document.id).all()
+    assert first.extracted_text == "Legacy text."
+    assert first.content.content_hash == hashlib.sha256(b"%PDF-1.4 legacy").hexdigest()
+    assert first.content.is_processed
+    assert second.extracted_text == "Other text."
+    assert second.content_id != first.content_id
+    assert db.get(Topic, 1).candidates is None
@@ -233,7 +233,22 @@ async function processDocument(documentId) {
 
         if (!response.ok) throw new Error('Processing failed');
 
-        return await response.json();
+        const result = await response.json();
+        if (!result.job_id) return result;
+
+        // Processing runs in the background; poll the job until it finishes
+        while (true) {
+            await new Promise(resolve => setTimeout(resolve, 1000));
+
+            const jobResponse = await fetch(`${API_BASE_URL}/documents/jobs/${result.job_id}`, {
+                headers: getHeaders()
+            });
+            if (!jobResponse.ok) throw new Error('Processing failed');
+
+            const job = await jobResponse.json();
+            if (job.state === 'completed') return job;
+            if (job.state === 'failed') throw new Error(job.error || 'Processing failed');
+        }
     } catch (error) {
         console.error('Processing error:', error);
         throw error;